@@ -1,15 +1,24 @@
+import os
+import time
 import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 
+from utils.alm_engine import (central_scenario, generate_bond_ladder, project_alm, simulate_economic_scenarios,
+                              time_value_of_guarantees)
+from utils.alm_optimizer import efficient_frontier, sweep_strategies
+from utils.dynamic_lapse import ONC_LAWS, cyclical_lapse
+from utils.lsmc_proxy import (RISK_DRIVERS, evaluate_proxy, fit_proxy, own_funds_at_one_year, proxy_scr,
+                              sample_risk_drivers)
+
 st.set_page_config(page_title="Simulateur ALM Fonds Euros", layout="wide")
 
 st.title("🏦 Simulateur ALM : Projection Fonds Euros")
 st.subheader("Pilotage de la Participation aux Bénéfices et de la Solvabilité")
 
 st.markdown("""
-Ce module simule la projection bilantielle d'un fonds en euros sur 20 ans.
+Ce module simule la projection bilantielle d'un fonds en euros sur des milliers de scénarios économiques stochastiques (taux et actions).
 L'objectif est de piloter le **Taux Servi** aux assurés en jouant sur la **PPB (Provision pour Participation aux Bénéfices)** pour lisser les rendements et assurer la solvabilité.
 """)
 
@@ -36,126 +45,299 @@ with col3:
     st.subheader("Passif (Coût)")
     tmg = st.slider("Taux Minimum Garanti (TMG) %", 0.0, 3.0, 0.5, 0.1) / 100
     target_rate = st.slider("Taux Cible Concurrents (%)", 0.0, 6.0, 3.0, 0.1) / 100
-    frais_gestion = 0.006 # 0.60%
+    taux_rachat = st.slider("Taux de Rachat Structurel (%)", 0.0, 15.0, 5.0, 0.5) / 100
+    lapse_law = st.selectbox("Rachats Dynamiques", ["Aucun", *ONC_LAWS], index=2,
+                             help="Rachats conjoncturels fonction de l'écart taux servi - taux concurrent (ONC ACPR 2013).")
+    competitor_indexed = st.checkbox("Taux concurrent indexé sur les taux de marché", value=False,
+                                     help="Taux concurrent = taux du scénario + (taux cible - rendement obligataire initial).")
+
+with st.expander("🎲 Paramètres du Générateur de Scénarios Économiques", expanded=False):
+    col_g1, col_g2, col_g3 = st.columns(3)
+    with col_g1:
+        n_scen = st.select_slider("Nombre de scénarios", options=[1_000, 2_000, 5_000, 10_000], value=5_000)
+        horizon = st.slider("Horizon de projection (années)", 10, 40, 20, 5)
+    with col_g2:
+        rate_vol = st.slider("Volatilité des taux (Vasicek) %", 0.0, 2.0, 0.8, 0.1) / 100
+        kappa = st.slider("Vitesse de retour à la moyenne (κ)", 0.05, 1.0, 0.15, 0.05)
+    with col_g3:
+        equity_vol = st.slider("Volatilité actions %", 0.0, 40.0, 18.0, 1.0) / 100
+
+with st.expander("📜 Portefeuille Obligataire (ligne à ligne)", expanded=False):
+    col_b1, col_b2, col_b3 = st.columns(3)
+    with col_b1:
+        n_lines = st.select_slider("Nombre de lignes obligataires", options=[100, 500, 2_000, 5_000], value=2_000)
+    with col_b2:
+        reinvest_maturity = st.slider("Maturité de réinvestissement (années)", 3, 20, 10, 1)
+    with col_b3:
+        realise_gains = st.checkbox("Réaliser des plus-values latentes pour atteindre le taux cible", value=True)
 
 # --- 2. MOTEUR DE PROJECTION ---
-horizon = 20
+# Projection vectorisée sur tous les scénarios : l'état du bilan (Actif, PM, PPB) est un vecteur de scénarios.
+# Monde réel (rendement actions = hypothèse) pour les distributions ; risque neutre pour la TVOG.
 years = np.arange(1, horizon + 1)
 
-# Stockage des résultats
-res_yield_asset = []
-res_rate_served = []
-res_ppb_stock = []
-res_solvency = []
-
-# Variables d'état
-curr_aum = aum_initial
-curr_pm = pm_initial
-curr_ppb = ppb_initial
-
-for t in range(horizon):
-    # 1. Rendement Financier
-    # Hypothèse simplifiée : Rendement comptable = Rendement financier (pas de lissage des plus-values latentes ici)
-    fin_result = curr_aum * (alloc_bond * yield_bond + (1 - alloc_bond) * yield_equity)
-    
-    # 2. Chargements Passif
-    tech_cost = curr_pm * tmg
-    fees = curr_pm * frais_gestion
-    
-    # 3. Marge Financière Brute
-    gross_margin = fin_result - tech_cost - fees
-    
-    # 4. Politique de PB (Participation aux Bénéfices)
-    # On doit servir au moins le TMG.
-    # On vise le Taux Cible pour rester compétitif.
-    # Le besoin de PB additionnelle = (Taux Cible - TMG) * PM
-    
-    pb_target = max(0, (target_rate - tmg) * curr_pm)
-    
-    # Solde de l'exercice (Marge disponible pour financer la cible)
-    solde = gross_margin - pb_target
-    
-    if solde >= 0:
-        # Cas favorable : On a assez de marge pour servir la cible
-        pb_distributed = pb_target
-        dotation_ppb = solde
-        reprise_ppb = 0
-        
-        # Plafond de PPB (ex: 8% des PM) : si on a trop de réserves, on distribue le surplus
-        max_ppb = 0.08 * curr_pm
-        if (curr_ppb + dotation_ppb) > max_ppb:
-             surplus = (curr_ppb + dotation_ppb) - max_ppb
-             pb_distributed += surplus
-             dotation_ppb -= surplus
-    else:
-        # Cas défavorable : On manque de marge pour atteindre la cible
-        besoin = -solde
-        # On reprend de la PPB pour combler le trou (limité au stock disponible)
-        reprise_ppb = min(curr_ppb, besoin)
-        dotation_ppb = 0
-        # Ce qu'on distribue = Marge de l'année + Reprise
-        pb_distributed = max(0, gross_margin + reprise_ppb)
-
-    # Taux servi final
-    rate_served = tmg + (pb_distributed / curr_pm) if curr_pm > 0 else 0
-    
-    # Mise à jour des stocks
-    curr_ppb = curr_ppb + dotation_ppb - reprise_ppb
-    
-    # Evolution PM (Capitalisation des intérêts versés aux assurés)
-    # Le taux servi est net de frais, donc la PM grossit de ce taux.
-    curr_pm = curr_pm * (1 + rate_served)
-    
-    # Evolution Aum (Simplifié : suit le rendement financier)
-    # Hypothèse : Pas de rachats ni de nouvelles primes pour isoler l'effet rendement
-    # Les frais de gestion sont prélevés sur l'actif (cash out pour l'assureur)
-    curr_aum = curr_aum + fin_result - fees
-    
-    # Stockage
-    res_yield_asset.append((fin_result / curr_aum) if curr_aum > 0 else 0)
-    res_rate_served.append(rate_served)
-    res_ppb_stock.append(curr_ppb)
-    
-    # Proxy Solvabilité S2 (Vision Économique)
-    # 1. Fonds Propres Économiques = FP Comptables + VIF (Value In Force)
-    # VIF proxy : Valeur actuelle des marges futures (~1.5% des PM)
-    vif = curr_pm * 0.015
-    own_funds_s2 = (curr_aum - curr_pm - curr_ppb) + vif
-    
-    # 2. SCR (Capital Requis) avec LAC TP
-    # Choc Brut = Choc Marché (Actions) + Choc Vie/Op (Proxy 3% PM)
-    scr_brut = (curr_aum * (1-alloc_bond) * 0.39) + (curr_pm * 0.03)
-    # LAC TP : On suppose que 50% du choc est absorbé par la baisse de la PB future
-    scr_net = scr_brut * (1 - 0.50)
-    
-    res_solvency.append(own_funds_s2 / scr_net if scr_net > 0 else 0)
+@st.cache_data
+def run_alm(n_scen, horizon, yield_bond, yield_equity, rate_vol, kappa, equity_vol, aum, pm, ppb, alloc_bond, tmg, target_rate,
+            n_lines, reinvest_maturity, realise_gains, lapse, lapse_law, competitor_indexed):
+    start = time.perf_counter()
+    ladder = generate_bond_ladder(n_lines, total_nominal=alloc_bond * aum, market_yield=yield_bond)
+    gse = dict(r0=yield_bond, kappa=kappa, rate_vol=rate_vol, equity_vol=equity_vol)
+    rw = simulate_economic_scenarios(n_scen, horizon, equity_return=yield_equity, seed=42, **gse)
+    rn = simulate_economic_scenarios(n_scen, horizon, equity_return=None, seed=43, **gse)
+    central = central_scenario(horizon, yield_bond, kappa=kappa)
+    strategy = dict(aum=aum, pm=pm, ppb=ppb, alloc_bond=alloc_bond, tmg=tmg, target_rate=target_rate,
+                    ladder=ladder, reinvest_maturity=reinvest_maturity, realise_gains=realise_gains,
+                    lapse=lapse, lapse_law=None if lapse_law == "Aucun" else lapse_law)
+    # Taux concurrent : fixe (taux cible) ou translaté avec les taux du scénario
+    competitor = lambda scen: scen["rates"] + (target_rate - yield_bond) if competitor_indexed else None
+    res_rw, res_rn, res_central = [project_alm(scen, **strategy, competitor_rate=competitor(scen)) for scen in (rw, rn, central)]
+    tvog = time_value_of_guarantees(res_rn, res_central, rn, central)
+    return res_rw, tvog, time.perf_counter() - start
+
+res, tvog, elapsed = run_alm(n_scen, horizon, yield_bond, yield_equity, rate_vol, kappa, equity_vol,
+                             aum_initial, pm_initial, ppb_initial, alloc_bond, tmg, target_rate,
+                             n_lines, reinvest_maturity, realise_gains, taux_rachat, lapse_law, competitor_indexed)
+
+def fan(fig, values, name, color, scale=1.0):
+    """
+    Médiane et bandes 5%-95% / 25%-75% des trajectoires (scénarios x années).
+    """
+    q = np.percentile(values, [5, 25, 50, 75, 95], axis=0) * scale
+    for lo, hi, alpha in [(0, 4, 0.15), (1, 3, 0.30)]:
+        fig.add_trace(go.Scatter(x=np.r_[years, years[::-1]], y=np.r_[q[hi], q[lo][::-1]], fill='toself', fillcolor=color.replace('1)', f'{alpha})'),
+                                 line=dict(width=0), hoverinfo='skip', showlegend=False))
+    fig.add_trace(go.Scatter(x=years, y=q[2], name=f"{name} (médiane)", line=dict(color=color, width=3)))
 
 # --- 3. VISUALISATION ---
 st.header("2. Résultats de la Projection")
 
+m1, m2, m3, m4 = st.columns(4)
+m1.metric("Taux Servi Moyen (médiane)", f"{np.median(res['rate_served'].mean(axis=1))*100:.2f}%")
+m2.metric(f"Proba. Taux Servi < Cible (an {horizon})", f"{(res['rate_served'][:, -1] < target_rate - 1e-9).mean()*100:.1f}%")
+m3.metric(f"Ratio de Solvabilité an {horizon} (5e centile)", f"{np.percentile(res['solvency'][:, -1], 5)*100:.0f}%",
+          delta=f"Médiane : {np.median(res['solvency'][:, -1])*100:.0f}%", delta_color="off")
+m4.metric("TVOG (Coût des Garanties)", f"{tvog['tvog']:,.1f} M€", delta=f"± {1.96*tvog['stderr']:,.1f} M€ (IC 95%)", delta_color="off",
+          help="Valeur actuelle moyenne (risque neutre) du coût du TMG supporté par les fonds propres, moins sa valeur en scénario central.")
+st.caption(f"{n_scen:,} scénarios x {horizon} ans projetés en {elapsed*1000:,.0f} ms (monde réel + risque neutre + central).")
+
 col_res1, col_res2 = st.columns(2)
 
 with col_res1:
     # Graphique Taux
     fig_rates = go.Figure()
-    fig_rates.add_trace(go.Scatter(x=years, y=np.array(res_yield_asset)*100, name="Rendement Actif", line=dict(color='blue')))
-    fig_rates.add_trace(go.Scatter(x=years, y=np.array(res_rate_served)*100, name="Taux Servi (Net)", line=dict(color='green', width=3)))
+    fan(fig_rates, res["yield_asset"], "Rendement Actif", 'rgba(0, 0, 255, 1)', 100)
+    fan(fig_rates, res["rate_served"], "Taux Servi (Net)", 'rgba(0, 128, 0, 1)', 100)
     fig_rates.add_hline(y=target_rate*100, line_dash="dash", line_color="gray", annotation_text="Cible Concurrents")
     fig_rates.add_hline(y=tmg*100, line_dash="dot", line_color="red", annotation_text="TMG")
 
-    fig_rates.update_layout(title="Pilotage du Taux Servi vs Rendement Actif", xaxis_title="Année", yaxis_title="Taux (%)")
+    fig_rates.update_layout(title="Pilotage du Taux Servi vs Rendement Actif (5%-95%)", xaxis_title="Année", yaxis_title="Taux (%)")
     st.plotly_chart(fig_rates, use_container_width=True)
 
 with col_res2:
     # Graphique PPB
     fig_ppb = go.Figure()
-    fig_ppb.add_trace(go.Bar(x=years, y=res_ppb_stock, name="Stock PPB", marker_color='orange'))
+    fan(fig_ppb, res["ppb"], "Stock PPB", 'rgba(255, 165, 0, 1)')
     fig_ppb.update_layout(title="Évolution de la Provision pour Participation aux Bénéfices (PPB)", xaxis_title="Année", yaxis_title="Montant (M€)")
     st.plotly_chart(fig_ppb, use_container_width=True)
 
+col_res3, col_res4 = st.columns(2)
+
+with col_res3:
+    fig_solv = go.Figure()
+    fan(fig_solv, res["solvency"], "Ratio de Solvabilité", 'rgba(128, 0, 128, 1)', 100)
+    fig_solv.add_hline(y=100, line_dash="dash", line_color="red", annotation_text="100% SCR")
+    fig_solv.update_layout(title="Distribution du Ratio de Solvabilité (proxy S2)", xaxis_title="Année", yaxis_title="Ratio (%)")
+    st.plotly_chart(fig_solv, use_container_width=True)
+
+with col_res4:
+    fig_hist = go.Figure()
+    fig_hist.add_trace(go.Histogram(x=res["rate_served"].mean(axis=1)*100, nbinsx=60, name="Taux servi moyen", marker_color='green'))
+    fig_hist.update_layout(title=f"Distribution du Taux Servi Moyen sur {horizon} ans", xaxis_title="Taux (%)", yaxis_title="Nombre de scénarios")
+    st.plotly_chart(fig_hist, use_container_width=True)
+
+st.subheader("Comportement des Assurés : Rachats Dynamiques")
+col_res7, col_res8 = st.columns(2)
+
+with col_res7:
+    fig_lapse = go.Figure()
+    fan(fig_lapse, res["lapse_rate"], "Taux de Rachat", 'rgba(255, 0, 0, 1)', 100)
+    fig_lapse.add_hline(y=taux_rachat*100, line_dash="dash", line_color="gray", annotation_text="Rachat structurel")
+    fig_lapse.update_layout(title="Taux de Rachat Total (structurel + conjoncturel, 5%-95%)", xaxis_title="Année", yaxis_title="Taux (%)")
+    st.plotly_chart(fig_lapse, use_container_width=True)
+
+with col_res8:
+    if lapse_law != "Aucun":
+        gap = np.linspace(-0.08, 0.06, 141)
+        fig_law = go.Figure()
+        for name in ONC_LAWS:
+            fig_law.add_trace(go.Scatter(x=gap*100, y=cyclical_lapse(gap, 0.0, name)*100, name=name,
+                                         line=dict(width=4 if name == lapse_law else 2, dash=None if name == lapse_law else 'dot')))
+        fig_law.update_layout(title="Loi de Rachat Conjoncturel (ONC ACPR)", xaxis_title="Taux servi - Taux concurrent (%)", yaxis_title="Rachat conjoncturel (%)")
+        st.plotly_chart(fig_law, use_container_width=True)
+    else:
+        st.info("Rachats statiques : seul le taux structurel s'applique.")
+
+st.subheader("Portefeuille Obligataire : Rendement Comptable et Plus-Values Latentes")
+col_res5, col_res6 = st.columns(2)
+
+with col_res5:
+    fig_book = go.Figure()
+    fan(fig_book, res["book_yield"], "Taux de Rendement Comptable", 'rgba(0, 0, 255, 1)', 100)
+    fig_book.add_trace(go.Scatter(x=years, y=np.median(res["market_rate"], axis=0) * 100, name="Taux de Marché (médiane)",
+                                  line=dict(color='gray', dash='dash')))
+    fig_book.update_layout(title="Rendement Comptable du Portefeuille vs Taux de Réinvestissement", xaxis_title="Année", yaxis_title="Taux (%)")
+    st.plotly_chart(fig_book, use_container_width=True)
+
+with col_res6:
+    fig_pvl = go.Figure()
+    fan(fig_pvl, res["unrealised_gains"], "PVL / MVL obligataires", 'rgba(255, 0, 0, 1)')
+    fig_pvl.add_trace(go.Bar(x=years, y=res["realised_gains"].mean(axis=0), name="Plus-values réalisées (moyenne)", marker_color='orange', opacity=0.6))
+    fig_pvl.add_hline(y=0, line_color="black", line_width=1)
+    fig_pvl.update_layout(title="Plus ou Moins-Values Latentes (5%-95%) et Réalisations", xaxis_title="Année", yaxis_title="Montant (M€)")
+    st.plotly_chart(fig_pvl, use_container_width=True)
+
+# --- 4. PROXY LSMC ---
+st.header("3. Fonction Proxy (LSMC) : SCR à 1 an")
+st.markdown("""
+Les simulations dans les simulations (ORSA, SCR à 1 an) sont hors de portée du modèle complet. On calibre une **fonction proxy** :
+quelques milliers de scénarios externes (taux et actions à 1 an) sont projetés avec très peu de chemins internes risque neutre,
+puis une **régression polynomiale régularisée** des fonds propres sur les facteurs de risque filtre le bruit. Le proxy est ensuite
+évalué sur plus de 100 000 scénarios monde réel pour obtenir la **VaR 99.5%** des fonds propres.
+""")
+
+col_l1, col_l2, col_l3 = st.columns(3)
+with col_l1:
+    n_outer = st.select_slider("Scénarios de calibrage (externes)", options=[1_000, 2_000, 4_000, 8_000], value=4_000)
+    n_inner = st.slider("Chemins internes par scénario", 1, 8, 2)
+with col_l2:
+    degree = st.slider("Degré du polynôme", 1, 5, 4)
+    ridge = 10 ** st.slider("Régularisation ridge (log10 λ)", -8, 0, -4)
+with col_l3:
+    n_eval = st.select_slider("Scénarios d'évaluation du proxy", options=[100_000, 200_000, 500_000, 1_000_000], value=200_000)
+
+@st.cache_data
+def run_lsmc(n_outer, n_inner, degree, ridge, n_eval, horizon, gse, yield_equity, strategy, n_lines):
+    start = time.perf_counter()
+    # Même échelle obligataire que la projection stochastique (section 2)
+    strategy = dict(strategy, ladder=generate_bond_ladder(n_lines, total_nominal=strategy["alloc_bond"] * strategy["aum"],
+                                                          market_yield=gse["r0"]))
+    # Calibrage sur des chocs élargis (x1.5) pour couvrir la queue de distribution
+    drivers = sample_risk_drivers(n_outer, equity_return=yield_equity, widen=1.5, **gse)
+    own_funds = own_funds_at_one_year(drivers, n_inner, horizon, strategy, gse)
+    proxy = fit_proxy(drivers, own_funds, degree, ridge)
+    fit_time = time.perf_counter() - start
+
+    # Validation : scénarios hors échantillon estimés avec beaucoup de chemins internes
+    validation = sample_risk_drivers(50, equity_return=yield_equity, widen=1.5, seed=7, **gse)
+    validation_of = own_funds_at_one_year(validation, 200, horizon, strategy, gse, seed=44)
+
+    outer = sample_risk_drivers(n_eval, equity_return=yield_equity, seed=8, **gse)
+    start = time.perf_counter()
+    scr = proxy_scr(proxy, outer, gse["r0"])
+    eval_time = time.perf_counter() - start
+    return drivers, own_funds, proxy, validation, validation_of, outer, scr, fit_time, eval_time
+
+gse_params = dict(r0=yield_bond, kappa=kappa, rate_vol=rate_vol, equity_vol=equity_vol)
+lsmc_strategy = dict(aum=aum_initial, pm=pm_initial, ppb=ppb_initial, alloc_bond=alloc_bond, tmg=tmg, target_rate=target_rate,
+                     reinvest_maturity=reinvest_maturity, realise_gains=realise_gains,
+                     lapse=taux_rachat, lapse_law=None if lapse_law == "Aucun" else lapse_law)
+drivers, own_funds_fit, proxy, validation, validation_of, outer, scr_lsmc, fit_time, eval_time = run_lsmc(
+    n_outer, n_inner, degree, ridge, n_eval, horizon, gse_params, yield_equity, lsmc_strategy, n_lines)
+validation_proxy = evaluate_proxy(proxy, validation)
+
+l1, l2, l3, l4 = st.columns(4)
+l1.metric("SCR à 1 an (VaR 99.5%)", f"{scr_lsmc['scr']:,.1f} M€")
+l2.metric("Fonds Propres t=1 (moyenne proxy)", f"{scr_lsmc['own_funds'].mean():,.1f} M€",
+          delta=f"Quantile 0.5% : {scr_lsmc['quantile']:,.1f} M€", delta_color="off")
+l3.metric("R² de calibrage", f"{proxy['r2']:.2f}", help="Faible avec peu de chemins internes : la variance résiduelle est surtout du bruit Monte Carlo.")
+l4.metric("Erreur de validation (RMSE)", f"{np.sqrt(np.mean((validation_proxy - validation_of)**2)):,.2f} M€",
+          help="50 scénarios hors échantillon, fonds propres estimés avec 200 chemins internes.")
+st.caption(f"Calibrage : {n_outer * n_inner:,} projections complètes en {fit_time*1000:,.0f} ms. "
+           f"Évaluation du proxy sur {n_eval:,} scénarios en {eval_time*1000:,.0f} ms. "
+           "Taux concurrent fixe (taux cible) dans les chemins internes.")
+
+col_l4, col_l5 = st.columns(2)
+
+with col_l4:
+    rate_grid = np.linspace(*np.percentile(drivers[:, 0], [1, 99]), 40)
+    equity_grid = np.linspace(*np.percentile(drivers[:, 1], [1, 99]), 40)
+    rr, ee = np.meshgrid(rate_grid, equity_grid)
+    surface = evaluate_proxy(proxy, np.column_stack([rr.ravel(), ee.ravel()])).reshape(rr.shape)
+    fig_surf = go.Figure(go.Contour(x=rate_grid*100, y=equity_grid*100, z=surface, colorscale='RdYlGn', colorbar=dict(title="FP (M€)")))
+    fig_surf.add_trace(go.Scatter(x=validation[:, 0]*100, y=validation[:, 1]*100, mode='markers', name="Validation",
+                                  marker=dict(color='black', size=5)))
+    fig_surf.update_layout(title="Surface Proxy des Fonds Propres à 1 an", xaxis_title=f"{RISK_DRIVERS[0]} (%)", yaxis_title=f"{RISK_DRIVERS[1]} (%)")
+    st.plotly_chart(fig_surf, use_container_width=True)
+
+with col_l5:
+    fig_of = go.Figure()
+    fig_of.add_trace(go.Histogram(x=scr_lsmc["own_funds"], nbinsx=80, name="Fonds propres proxy", marker_color='purple'))
+    fig_of.add_vline(x=scr_lsmc["quantile"], line_dash="dash", line_color="red", annotation_text="Quantile 0.5%")
+    fig_of.update_layout(title=f"Distribution des Fonds Propres à 1 an ({n_eval:,} scénarios)", xaxis_title="Fonds propres (M€)", yaxis_title="Nombre de scénarios")
+    st.plotly_chart(fig_of, use_container_width=True)
+
+# --- 5. OPTIMISATION DE LA STRATÉGIE ---
+st.header("4. Optimisation de la Stratégie ALM")
+st.markdown("""
+Balayage d'une grille de stratégies (**allocation obligataire x taux cible x plafond de PPB**) sur le **même jeu de scénarios**
+monde réel : chaque point de grille est une projection complète, répartie sur les cœurs disponibles (pool de processus).
+La **frontière efficiente** retient les stratégies non dominées entre taux servi moyen et ratio de solvabilité (5e centile).
+""")
+
+col_o1, col_o2, col_o3 = st.columns(3)
+with col_o1:
+    sweep_alloc = st.slider("Allocation obligataire (min - max, %)", 0, 100, (50, 100), 5)
+    alloc_step = st.select_slider("Pas d'allocation (%)", options=[5, 10, 25], value=10)
+with col_o2:
+    sweep_target = st.slider("Taux cible (min - max, %)", 0.0, 6.0, (2.0, 4.0), 0.5)
+    target_step = st.select_slider("Pas du taux cible (%)", options=[0.25, 0.5, 1.0], value=0.5)
+with col_o3:
+    sweep_ppb = st.multiselect("Plafonds de PPB (% des PM)", [2, 4, 6, 8, 10, 15], default=[4, 8, 15])
+    n_cpu = os.cpu_count() or 1
+    n_workers = st.number_input("Processus parallèles", 1, n_cpu, n_cpu, help=f"{n_cpu} cœurs disponibles.")
+
+@st.cache_data
+def run_sweep(n_scen, horizon, yield_bond, yield_equity, gse, base_params, alloc_grid, target_grid, ppb_grid, n_lines, n_workers):
+    start = time.perf_counter()
+    rw = simulate_economic_scenarios(n_scen, horizon, equity_return=yield_equity, seed=42, **gse)
+    base_params = dict(base_params, ladder=generate_bond_ladder(n_lines, market_yield=yield_bond))
+    results = sweep_strategies(rw, base_params, alloc_grid, target_grid, ppb_grid, max_workers=n_workers)
+    return results, time.perf_counter() - start
+
+alloc_grid = tuple(np.arange(sweep_alloc[0], sweep_alloc[1] + 1e-9, alloc_step) / 100)
+target_grid = tuple(np.arange(sweep_target[0], sweep_target[1] + 1e-9, target_step) / 100)
+ppb_grid = tuple(np.array(sorted(sweep_ppb or [8])) / 100)
+n_grid = len(alloc_grid) * len(target_grid) * len(ppb_grid)
+
+if st.button(f"🚀 Lancer le balayage ({n_grid} stratégies x {n_scen:,} scénarios)"):
+    sweep_base = dict(aum=aum_initial, pm=pm_initial, ppb=ppb_initial, tmg=tmg, reinvest_maturity=reinvest_maturity,
+                      realise_gains=realise_gains, lapse=taux_rachat, lapse_law=None if lapse_law == "Aucun" else lapse_law)
+    gse_rw = dict(r0=yield_bond, kappa=kappa, rate_vol=rate_vol, equity_vol=equity_vol)
+    sweep, sweep_time = run_sweep(n_scen, horizon, yield_bond, yield_equity, gse_rw, sweep_base,
+                                  alloc_grid, target_grid, ppb_grid, n_lines, n_workers)
+    frontier = efficient_frontier(sweep)
+    st.caption(f"{len(sweep)} stratégies évaluées en {sweep_time:,.1f} s sur {n_workers} processus.")
+
+    fig_front = go.Figure()
+    fig_front.add_trace(go.Scatter(x=sweep["Solvabilité P5"]*100, y=sweep["Taux Servi Moyen"]*100, mode='markers', name="Stratégies",
+                                   marker=dict(color=sweep["alloc_bond"]*100, colorscale='Viridis', size=8, colorbar=dict(title="Oblig. (%)")),
+                                   text=[f"Oblig. {a:.0%} | Cible {c:.2%} | PPB max {p:.0%}" for a, c, p in sweep[["alloc_bond", "target_rate", "ppb_cap"]].to_numpy()]))
+    fig_front.add_trace(go.Scatter(x=frontier["Solvabilité P5"]*100, y=frontier["Taux Servi Moyen"]*100, mode='lines+markers',
+                                   name="Frontière efficiente", line=dict(color='red', width=3)))
+    fig_front.update_layout(title="Frontière Efficiente : Taux Servi Moyen vs Solvabilité (5e centile)",
+                            xaxis_title=f"Ratio de solvabilité an {horizon}, 5e centile (%)", yaxis_title="Taux servi moyen (%)", height=500)
+    st.plotly_chart(fig_front, use_container_width=True)
+
+    st.dataframe(frontier.style.format({"alloc_bond": "{:.0%}", "target_rate": "{:.2%}", "ppb_cap": "{:.0%}", "Taux Servi Moyen": "{:.2%}",
+                                        "Solvabilité P5": "{:.0%}", "Solvabilité Médiane": "{:.0%}", "Proba. Taux < TMG + 0.1%": "{:.1%}"}),
+                 use_container_width=True)
+
 st.info("""
 **Mécanique ALM :**
 *   Si le **Rendement Actif > Taux Cible**, l'assureur sert le taux cible et met le surplus en **PPB**.
 *   Si le **Rendement Actif < Taux Cible**, l'assureur reprend de la **PPB** pour soutenir le taux servi.
 *   Si la PPB est épuisée, le taux servi tombe au niveau du rendement actif (voire au TMG si krach).
+*   Un taux servi inférieur au taux concurrent déclenche des **rachats dynamiques**, qui forcent des cessions d'actifs (réalisation de moins-values latentes si les taux ont monté).
+*   Le portefeuille obligataire est suivi **ligne à ligne** (agrégé par maturité résiduelle) : le rendement comptable converge lentement vers les taux de marché au fil des réinvestissements au pair.
+*   Une hausse des taux crée des **moins-values latentes** ; une baisse, des plus-values que l'assureur peut réaliser pour soutenir le taux servi.
 """)
\ No newline at end of file
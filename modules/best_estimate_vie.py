@@ -3,6 +3,8 @@ import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 
+from utils.dynamic_lapse import ONC_LAWS, lapse_rate
+
 st.set_page_config(page_title="Best Estimate Vie", layout="wide")
 
 st.title("💰 Best Estimate Liabilities (BEL) - Vie")
@@ -36,11 +38,17 @@ with col2:
     st.subheader("Comportement & Frais")
     taux_rachat = st.slider("Taux de Rachat Structurel (%)", 0.0, 15.0, 4.0, 0.5) / 100
     frais_gestion = st.slider("Frais de Gestion (% Encours)", 0.1, 2.0, 0.60, 0.05) / 100
+    loi_rachat = st.selectbox("Rachats Dynamiques", ["Aucun", *ONC_LAWS], index=0,
+                              help="Rachats conjoncturels fonction de l'écart taux servi - taux attendu par les assurés (ONC ACPR 2013).")
     choc_mass_lapse = st.checkbox("Appliquer un Choc Rachat Massif (40% en t=1) ?", value=False)
 
 with col3:
     st.subheader("Environnement Éco")
     taux_tech = st.number_input("Taux Revalorisation (PB) (%)", 0.0, 5.0, 2.0, 0.1) / 100
+    taux_concurrent = st.number_input("Taux Attendu (Concurrence) (%)", 0.0, 8.0, 2.5, 0.1) / 100
+    hausse_concurrent = st.slider("Hausse du Taux Attendu sur 5 ans (pts)", -2.0, 4.0, 1.0, 0.25,
+                                  help="Le taux attendu par les assurés monte linéairement pendant 5 ans, le taux servi restant fixe : "
+                                       "l'écart, donc le rachat dynamique, varie d'une année à l'autre.") / 100
     taux_actualisation = st.slider("Taux d'Actualisation (Plat) (%)", 0.0, 6.0, 2.5, 0.1) / 100
 
 
@@ -62,6 +70,10 @@ flux_rachats = np.zeros(horizon)
 flux_deces = np.zeros(horizon)
 flux_frais = np.zeros(horizon)
 
+# Taux de rachat par année : l'écart taux servi - taux attendu évolue avec la hausse du taux concurrent
+taux_attendu = taux_concurrent + hausse_concurrent * np.minimum(years / 5, 1.0)
+taux_rachats = lapse_rate(taux_rachat, np.full(horizon, taux_tech), taux_attendu, None if loi_rachat == "Aucun" else loi_rachat)
+
 for t in range(horizon):
     age_actuel = age_moyen + t
     
@@ -74,7 +86,7 @@ for t in range(horizon):
     
     # 3. Flux Sortants (Prestations & Frais)
     qx = get_qx(age_actuel)
-    rachat_t = 0.40 if (choc_mass_lapse and t == 0) else taux_rachat
+    rachat_t = 0.40 if (choc_mass_lapse and t == 0) else taux_rachats[t]
     
     montant_deces = base_calcul * qx
     montant_rachats = base_calcul * rachat_t
@@ -100,9 +112,11 @@ bel = np.sum(flux_actualises)
 st.divider()
 st.header("2. Résultats de la Projection")
 
-col_res1, col_res2 = st.columns(2)
+col_res1, col_res2, col_res3 = st.columns(3)
 col_res1.metric("Best Estimate (BEL)", f"{bel:,.1f} M€", delta="Valeur Actuelle des Engagements")
 col_res2.metric("Ratio BEL / Encours", f"{bel/encours_initial*100:.1f}%", help="Indicateur de valeur : < 100% signifie que le portefeuille génère de la valeur future (VIF).")
+col_res3.metric("Taux de Rachat Total (an 2)", f"{taux_rachats[1] * 100:.1f}%",
+                delta=f"Structurel : {taux_rachat*100:.1f}% | An 5 : {taux_rachats[4]*100:.1f}%", delta_color="off")
 
 # Graphique des flux
 fig = go.Figure()
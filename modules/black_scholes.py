@@ -1,8 +1,13 @@
+import time
 import streamlit as st
 import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
-from scipy.stats import norm
+
+from utils.heston import calibrate_heston, heston_prices
+from utils.option_numerics import barrier_price, barrier_supported, benchmark_methods, crank_nicolson, monte_carlo_exotic
+from utils.option_pricing import (GREEKS, bs_price_greeks, generate_option_book, generate_smile_quotes, implied_volatility,
+                                  price_surface, revalue_book, surface_to_frame)
 
 st.set_page_config(page_title="Modèle Black-Scholes", layout="wide")
 
@@ -53,36 +58,10 @@ with col3:
     opt_type = st.radio("Type d'Option", ["Call", "Put"])
 
 # --- 2. MOTEUR DE CALCUL ---
-def black_scholes(S, K, T, r, sigma, type="Call"):
-    d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-    d2 = d1 - sigma * np.sqrt(T)
-    
-    if type == "Call":
-        price = S * norm.cdf(d1) - K * np.exp(-r * T) * norm.cdf(d2)
-    else:
-        price = K * np.exp(-r * T) * norm.cdf(-d2) - S * norm.cdf(-d1)
-    return price
-
-def calculate_greeks(S, K, T, r, sigma, type="Call"):
-    d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-    d2 = d1 - sigma * np.sqrt(T)
-    
-    if type == "Call":
-        delta = norm.cdf(d1)
-        rho = K * T * np.exp(-r * T) * norm.cdf(d2)
-        theta = - (S * norm.pdf(d1) * sigma) / (2 * np.sqrt(T)) - r * K * np.exp(-r * T) * norm.cdf(d2)
-    else:
-        delta = norm.cdf(d1) - 1
-        rho = -K * T * np.exp(-r * T) * norm.cdf(-d2)
-        theta = - (S * norm.pdf(d1) * sigma) / (2 * np.sqrt(T)) + r * K * np.exp(-r * T) * norm.cdf(-d2)
-
-    gamma = norm.pdf(d1) / (S * sigma * np.sqrt(T))
-    vega = S * norm.pdf(d1) * np.sqrt(T)
-    
-    return {"Delta": delta, "Gamma": gamma, "Vega": vega / 100, "Theta": theta / 365, "Rho": rho / 100}
-
-price = black_scholes(S, K, T, r, sigma, opt_type)
-greeks = calculate_greeks(S, K, T, r, sigma, opt_type)
+# Moteur vectorisé (utils/option_pricing.py) : d1, d2 et lois normales partagés entre le prix et les grecques
+res = bs_price_greeks(S, K, T, r, sigma, opt_type)
+price = float(res["Prix"])
+greeks = {g: float(res[g]) for g in GREEKS}
 
 # --- 3. RÉSULTATS ---
 st.header("2. Valorisation & Sensibilités (Grecques)")
@@ -102,8 +81,11 @@ with c2:
     # Graphique : Prix vs Spot
     st.subheader("Analyse de Sensibilité : Prix vs Spot")
     
-    spot_range = np.linspace(S * 0.5, S * 1.5, 100)
-    prices = [black_scholes(s, K, T, r, sigma, opt_type) for s in spot_range]
+    # Courbe en cache (grille relative au strike) : un changement de S ne déplace que le marqueur ;
+    # la plage par défaut (50% - 150% du strike) n'est élargie que si le spot s'en approche ou en sort
+    curve_range = (min(0.5, 0.8 * S / K), max(1.5, 1.2 * S / K))
+    spot_range, _, curve = price_surface(K, r, sigma, opt_type, curve_range, t_max=T, n_spot=100, n_time=1)
+    prices = curve["Prix"][-1]
     
     # Payoff à maturité
     if opt_type == "Call":
@@ -125,31 +107,274 @@ st.divider()
 
 # --- 4. SURFACE DE VOLATILITÉ (OPTIONNEL) ---
 st.header("3. Surface de Prix (Spot x Maturité)")
-st.markdown("Visualisation 3D de l'évolution du prix de l'option en fonction du Spot et du Temps restant.")
-
-spot_3d = np.linspace(S * 0.5, S * 1.5, 30)
-time_3d = np.linspace(0.01, T, 30)
-spot_grid, time_grid = np.meshgrid(spot_3d, time_3d)
-
-# Vectorisation simple pour la grille
-def bs_vectorized(s, t):
-    return black_scholes(s, K, t, r, sigma, opt_type)
-
-z_price = np.vectorize(bs_vectorized)(spot_grid, time_grid)
-
-fig_3d = go.Figure(data=[go.Surface(z=z_price, x=spot_3d, y=time_3d, colorscale='Viridis')])
+st.markdown("Visualisation 3D de l'évolution du prix de l'option (ou d'une grecque) en fonction du Spot et du Temps restant.")
+
+col_s1, col_s2, col_s3 = st.columns(3)
+with col_s1:
+    surface_measure = st.selectbox("Grandeur affichée", ["Prix"] + GREEKS)
+with col_s2:
+    n_surface = st.select_slider("Finesse de la grille", options=[30, 100, 300, 1000], value=30,
+                                 format_func=lambda n: f"{n} x {n}")
+with col_s3:
+    moneyness = st.slider("Plage de spot (% du strike)", 10, 300, (50, 150), 10)
+
+# Surfaces prix + grecques calculées en une passe et mises en cache (LRU) : changer la grandeur affichée ou le spot
+# ne déclenche aucun recalcul ; seuls K, r, σ, le type et la grille invalident la surface.
+spot_3d, time_3d, surfaces = price_surface(K, r, sigma, opt_type, (moneyness[0] / 100, moneyness[1] / 100), T, n_surface, n_surface)
+z_surface = surfaces[surface_measure]
+# Marqueur seulement si le spot est dans la plage affichée (pas d'extrapolation constante de np.interp)
+spot_in_grid = spot_3d[0] <= S <= spot_3d[-1]
+stride = -(-n_surface // 100)  # affichage limité à ~100 x 100 points, la grille complète reste exportable
+display = np.r_[0:n_surface:stride, n_surface - 1] if (n_surface - 1) % stride else np.arange(0, n_surface, stride)
+
+fig_3d = go.Figure(data=[go.Surface(z=z_surface[np.ix_(display, display)], x=spot_3d[display], y=time_3d[display], colorscale='Viridis')])
+if spot_in_grid:
+    fig_3d.add_trace(go.Scatter3d(x=[S], y=[T], z=[np.interp(S, spot_3d, z_surface[-1])], mode='markers', name='Situation Actuelle',
+                                  marker=dict(color='red', size=6)))
 fig_3d.update_layout(scene=dict(
     xaxis_title='Spot',
     yaxis_title='Temps (Années)',
-    zaxis_title='Prix Option'
+    zaxis_title=surface_measure
 ), height=600)
 
+cache = price_surface.cache_info()
+st.caption(f"Cache des surfaces : {cache.hits} réutilisations, {cache.misses} calculs, {cache.currsize}/{cache.maxsize} surfaces en mémoire."
+           + ("" if spot_in_grid else f" Spot actuel ({S:g}) hors de la plage de spot choisie : marqueur non affiché."))
 st.plotly_chart(fig_3d, use_container_width=True)
 
+@st.cache_data(max_entries=4)
+def export_surface(K, r, sigma, opt_type, moneyness, T, n_surface):
+    return surface_to_frame(*price_surface(K, r, sigma, opt_type, moneyness, T, n_surface, n_surface)).to_parquet(index=False)
+
+st.download_button(f"📥 Exporter la surface {n_surface} x {n_surface} (prix et grecques, Parquet)",
+                   export_surface(K, r, sigma, opt_type, (moneyness[0] / 100, moneyness[1] / 100), T, n_surface),
+                   file_name=f"surface_{opt_type.lower()}_K{K:g}_{n_surface}x{n_surface}.parquet", mime="application/octet-stream")
+
+st.divider()
+
+# --- 5. PORTEFEUILLE D'OPTIONS ---
+st.header("4. Revalorisation d'un Portefeuille d'Options")
+st.markdown("""
+En production, un desk revalorise des **centaines de milliers d'options** à chaque mouvement de marché.
+Le moteur traite le portefeuille comme des colonnes (S, K, T, r, σ, type, quantité) : un seul passage calcule le prix et toutes les grecques.
+""")
+
+col_b1, col_b2 = st.columns([1, 3])
+with col_b1:
+    n_options = st.select_slider("Nombre d'options", options=[10_000, 100_000, 500_000, 1_000_000], value=100_000)
+    spot_shift = st.slider("Choc sur le sous-jacent (%)", -30, 30, 0, 5) / 100
+
+@st.cache_data
+def load_option_book(n_options, spot):
+    return generate_option_book(n_options, spot=spot)
+
+# Revalorisation en cache : seuls les agrégats (totaux, ventilation par maturité) sont conservés
+@st.cache_data(max_entries=8)
+def revalue_option_book(n_options, spot, shocked_spot):
+    book = load_option_book(n_options, spot).assign(S=shocked_spot)
+    start = time.perf_counter()
+    positions, totals = revalue_book(book)
+    elapsed = time.perf_counter() - start
+    by_maturity = pd.DataFrame(positions).groupby(pd.cut(book["T"], [0, 0.5, 1, 2, 3, 5]), observed=True).sum()
+    by_maturity.index = by_maturity.index.astype(str)
+    return totals, by_maturity, elapsed
+
+totals, by_maturity, elapsed = revalue_option_book(n_options, S, S * (1 + spot_shift))
+
+with col_b2:
+    b1, b2, b3, b4 = st.columns(4)
+    b1.metric("Valeur du Portefeuille", f"{totals['Prix']:,.0f} €")
+    b2.metric("Delta Total", f"{totals['Delta']:,.0f}")
+    b3.metric("Vega Total (1%)", f"{totals['Vega']:,.0f}")
+    b4.metric("Temps de Revalorisation", f"{elapsed*1000:,.0f} ms", delta=f"{n_options / elapsed / 1e6:,.1f} M options/s", delta_color="off")
+    st.dataframe(by_maturity.style.format("{:,.0f}"), use_container_width=True)
+
+st.divider()
+
+# --- 6. VOLATILITÉ IMPLICITE ---
+st.header("5. Volatilité Implicite : Problème Inverse")
+st.markdown("""
+Le marché cote des **prix** ; la volatilité implicite est le σ qui, injecté dans Black-Scholes, reproduit le prix coté.
+Le solveur traite toute la surface en une fois : point de départ rationnel (**Corrado-Miller**) puis quelques itérations de **Halley** vectorisées,
+avec garde-fous sur la Vega. Les cotations sans valeur temps (hors bornes d'arbitrage ou Vega nulle) sont masquées.
+""")
+st.latex(r"\sigma_{n+1} = \sigma_n - \frac{\Delta_n}{1 - \frac{1}{2}\Delta_n \frac{d_1 d_2}{\sigma_n}}, \quad \Delta_n = \frac{BS(\sigma_n) - P_{marché}}{\mathcal{V}(\sigma_n)}")
+
+col_iv1, col_iv2 = st.columns([1, 3])
+with col_iv1:
+    n_side = st.select_slider("Grille de cotations (strikes x maturités)", options=[20, 50, 100, 200], value=100,
+                              format_func=lambda n: f"{n} x {n} = {n*n:,}")
+    skew = st.slider("Skew", -0.30, 0.10, -0.10, 0.01)
+    noise = st.slider("Bruit de cotation (% du prix)", 0.0, 2.0, 0.0, 0.1) / 100
+
+@st.cache_data(max_entries=8)
+def invert_smile(S, r, n_side, sigma, skew, noise):
+    quotes = generate_smile_quotes(S, r, n_side, n_side, atm_vol=sigma, skew=skew, noise=noise)
+    start = time.perf_counter()
+    iv, converged = implied_volatility(quotes["Prix"], S, quotes["K"], quotes["T"], r, quotes["Type"].to_numpy())
+    return quotes, iv, converged, time.perf_counter() - start
+
+quotes, iv, converged, iv_time = invert_smile(S, r, n_side, sigma, skew, noise)
+
+with col_iv2:
+    v1, v2, v3 = st.columns(3)
+    v1.metric("Cotations Inversées", f"{len(quotes):,}", delta=f"{iv_time*1000:,.1f} ms", delta_color="off")
+    v2.metric("Taux de Convergence", f"{converged.mean()*100:.2f}%", help="Cotations masquées : prix hors bornes d'arbitrage ou Vega quasi nulle.")
+    v3.metric("Erreur Max vs Vol Vraie", f"{np.nanmax(np.abs(iv - quotes['Vol Vraie'].to_numpy()))*1e4:,.1f} bp")
+
+    iv_grid = iv.reshape(n_side, n_side)
+    fig_iv = go.Figure(data=[go.Surface(z=iv_grid * 100, x=quotes["K"].to_numpy()[:n_side], y=quotes["T"].to_numpy()[::n_side], colorscale='Plasma')])
+    fig_iv.update_layout(title="Surface de Volatilité Implicite", scene=dict(xaxis_title='Strike', yaxis_title='Maturité (Années)', zaxis_title='Vol. Implicite (%)'), height=550)
+    st.plotly_chart(fig_iv, use_container_width=True)
+
+st.divider()
+
+# --- 7. AMÉRICAINES ET EXOTIQUES ---
+st.header("6. Options Américaines et Exotiques : Méthodes Numériques")
+st.markdown("""
+Sans formule fermée, on recourt à deux familles de méthodes :
+*   **EDP (Crank-Nicolson)** : l'équation de Black-Scholes est discrétisée sur une grille spot x temps ; chaque pas résout un système **tridiagonal** (solveur en bandes).
+    L'exercice anticipé (option **américaine**) est imposé en projetant la valeur sur le payoff à chaque pas.
+*   **Monte Carlo** : pour les payoffs dépendant du chemin (**asiatique**, **barrière**), avec **variables antithétiques** et **variable de contrôle**
+    (asiatique géométrique en formule fermée, vanille Black-Scholes pour la barrière).
+""")
+
+col_n1, col_n2, col_n3 = st.columns(3)
+with col_n1:
+    n_grid = st.select_slider("Grille EDP (spot x temps)", options=[50, 100, 200, 400, 800], value=200)
+with col_n2:
+    n_paths = st.select_slider("Chemins Monte Carlo", options=[10_000, 50_000, 100_000, 200_000], value=50_000)
+    n_obs = st.select_slider("Dates d'observation", options=[12, 52, 252], value=52)
+with col_n3:
+    barrier = st.slider("Barrière désactivante (% du spot)", 50, 99, 85, 1) / 100 * S
+    variance_reduction = st.checkbox("Antithétiques + variable de contrôle", value=True)
+
+@st.cache_data
+def run_pde(S, K, T, r, sigma, opt_type, n_grid):
+    return [crank_nicolson(S, K, T, r, sigma, opt_type, american=flag, n_space=n_grid, n_time=n_grid) for flag in (True, False)]
+
+@st.cache_data
+def run_exotics(S, K, T, r, sigma, opt_type, barrier_level, n_paths, n_obs, variance_reduction, products):
+    return [monte_carlo_exotic(S, K, T, r, sigma, opt_type, product, barrier_level, n_paths, n_obs,
+                               antithetic=variance_reduction, control_variate=variance_reduction)
+            for product in products]
+
+barrier_type = "Call down-and-out" if opt_type == "Call" else "Put up-and-out"
+barrier_level = barrier if opt_type == "Call" else S ** 2 / barrier  # barrière du côté hors de la monnaie
+# La formule fermée (et le contrôle) suppose la barrière au-delà du strike : sinon seule l'asiatique est calculée
+with_barrier = barrier_supported(S, K, barrier_level, opt_type)
+american, european = run_pde(S, K, T, r, sigma, opt_type, n_grid)
+asian, *knock_out = run_exotics(S, K, T, r, sigma, opt_type, barrier_level, n_paths, n_obs, variance_reduction,
+                                ("Asiatique", "Barrière") if with_barrier else ("Asiatique",))
+
+n1, n2, n3, n4 = st.columns(4)
+n1.metric(f"{opt_type} Américain (EDP)", f"{american['Prix']:.4f} €", delta=f"Prime d'exercice anticipé : {american['Prix'] - european['Prix']:.4f} €", delta_color="off",
+          help="Sans dividende, le Call américain vaut le Call européen (exercice anticipé jamais optimal).")
+n2.metric(f"{opt_type} Européen (EDP vs Formule)", f"{european['Prix']:.4f} €", delta=f"Erreur : {european['Prix'] - price:+.4f} €", delta_color="off")
+n3.metric(f"{opt_type} Asiatique Arithmétique (MC)", f"{asian['Prix']:.4f} €", delta=f"± {1.96*asian['Erreur Type']:.4f} € (IC 95%)", delta_color="off")
+if with_barrier:
+    knock_out = knock_out[0]
+    n4.metric(f"{barrier_type} (MC)", f"{knock_out['Prix']:.4f} €", delta=f"Formule fermée corrigée : {barrier_price(S, K, T, r, sigma, barrier_level, opt_type, n_obs):.4f} €",
+              delta_color="off", help=f"Barrière à {barrier_level:.1f}, observée {n_obs} fois ; formule continue avec correction de Broadie-Glasserman.")
+    st.caption(f"Monte Carlo : {asian['Temps (ms)']:,.0f} ms (asiatique) et {knock_out['Temps (ms)']:,.0f} ms (barrière) pour {n_paths:,} chemins x {n_obs} dates.")
+else:
+    n4.warning(f"{barrier_type} : barrière ({barrier_level:.1f}) {'au-dessus' if opt_type == 'Call' else 'en dessous'} du strike "
+               f"({K:.1f}), cas non traité par la formule fermée (barrière du côté hors de la monnaie requise).")
+    st.caption(f"Monte Carlo : {asian['Temps (ms)']:,.0f} ms (asiatique) pour {n_paths:,} chemins x {n_obs} dates.")
+
+@st.cache_data
+def run_benchmark(S, K, T, r, sigma, barrier):
+    return benchmark_methods(S, K, T, r, sigma, barrier)
+
+if st.button("⏱️ Lancer le benchmark précision / temps de calcul"):
+    bench = run_benchmark(S, K, T, r, sigma, min(barrier, K))
+    fig_bench = go.Figure()
+    for method, rows in bench.groupby("Méthode", sort=False):
+        fig_bench.add_trace(go.Scatter(x=rows["Temps (ms)"], y=rows["Erreur"].clip(lower=1e-8), mode='lines+markers', name=method, text=rows["Taille"]))
+    fig_bench.update_layout(title="Précision vs Temps de Calcul (échelles log)", xaxis_title="Temps (ms)", yaxis_title="Erreur absolue vs référence (€)",
+                            xaxis_type="log", yaxis_type="log", height=500)
+    st.plotly_chart(fig_bench, use_container_width=True)
+    st.dataframe(bench.style.format({"Prix": "{:.4f}", "Erreur": "{:.2e}", "Erreur Type": "{:.2e}", "Temps (ms)": "{:,.1f}"}), use_container_width=True)
+    st.caption("Références : formule fermée (européen), EDP 2000 x 2000 (américain), Monte Carlo 1M chemins avec réduction de variance (asiatique), "
+               "formule fermée avec correction de Broadie-Glasserman (barrière).")
+
+st.divider()
+
+# --- 8. HESTON ---
+st.header("7. Volatilité Stochastique : Modèle de Heston")
+st.markdown("""
+Pour reproduire le **smile**, Heston rend la variance stochastique (retour à la moyenne, volatilité de la variance ξ, corrélation ρ avec le spot).
+La fonction caractéristique étant connue, la transformée de **Carr-Madan** valorise **toute la grille de strikes en une seule FFT** (une ligne par maturité).
+""")
+st.latex(r"dS_t = r S_t dt + \sqrt{v_t} S_t dW_t^S, \quad dv_t = \kappa(\theta - v_t)dt + \xi \sqrt{v_t} dW_t^v, \quad d\langle W^S, W^v \rangle_t = \rho\, dt")
+
+col_h1, col_h2 = st.columns([1, 3])
+with col_h1:
+    h_v0 = st.slider("Variance initiale v0", 0.005, 0.20, 0.04, 0.005)
+    h_kappa = st.slider("Retour à la moyenne κ", 0.1, 5.0, 1.5, 0.1)
+    h_theta = st.slider("Variance long terme θ", 0.005, 0.20, 0.04, 0.005)
+    h_xi = st.slider("Vol de la variance ξ", 0.05, 1.5, 0.5, 0.05)
+    h_rho = st.slider("Corrélation ρ", -0.95, 0.5, -0.7, 0.05)
+heston_params = (h_v0, h_kappa, h_theta, h_xi, h_rho)
+
+smile_maturities = np.array([0.25, 0.5, 1.0, 2.0])
+
+@st.cache_data
+def heston_smile_iv(S, r, heston_params):
+    k_grid, t_grid = np.meshgrid(S * np.linspace(0.6, 1.4, 81), smile_maturities)
+    start = time.perf_counter()
+    heston_smile = heston_prices(S, k_grid, t_grid, r, heston_params)
+    heston_time = time.perf_counter() - start
+    return k_grid[0], implied_volatility(heston_smile, S, k_grid, t_grid, r)[0], heston_time
+
+smile_strikes, heston_iv, heston_time = heston_smile_iv(S, r, heston_params)
+
+with col_h2:
+    fig_smile = go.Figure()
+    for i, mat in enumerate(smile_maturities):
+        fig_smile.add_trace(go.Scatter(x=smile_strikes, y=heston_iv[i] * 100, name=f"T = {mat:g} an(s)"))
+    fig_smile.update_layout(title="Smile de Volatilité Implicite Généré par Heston", xaxis_title="Strike", yaxis_title="Vol. Implicite (%)")
+    st.plotly_chart(fig_smile, use_container_width=True)
+    st.caption(f"{heston_iv.size} prix par FFT de Carr-Madan en {heston_time*1000:,.1f} ms, puis inversion en volatilité implicite. "
+               f"Condition de Feller (2κθ > ξ²) : {'respectée' if 2 * h_kappa * h_theta > h_xi ** 2 else 'non respectée'}.")
+
+st.subheader("Calibrage sur la Surface de Volatilité")
+st.markdown("Calibrage des 5 paramètres sur la surface de cotations de la section 5 (volatilités implicites inversées, cotations convergées ; "
+            "grille éclaircie à 25 strikes x 25 maturités au plus). Moindres carrés en volatilité : chaque itération réévalue toute la surface par FFT.")
+
+@st.cache_data
+def run_heston_calibration(S, r, n_side, sigma, skew, noise):
+    quotes, iv, converged, _ = invert_smile(S, r, n_side, sigma, skew, noise)
+    step = -(-n_side // 25)
+    on_grid = np.zeros((n_side, n_side), dtype=bool)
+    on_grid[::step, ::step] = True
+    calib_quotes = quotes.assign(**{"Vol Implicite": iv})[on_grid.ravel() & converged]
+    fit = calibrate_heston(S, r, calib_quotes["K"].to_numpy(), calib_quotes["T"].to_numpy(), calib_quotes["Vol Implicite"].to_numpy(),
+                           calib_quotes["Type"].to_numpy())
+    return calib_quotes, fit
+
+if st.button("🎯 Calibrer Heston sur la surface"):
+    calib_quotes, fit = run_heston_calibration(S, r, n_side, sigma, skew, noise)
+    h1, h2, h3 = st.columns(3)
+    h1.metric("RMSE (vol. implicite)", f"{fit['rmse_vol']*1e4:,.0f} bp", delta=f"{len(calib_quotes):,} cotations", delta_color="off")
+    h2.metric("Évaluations de la surface", f"{fit['n_eval']}", delta=f"{fit['time']*1000:,.0f} ms au total", delta_color="off")
+    h3.metric("Condition de Feller", "Respectée" if fit["feller"] else "Non respectée")
+    st.dataframe(pd.DataFrame([fit["params"]]).style.format("{:.4f}"), use_container_width=True)
+
+    model_prices = heston_prices(S, calib_quotes["K"], calib_quotes["T"], r, tuple(fit["params"].values()), calib_quotes["Type"].to_numpy())
+    model_iv, _ = implied_volatility(model_prices, S, calib_quotes["K"], calib_quotes["T"], r, calib_quotes["Type"].to_numpy())
+    fig_calib = go.Figure()
+    for i, (mat, rows) in enumerate(calib_quotes.assign(Modèle=model_iv).groupby("T")):
+        if i % 4 == 0:
+            fig_calib.add_trace(go.Scatter(x=rows["K"], y=rows["Vol Implicite"] * 100, mode='markers', name=f"Marché T = {mat:.2f}"))
+            fig_calib.add_trace(go.Scatter(x=rows["K"], y=rows["Modèle"] * 100, mode='lines', name=f"Heston T = {mat:.2f}"))
+    fig_calib.update_layout(title="Smile de Marché vs Heston Calibré", xaxis_title="Strike", yaxis_title="Vol. Implicite (%)")
+    st.plotly_chart(fig_calib, use_container_width=True)
+
 st.divider()
 
-# --- 5. LIMITES ---
-st.header("4. Limites du Modèle")
+# --- 9. LIMITES ---
+st.header("8. Limites du Modèle")
 st.markdown("Bien que révolutionnaire, le modèle repose sur des hypothèses simplificatrices souvent démenties par la réalité des marchés.")
 
 col_lim1, col_lim2 = st.columns(2)
@@ -159,6 +384,7 @@ with col_lim1:
     st.write("""
     Le modèle suppose que la volatilité $\sigma$ est constante quelle que soit la maturité ou le strike.
     **Réalité :** On observe un **Smile de Volatilité**. Les options hors de la monnaie (OTM) ont souvent une volatilité implicite plus élevée (crainte des krachs).
+    Les modèles à volatilité stochastique (**Heston**, section 7) reproduisent ce smile.
     """)
     
     st.warning("### 🔔 Distribution Log-Normale")
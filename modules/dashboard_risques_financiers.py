@@ -1,9 +1,13 @@
 import streamlit as st
-import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 
+from utils.asset_portfolio import generate_asset_portfolio, load_asset_portfolio
+from utils.concentration_risk import concentration_scr
+from utils.interest_rate_risk import cash_flow_matrix, interest_rate_scr, nelson_siegel_rates, shocked_curves, single_flow_matrix
+from utils.risk_cube import build_risk_cube, cube_totals, rollup
+
 st.set_page_config(page_title="Tableau de Bord Risques Financiers", layout="wide")
 
 st.title("📊 Tableau de Bord des Risques Financiers")
@@ -17,67 +21,43 @@ la qualité de crédit et la sensibilité aux chocs de marché (Taux, Actions).
 st.divider()
 
 # --- 1. GÉNÉRATION DE DONNÉES (PORTEFEUILLE FICTIF) ---
-@st.cache_data
-def generate_portfolio():
-    np.random.seed(42)
-    n_assets = 100
-    
-    types = ['Obligations Gouv.', 'Obligations Corp.', 'Actions', 'Immobilier', 'Cash']
-    weights = [0.40, 0.30, 0.15, 0.10, 0.05]
-    
-    ratings = ['AAA', 'AA', 'A', 'BBB', 'BB', 'B']
-    rating_weights = [0.2, 0.3, 0.3, 0.15, 0.04, 0.01]
-    
-    # Noms fictifs pour l'exemple
-    names_gov = ["OAT France 2032", "Bund Allemagne 2028", "BTP Italie 2030", "Bonos Espagne 2029"]
-    names_corp = ["TotalEnergies Bond", "LVMH Corp", "BNP Paribas Senior", "AXA Subordinated", "Danone Credit", "Orange SA"]
-    names_equity = ["Air Liquide", "L'Oréal", "Schneider Electric", "Sanofi", "Airbus", "Vinci"]
-    names_real = ["SCPI Bureau Paris", "OPCI Logistique", "Foncière Santé", "Immeuble La Défense"]
-    
-    data = []
-    for _ in range(n_assets):
-        asset_type = np.random.choice(types, p=weights)
-        mv = np.random.lognormal(15, 1) # Market Value
-        
-        rating = "N/A"
-        duration = 0.0
-        name = "Cash Account"
-        country = "France"
-        
-        if "Obligations" in asset_type:
-            rating = np.random.choice(ratings, p=rating_weights)
-            duration = np.random.uniform(2, 15)
-            name = np.random.choice(names_gov if "Gouv" in asset_type else names_corp)
-            
-            # Logique Pays simple pour les Gouv
-            if "Gouv" in asset_type:
-                if "Allemagne" in name: country = "Allemagne"
-                elif "Italie" in name: country = "Italie"
-                elif "Espagne" in name: country = "Espagne"
-            else:
-                country = np.random.choice(["France", "Allemagne", "Pays-Bas", "UK"], p=[0.6, 0.2, 0.1, 0.1])
-                
-        elif asset_type == "Cash":
-            duration = 0.0
-        else:
-            duration = 0.0 # Simplification
-            name = np.random.choice(names_equity if "Actions" in asset_type else names_real)
-            country = np.random.choice(["France", "Allemagne", "Monde"], p=[0.5, 0.3, 0.2])
-            
-        data.append({
-            "Nom de l'Actif": name,
-            "Classe d'Actif": asset_type,
-            "Valeur de Marché (M€)": mv,
-            "Rating": rating,
-            "Duration": duration,
-            "Performance YTD (%)": np.random.normal(0.02, 0.05),
-            "Pays": country
-        })
-        
-    return pd.DataFrame(data)
-
-df = generate_portfolio()
-total_aum = df["Valeur de Marché (M€)"].sum()
+# Courbe des taux sans risque de référence (Nelson-Siegel) et scénarios de choc réglementaires
+BASE_RATES = nelson_siegel_rates()
+RATE_CURVES = shocked_curves(BASE_RATES)
+
+# Le portefeuille ligne à ligne n'est parcouru qu'une fois par chargement : il est pré-agrégé en cube
+# (classe x rating x pays x émetteur), et tous les graphiques / KPIs sont servis par roll-up du cube.
+# Le fichier importé est identifié par son file_id (pas de hachage du contenu à chaque interaction).
+@st.cache_data(max_entries=4)
+def load_risk_cube(n_assets=100, file_id=None, _inventory=None):
+    df = load_asset_portfolio(_inventory) if _inventory is not None else generate_asset_portfolio(n_assets, seed=42)
+    cube = build_risk_cube(df)
+    # Concentration (Art. 182-187) : calculée sur les cellules du cube (déjà agrégées par émetteur)
+    cells = cube.index.to_frame(index=False)
+    concentration = concentration_scr(cube["Valeur de Marché (M€)"].to_numpy(), cells["Nom de l'Actif"], cells["Rating"], cells["Classe d'Actif"])
+    # Taux (Art. 166-167) : matrice des flux obligataires (coupons et remboursements, lignes x dates) construite une fois ;
+    # la valeur actuelle étant linéaire en les flux, seul le profil agrégé par date est conservé pour les revalorisations
+    bonds = df[df["Classe d'Actif"].str.contains("Obligations")]
+    bond_flows = np.asarray(cash_flow_matrix(bonds["Valeur de Marché (M€)"], bonds["Duration"], BASE_RATES).sum(axis=0)).ravel()
+    return cube, df.nlargest(10, "Valeur de Marché (M€)"), concentration, bond_flows
+
+col_src1, col_src2 = st.columns([1, 2])
+with col_src1:
+    n_assets = st.select_slider("Nombre de lignes du portefeuille (test de volumétrie)", options=[100, 10_000, 100_000, 1_000_000], value=100,
+                                help="Générateur vectorisé : mêmes lois marginales quel que soit le volume.")
+with col_src2:
+    inventory_file = st.file_uploader("Inventaire de placements réel (CSV / Parquet, une ligne par titre)", type=["csv", "parquet"],
+                                      help="Colonnes obligatoires (renseignées sur chaque ligne) : Nom de l'Actif, Classe d'Actif, Valeur de Marché (M€), Pays. "
+                                           "Optionnelles : Rating, Duration, Performance YTD (%). Remplace le portefeuille fictif.")
+
+try:
+    cube, top_lines, concentration, bond_flows = load_risk_cube(n_assets, getattr(inventory_file, "file_id", None), inventory_file)
+except ValueError as e:
+    st.error(f"Inventaire invalide : {e}")
+    st.stop()
+totals = cube_totals(cube)
+total_aum = totals["aum"]
+by_class = rollup(cube, "Classe d'Actif")["Valeur de Marché (M€)"]
 
 # --- 2. KPIS GLOBAUX ---
 st.header("1. Indicateurs Clés (KPIs)")
@@ -88,11 +68,11 @@ with col1:
     st.metric("Encours Total (AUM)", f"{total_aum/1e6:,.0f} M€")
 
 with col2:
-    avg_perf = (df["Performance YTD (%)"] * df["Valeur de Marché (M€)"]).sum() / total_aum
+    avg_perf = totals["performance"]
     st.metric("Performance YTD", f"{avg_perf*100:.2f}%", delta=f"{avg_perf*100 - 1.5:.2f} pts vs Budget")
 
 with col3:
-    avg_duration = (df["Duration"] * df["Valeur de Marché (M€)"]).sum() / total_aum
+    avg_duration = totals["duration"]
     st.metric("Duration Actif", f"{avg_duration:.2f} ans")
 
 
@@ -105,13 +85,13 @@ col_alloc1, col_alloc2 = st.columns([1, 1])
 
 with col_alloc1:
     # Pie Chart
-    fig_pie = px.pie(df, values='Valeur de Marché (M€)', names="Classe d'Actif", title="Répartition par Classe d'Actif", hole=0.4)
+    fig_pie = px.pie(by_class.reset_index(), values='Valeur de Marché (M€)', names="Classe d'Actif", title="Répartition par Classe d'Actif", hole=0.4)
     st.plotly_chart(fig_pie, use_container_width=True)
 
 with col_alloc2:
     # Bar Chart Ratings (Obligations uniquement)
-    df_bonds = df[df["Classe d'Actif"].str.contains("Obligations")]
-    df_ratings = df_bonds.groupby("Rating")["Valeur de Marché (M€)"].sum().reset_index()
+    bond_classes = [c for c in by_class.index if "Obligations" in c]
+    df_ratings = rollup(cube, "Rating", where={"Classe d'Actif": bond_classes})["Valeur de Marché (M€)"].reset_index()
     
     # Ordre des ratings
     rating_order = ['AAA', 'AA', 'A', 'BBB', 'BB', 'B']
@@ -129,8 +109,7 @@ col_conc1, col_conc2 = st.columns(2)
 
 with col_conc1:
     # Top 5 Émetteurs
-    df_issuer = df.groupby("Nom de l'Actif")["Valeur de Marché (M€)"].sum().reset_index()
-    df_issuer = df_issuer.sort_values("Valeur de Marché (M€)", ascending=True).tail(5) # Top 5
+    df_issuer = rollup(cube, "Nom de l'Actif")["Valeur de Marché (M€)"].nlargest(5).sort_values().reset_index() # Top 5
     
     fig_conc = px.bar(df_issuer, x="Valeur de Marché (M€)", y="Nom de l'Actif", orientation='h', 
                       title="Top 5 Émetteurs (Concentration)", text_auto='.0f')
@@ -138,14 +117,14 @@ with col_conc1:
 
 with col_conc2:
     # Carte Géographique des Expositions
-    df_geo = df.groupby("Pays")["Valeur de Marché (M€)"].sum().reset_index()
+    df_geo = rollup(cube, "Pays")["Valeur de Marché (M€)"].reset_index()
     
     # Mapping ISO-3 pour Plotly
     iso_map = {
         "France": "FRA", "Allemagne": "DEU", "Italie": "ITA", "Espagne": "ESP", 
         "USA": "USA", "Pays-Bas": "NLD", "UK": "GBR"
     }
-    df_geo['iso_alpha'] = df_geo['Pays'].map(iso_map)
+    df_geo['iso_alpha'] = df_geo['Pays'].astype(str).map(iso_map)
     
     fig_geo = px.choropleth(df_geo.dropna(subset=['iso_alpha']), locations="iso_alpha",
                             color="Valeur de Marché (M€)", hover_name="Pays",
@@ -160,59 +139,63 @@ with col_conc2:
 
 # --- TABLEAU DÉTAILLÉ ---
 with st.expander("🔎 Voir le détail des lignes (Top 10)", expanded=False):
-    st.dataframe(df.sort_values("Valeur de Marché (M€)", ascending=False).head(10).style.format({"Valeur de Marché (M€)": "{:,.0f}", "Performance YTD (%)": "{:.2%}", "Duration": "{:.1f}"}))
+    st.dataframe(top_lines.style.format({"Valeur de Marché (M€)": "{:,.0f}", "Performance YTD (%)": "{:.2%}", "Duration": "{:.1f}"}))
 
 # --- 4. ANALYSE DE SENSIBILITÉ (SOLVABILITÉ II) ---
 st.header("3. Impact des Chocs Solvabilité II (Bicentenaires)")
 st.markdown("Estimation des pertes de valeur (SCR Marché) selon les calibrages de la Formule Standard (VaR 99.5%).")
 
-col_p1, col_p2 = st.columns(2)
+col_p1, col_p2, col_p3 = st.columns(3)
 with col_p1:
     liab_duration = st.slider("Duration Passif (Cible)", 0.0, 20.0, 10.0, 0.5)
 with col_p2:
+    liab_ratio = st.slider("Best Estimate Passif (% de l'Actif)", 50, 100, 90, 1) / 100
+with col_p3:
     sa = st.slider("Ajustement Symétrique (SA)", -10.0, 10.0, 0.0, 0.1, help="Mécanisme contracyclique (-10% à +10%)") / 100
 
 st.info("""
 **Rappel des Chocs Réglementaires (Formule Standard) :**
 *   **Actions (Type 1) :** Choc de base de **39%** + Ajustement Symétrique (SA).
 *   **Immobilier :** Choc de **25%**.
-*   **Spread :** Choc dépendant du rating et de la duration (ex: ~0.9% à 7.5% par année de duration).
-*   **Taux :** Choc à la hausse ou à la baisse de la courbe des taux (ici approximé par un choc parallèle).
+*   **Spread (Art. 176) :** Choc $a_i + b_i \\times (dur_i - début\\ de\\ tranche)$ par tranche de duration et échelon de qualité de crédit, plafonné à 100% (ex: 0.9% à 7.5% par année de duration jusqu'à 5 ans). Les obligations souveraines sont exemptées (Art. 180).
+*   **Taux (Art. 166-167) :** Chocs relatifs à la hausse (+70% à +20% selon la maturité, au moins +1 point) et à la baisse (-75% à -20%) de la courbe des taux, appliqués aux flux de l'actif obligataire et du passif.
+*   **Concentration (Art. 182-187) :** Excès d'exposition par émetteur au-delà d'un seuil (3% des actifs pour CQS 0-2, 1.5% au-delà), pondéré par un facteur $g_i$ (12% à 73%).
 """)
 
 # --- MOTEUR DE CALCUL SCR ---
+# Les expositions et le SCR spread ne dépendent que du portefeuille (lus dans le cube) ;
+# seuls les termes liés aux curseurs (SA, duration passif) sont recalculés à chaque interaction.
 # 1. Actions (Choc Type 1 + SA)
-equity_exposure = df[df["Classe d'Actif"] == "Actions"]["Valeur de Marché (M€)"].sum()
+equity_exposure = by_class.get("Actions", 0.0)
 shock_equity_s2 = 0.39 + sa
 scr_equity = equity_exposure * shock_equity_s2
 
 # 2. Immobilier (Choc 25%)
-prop_exposure = df[df["Classe d'Actif"] == "Immobilier"]["Valeur de Marché (M€)"].sum()
+prop_exposure = by_class.get("Immobilier", 0.0)
 scr_property = prop_exposure * 0.25
 
-# 3. Spread (Tableau standard)
-def calc_spread_scr(row):
-    if "Obligations" not in row["Classe d'Actif"]: return 0
-    factors = {'AAA': 0.009, 'AA': 0.011, 'A': 0.014, 'BBB': 0.025, 'BB': 0.045, 'B': 0.075}
-    f = factors.get(row['Rating'], 0.045)
-    return row["Valeur de Marché (M€)"] * row["Duration"] * f
+# 3. Spread (Art. 176 : choc par tranche de duration et échelon de qualité de crédit, agrégé dans le cube)
+scr_spread = totals["scr_spread"]
 
-df['SCR_Spread'] = df.apply(calc_spread_scr, axis=1)
-scr_spread = df['SCR_Spread'].sum()
+# 4. Concentration (Art. 182-187 : excès par émetteur au-delà du seuil CT, pondéré par g_i)
+scr_concentration = concentration["scr"]
 
-# 4. Taux (Proxy Duration Gap)
+# 5. Taux (Art. 166-167 : revalorisation des flux sous les courbes Base / Up / Down, un seul produit matriciel)
 gap = avg_duration - liab_duration
-scr_rate = abs(gap * total_aum * 0.01) # Proxy 1%
-
-# 5. Agrégation (Matrice Corrélation Simplifiée)
-scr_vec = np.array([scr_equity, scr_property, scr_spread, scr_rate])
-corr_mat = np.array([[1.0, 0.75, 0.75, 0.5], [0.75, 1.0, 0.5, 0.5], [0.75, 0.5, 1.0, 0.5], [0.5, 0.5, 0.5, 1.0]])
+liability_flows = single_flow_matrix([liab_ratio * total_aum], [liab_duration], BASE_RATES)
+rate_risk = interest_rate_scr(bond_flows, liability_flows, RATE_CURVES)
+scr_rate = rate_risk["scr"]
+
+# 6. Agrégation (Matrice Corrélation Simplifiée ; concentration non corrélée aux autres sous-modules)
+scr_vec = np.array([scr_equity, scr_property, scr_spread, scr_rate, scr_concentration])
+corr_mat = np.array([[1.0, 0.75, 0.75, 0.5, 0.0], [0.75, 1.0, 0.5, 0.5, 0.0], [0.75, 0.5, 1.0, 0.5, 0.0],
+                     [0.5, 0.5, 0.5, 1.0, 0.0], [0.0, 0.0, 0.0, 0.0, 1.0]])
 scr_market = np.sqrt(np.dot(scr_vec, np.dot(corr_mat, scr_vec)))
 
 # Update KPI du haut
 with col4:
     st.metric("SCR Marché (99.5%)", f"{scr_market/1e6:,.0f} M€", delta="Capital Réglementaire", delta_color="inverse",
-              help="Estimation du SCR Marché selon la Formule Standard (agrégation des chocs Actions, Immo, Spread, Taux).")
+              help="Estimation du SCR Marché selon la Formule Standard (agrégation des chocs Actions, Immo, Spread, Taux, Concentration).")
 
 col_stress1, col_stress2 = st.columns(2)
 
@@ -225,13 +208,25 @@ with col_stress1:
     st.subheader("Choc Immobilier")
     st.metric("SCR Immobilier", f"{scr_property/1e6:,.1f} M€", delta="-25%", delta_color="inverse")
 
+    st.subheader("Concentration (Art. 182-187)")
+    n_excess = int((concentration["by_issuer"]["Excès XS"] > 0).sum())
+    st.metric("SCR Concentration", f"{scr_concentration/1e6:,.1f} M€", delta=f"{n_excess} émetteur(s) au-delà du seuil", delta_color="inverse",
+              help="Excès d'exposition par émetteur au-delà du seuil CT (3% ou 1.5% selon la qualité de crédit, 10% pour l'immobilier), pondéré par g_i.")
+
 with col_stress2:
     st.subheader("Choc Spread (Crédit)")
     st.metric("SCR Spread (Est.)", f"{scr_spread/1e6:,.1f} M€", delta="Risque de Crédit", delta_color="inverse")
 
-    st.subheader("Choc Taux (Simplifié)")
+    st.subheader("Choc Taux (Art. 166-167)")
     
     st.metric("Duration Gap", f"{gap:.2f} ans")
-    st.metric("SCR Taux (Proxy +/- 1%)", f"{scr_rate/1e6:,.1f} M€", delta_color="inverse", help="Estimation simplifiée basée sur le Duration Gap.")
+    st.metric("SCR Taux", f"{scr_rate/1e6:,.1f} M€", delta=f"Scénario {rate_risk['scenario']}", delta_color="inverse",
+              help="Perte de NAV dans le scénario le plus défavorable. Actif : coupons et remboursements de chaque ligne obligataire "
+                   "(titre au pair dont la maturité reproduit la duration). Passif : flux unique à sa duration.")
+    st.dataframe((rate_risk["pv"] / 1e6).style.format("{:,.1f}"))
+
+with st.expander("🔎 Détail du SCR Concentration par émetteur", expanded=False):
+    st.dataframe(concentration["by_issuer"].head(20).style.format({"Exposition": "{:,.0f}", "Part des Actifs (%)": "{:.2f}", "Seuil CT (%)": "{:.1f}",
+                                                                   "Excès XS": "{:,.0f}", "Facteur g": "{:.2f}", "SCR Concentration": "{:,.0f}"}))
 
 st.divider()
@@ -3,6 +3,8 @@ import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 
+from utils.tail_estimators import StreamingTailEstimator
+
 st.set_page_config(page_title="Générateur de Scénarios Économiques", layout="wide")
 
 st.title("🎲 Générateur de Scénarios Économiques (GSE)")
@@ -83,6 +85,10 @@ st.header("3. Distribution à Maturité")
 final_values = S[:, -1]
 ret_annuel = (final_values / S0)**(1/T) - 1
 
+# Mesures de risque sur la perte terminale (même estimateur VaR/ES que les moteurs Monte Carlo ; ici les
+# trajectoires sont de toute façon conservées pour les graphiques, les pertes sont donc passées en un seul bloc)
+tail_estimator = StreamingTailEstimator(n_sim, levels=(0.995,)).update(S0 - final_values)
+
 col_res1, col_res2 = st.columns(2)
 
 with col_res1:
@@ -94,7 +100,8 @@ with col_res2:
     st.subheader("Statistiques")
     st.metric("Moyenne Finale", f"{np.mean(final_values):.2f}")
     st.metric("Volatilité observée (an)", f"{np.std(ret_annuel)*100:.2f}%")
-    st.metric("VaR 99.5% (Perte)", f"{S0 - np.percentile(final_values, 0.5):.2f}", delta="Capital requis", delta_color="inverse")
+    st.metric("VaR 99.5% (Perte)", f"{tail_estimator.var(0.995):.2f}", delta="Capital requis", delta_color="inverse")
+    st.metric("Expected Shortfall 99.5%", f"{tail_estimator.es(0.995):.2f}", help="Perte moyenne au-delà de la VaR 99.5%.")
 
 st.info("""
 **Note Technique :** 
@@ -1,8 +1,17 @@
+import time
 import streamlit as st
 import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
-from scipy.stats import norm
+from scipy.stats import binom, norm
+
+from utils.backtesting import PLUS_FACTOR_ALPHA, ZONES, backtest_var
+from utils.cdo_tranches import MAX_CORRELATION, tranche_expected_losses
+from utils.credit_portfolio import generate_credit_portfolio, importance_shift_for, simulate_credit_losses, tail_statistics
+from utils.frtb import DESK_FACTORS, frtb_expected_shortfall, simulate_desk_scenarios
+from utils.historical_var import (find_stressed_period, load_pnl_history, rolling_filtered_historical_var,
+                                  rolling_historical_var, simulate_pnl_history)
+from utils.risk_allocation import euler_allocation
 
 st.set_page_config(page_title="Modèles Risque de Marché", layout="wide")
 
@@ -68,6 +77,120 @@ fig.add_vline(x=-svar, line_dash="dash", line_color="red", annotation_text="SVaR
 fig.update_layout(title="Distributions des P&L (VaR vs SVaR)", xaxis_title="P&L (€)", yaxis_title="Densité")
 st.plotly_chart(fig, use_container_width=True)
 
+# VaR Historique (HS) & Filtered Historical Simulation (FHS)
+st.subheader("VaR Historique Glissante (HS & FHS)")
+st.markdown("""
+La **simulation historique** (HS) lit la VaR directement dans les P&L des 250 derniers jours, sans hypothèse de loi.
+La **Filtered Historical Simulation** (FHS) dévolatilise d'abord le P&L par un modèle **GARCH(1,1)**, puis remet
+les résidus à l'échelle de la volatilité prévue : la VaR réagit plus vite aux changements de régime.
+Le GARCH est réestimé chaque année sur l'historique **passé uniquement** (fenêtre croissante) : aucune information
+future n'entre dans la VaR d'une date, ce qui rend le backtesting ci-dessous honnête.
+""")
+
+col_hs1, col_hs2 = st.columns([1, 2])
+
+with col_hs1:
+    hs_file = st.file_uploader("Historique de P&L (CSV / Parquet, 1ère colonne = date)", type=["csv", "parquet"])
+    hs_alpha = st.selectbox("Niveau de Confiance (HS)", [0.975, 0.99], index=1)
+
+@st.cache_data
+def run_historical_var(pnl, alpha):
+    start = time.perf_counter()
+    hs, fhs = rolling_historical_var(pnl, 250, alpha), rolling_filtered_historical_var(pnl, 250, alpha)
+    return hs, fhs, time.perf_counter() - start
+
+pnl_hist = load_pnl_history(hs_file).iloc[:, 0] if hs_file is not None else simulate_pnl_history(30 * 252, start="1995-01-02")
+hs_var, fhs_var, hs_elapsed = run_historical_var(pnl_hist, hs_alpha)
+
+with col_hs1:
+    st.metric(f"VaR HS ({hs_alpha:.1%}, 1j)", f"{hs_var['VaR'].iloc[-1, 0]:,.0f} €")
+    st.metric(f"VaR FHS ({hs_alpha:.1%}, 1j)", f"{fhs_var['VaR'].iloc[-1, 0]:,.0f} €")
+    st.caption(f"{len(pnl_hist):,} dates ({len(pnl_hist)/252:.0f} ans) recalculées en {hs_elapsed*1000:,.0f} ms.")
+
+with col_hs2:
+    fig_hs = go.Figure()
+    fig_hs.add_trace(go.Scatter(x=pnl_hist.index, y=pnl_hist, mode='markers', name='P&L journalier', marker=dict(size=2, color='gray')))
+    fig_hs.add_trace(go.Scatter(x=hs_var.index, y=-hs_var['VaR'].iloc[:, 0], name='-VaR HS', line=dict(color='blue')))
+    fig_hs.add_trace(go.Scatter(x=fhs_var.index, y=-fhs_var['VaR'].iloc[:, 0], name='-VaR FHS', line=dict(color='red')))
+    fig_hs.update_layout(title="P&L vs VaR Glissante (fenêtre 250 jours)", xaxis_title="Date", yaxis_title="P&L (€)")
+    st.plotly_chart(fig_hs, use_container_width=True)
+
+# Recherche automatique de la période de stress (calibration SVaR)
+st.subheader("Calibration SVaR : Recherche Automatique de la Période de Stress")
+st.markdown("""
+Plutôt que de fixer la volatilité stressée à dire d'expert, on balaie **toutes les fenêtres de 12 mois** de l'historique
+et on retient celle qui **maximise la VaR du portefeuille courant**. Le balayage est un seul calcul vectorisé
+(statistiques d'ordre glissantes), et non des milliers de calculs de VaR indépendants.
+""")
+
+@st.cache_data
+def run_stressed_search(pnl, alpha):
+    return find_stressed_period(pnl, 250, alpha)
+
+stress = run_stressed_search(pnl_hist, hs_alpha)
+
+col_sv1, col_sv2 = st.columns([1, 2])
+
+with col_sv1:
+    st.metric("Période de Stress Retenue", f"{stress['start']:%m/%Y} → {stress['end']:%m/%Y}")
+    st.metric(f"SVaR HS ({hs_alpha:.1%}, 10j)", f"{stress['svar'] * np.sqrt(10):,.0f} €",
+              delta=f"Ratio SVaR/VaR : {stress['svar'] / hs_var['VaR'].iloc[-1, 0]:.1f}x", delta_color="inverse")
+    st.metric("Volatilité Stressée Calibrée (an)", f"{stress['stressed_vol'] * np.sqrt(252) / exposure * 100:.1f}%",
+              help="Écart-type journalier de la fenêtre retenue, annualisé et rapporté à l'exposition de 1 M€.")
+
+with col_sv2:
+    fig_sv = go.Figure()
+    fig_sv.add_trace(go.Scatter(x=stress["scan"].index, y=stress["scan"]["VaR Historique"], name="VaR HS de la fenêtre", line=dict(color='red')))
+    fig_sv.add_trace(go.Scatter(x=stress["scan"].index, y=stress["scan"]["VaR Paramétrique"], name="VaR Paramétrique de la fenêtre", line=dict(color='gray', dash='dot')))
+    fig_sv.add_vrect(x0=stress["start"], x1=stress["end"], fillcolor="red", opacity=0.15, line_width=0, annotation_text="Période de stress")
+    fig_sv.update_layout(title="VaR 1 jour par fenêtre de 12 mois (date de fin de fenêtre)", xaxis_title="Date", yaxis_title="VaR (€)")
+    st.plotly_chart(fig_sv, use_container_width=True)
+
+# Backtesting de la VaR
+st.subheader("Backtesting de la VaR (Kupiec, Christoffersen, Feux Tricolores)")
+st.markdown("""
+La VaR de la veille est confrontée au P&L du jour : une **exception** est comptée si la perte dépasse la VaR.
+Sur chaque fenêtre glissante de 250 jours, on teste la **fréquence** des exceptions (Kupiec POF), leur
+**indépendance** (Christoffersen) et on classe le modèle dans la **zone de Bâle** (verte, jaune, rouge)
+qui fixe le facteur additionnel du capital. Les seuils de zone sont lus sur la loi binomiale au niveau de confiance choisi ;
+le barème des plus factors n'est défini qu'à 99% sur 250 jours et n'est affiché qu'à ce niveau.
+Toutes les fenêtres et tous les modèles sont traités en un seul calcul vectorisé.
+""")
+
+@st.cache_data
+def run_backtest(pnl, hs, fhs, alpha):
+    var = pd.concat([hs['VaR'].iloc[:, 0].rename('HS'), fhs['VaR'].iloc[:, 0].rename('FHS')], axis=1)
+    pnl = pd.concat([pnl.rename('HS'), pnl.rename('FHS')], axis=1)
+    return backtest_var(var, pnl, alpha, 250)
+
+bt = run_backtest(pnl_hist, hs_var, fhs_var, hs_alpha)
+bt_last = bt.iloc[-1]
+# Seuils de zone : plus petit nombre d'exceptions dont la probabilité binomiale cumulée atteint 95% / 99.99%
+yellow_from, red_from = binom.ppf([0.95, 0.9999], 250, 1 - hs_alpha)
+
+col_bt1, col_bt2 = st.columns([1, 2])
+
+with col_bt1:
+    for model in ['HS', 'FHS']:
+        st.metric(f"Exceptions {model} (250 derniers jours)", f"{bt_last[('Exceptions', model)]:.0f}",
+                  delta=f"Zone {bt_last[('Zone', model)]}" + (f" (plus factor {bt_last[('Plus Factor', model)]:.2f})"
+                                                               if hs_alpha == PLUS_FACTOR_ALPHA else ""),
+                  delta_color="normal" if bt_last[('Zone', model)] == 'Verte' else "inverse")
+    st.dataframe(pd.DataFrame({model: [bt_last[(k, model)] for k in ["Kupiec p-value", "Christoffersen p-value", "Conditionnel p-value"]]
+                               for model in ['HS', 'FHS']},
+                              index=["Kupiec (POF)", "Christoffersen (Ind.)", "Conditionnel"]).style.format("{:.3f}"))
+    zone_share = bt['Zone'].apply(lambda z: z.value_counts(normalize=True)).reindex(ZONES) * 100
+    st.caption(f"Part des fenêtres en zone rouge : HS {zone_share.loc['Rouge', 'HS']:.1f}% · FHS {zone_share.loc['Rouge', 'FHS']:.1f}%.")
+
+with col_bt2:
+    fig_bt = go.Figure()
+    fig_bt.add_trace(go.Scatter(x=bt.index, y=bt[('Exceptions', 'HS')], name='Exceptions HS', line=dict(color='blue')))
+    fig_bt.add_trace(go.Scatter(x=bt.index, y=bt[('Exceptions', 'FHS')], name='Exceptions FHS', line=dict(color='red')))
+    fig_bt.add_hrect(y0=yellow_from - 0.5, y1=red_from - 0.5, fillcolor="gold", opacity=0.15, line_width=0, annotation_text="Zone jaune")
+    fig_bt.add_hline(y=red_from - 0.5, line_dash="dash", line_color="red", annotation_text="Zone rouge")
+    fig_bt.update_layout(title="Nombre d'exceptions sur 250 jours glissants", xaxis_title="Date", yaxis_title="Exceptions")
+    st.plotly_chart(fig_bt, use_container_width=True)
+
 st.divider()
 
 # --- 2. IRC (Incremental Risk Charge) ---
@@ -90,6 +213,8 @@ with col_irc1:
     correlation = st.slider("Corrélation des Actifs (rho)", 0.0, 100.0, 20.0, 5.0) / 100
     lgd = st.slider("Perte en cas de Défaut (LGD)", 0.0, 100.0, 60.0, 5.0) / 100
     n_sim_irc = 5000
+    use_is = st.checkbox("Importance Sampling (décalage de Z vers la zone de défaut)", value=True,
+                         help="Tire Z sous N(μ, 1) avec μ = N⁻¹(0.1%) puis repondère chaque scénario par le rapport de vraisemblance.")
 
 with col_irc2:
     st.markdown("**Résultats**")
@@ -98,7 +223,10 @@ with col_irc2:
     # Z ~ N(0,1)
     
     np.random.seed(42)
-    Z = np.random.normal(0, 1, n_sim_irc)
+    # Importance Sampling : Z ~ N(mu, 1), poids = phi(Z) / phi(Z - mu) = exp(-mu*Z + mu^2/2)
+    is_shift = importance_shift_for(0.999) if use_is else 0.0
+    Z = np.random.normal(is_shift, 1, n_sim_irc)
+    is_weights = np.exp(-is_shift * Z + 0.5 * is_shift ** 2)
     
     # 1. Calcul du seuil de défaut (Inverse loi Normale : norm.ppf)
     # On transforme la PD moyenne en un seuil sur une loi N(0,1).
@@ -112,21 +240,73 @@ with col_irc2:
     # Pertes du portefeuille (en % de l'exposition) = Cond_PD * LGD
     portfolio_losses = cond_pd * lgd
     
-    irc_999 = np.percentile(portfolio_losses, 99.9)
-    expected_loss = np.mean(portfolio_losses)
+    irc_999, irc_stderr, _ = tail_statistics(portfolio_losses, is_weights, 0.999)
+    # EL analytique : E[PD conditionnelle] = PD, l'Importance Sampling ne sert qu'à la queue
+    expected_loss = pd_avg * lgd
     
     st.metric("IRC (VaR 99.9% 1 an)", f"{irc_999*100:.2f}%", delta="Capital Requis")
     st.metric("Perte Attendue (EL)", f"{expected_loss*100:.2f}%")
+    st.metric("Erreur Standard du Quantile", f"± {irc_stderr*100:.3f}%", help=f"Erreur asymptotique du quantile pondéré sur {n_sim_irc:,} scénarios : √Var(w·1{{L > VaR}}) / (√N · f(VaR)), densité f estimée autour du quantile.")
 
-# Graphique Distribution IRC
+# Graphique Distribution IRC (histogramme pondéré par les rapports de vraisemblance)
+hist_irc, edges_irc = np.histogram(portfolio_losses*100, bins=50, weights=is_weights)
 fig_irc = go.Figure()
-fig_irc.add_trace(go.Histogram(x=portfolio_losses*100, nbinsx=50, name='Distribution des Pertes', histnorm='probability'))
+fig_irc.add_trace(go.Bar(x=(edges_irc[:-1] + edges_irc[1:]) / 2, y=hist_irc / is_weights.sum(), name='Distribution des Pertes'))
 fig_irc.add_vline(x=irc_999*100, line_dash="dash", line_color="red", annotation_text="IRC (99.9%)")
 fig_irc.update_layout(title="Distribution des Pertes de Crédit (Modèle Vasicek)", xaxis_title="Perte (%)", yaxis_title="Probabilité")
 st.plotly_chart(fig_irc, use_container_width=True)
 
 st.info("Ce modèle montre comment la corrélation épaissit la queue de distribution (Fat Tail), augmentant drastiquement le capital requis pour les événements rares (99.9%).")
 
+# Simulation IRC Multi-Émetteurs (Défaut + Migration)
+st.subheader("Simulateur IRC Multi-Émetteurs (Monte Carlo Défaut & Migration)")
+st.markdown("""
+Le modèle de Vasicek suppose un portefeuille infiniment granulaire et homogène. Le moteur ci-dessous simule
+conjointement les **défauts** et les **migrations de notation** de chaque émetteur (EAD, PD, LGD, Secteur, Rating),
+avec un facteur systémique global et des facteurs sectoriels. Les scénarios sont traités par blocs pour borner la mémoire.
+""")
+
+col_mc1, col_mc2 = st.columns(2)
+
+with col_mc1:
+    n_obligors = st.slider("Nombre d'émetteurs", 50, 2000, 500, 50)
+    n_sim_mc = st.select_slider("Nombre de scénarios", options=[10_000, 20_000, 50_000, 100_000], value=20_000)
+    sector_corr = st.slider("Corrélation inter-sectorielle", 0.0, 100.0, 50.0, 5.0) / 100
+    use_is_mc = st.checkbox("Importance Sampling", value=True, key="is_mc",
+                            help="Même précision sur le quantile 99.9% avec 10 à 100 fois moins de scénarios.")
+
+@st.cache_data
+def run_irc_engine(n_obligors, n_sim, rho, sector_corr, importance_shift):
+    positions = generate_credit_portfolio(n_obligors)
+    return positions, simulate_credit_losses(positions, n_sim=n_sim, rho=rho, sector_corr=sector_corr,
+                                             importance_shift=importance_shift)
+
+positions_irc, res_irc = run_irc_engine(n_obligors, n_sim_mc, correlation, sector_corr,
+                                        importance_shift_for(0.999) if use_is_mc else 0.0)
+total_ead = positions_irc["EAD"].sum()
+
+with col_mc2:
+    st.metric("IRC (VaR 99.9% 1 an)", f"{res_irc['irc']/1e6:,.1f} M€", delta=f"± {res_irc['irc_stderr']/1e6:,.1f} M€ (erreur standard)", delta_color="off")
+    st.metric("Perte Attendue (EL)", f"{res_irc['expected_loss']/1e6:,.1f} M€")
+    st.metric("Expected Shortfall (99.9%)", f"{res_irc['expected_shortfall']/1e6:,.1f} M€")
+
+hist_mc, edges_mc = np.histogram(res_irc["losses"]/1e6, bins=80, weights=res_irc["weights"])
+fig_mc = go.Figure(go.Bar(x=(edges_mc[:-1] + edges_mc[1:]) / 2, y=hist_mc / res_irc["weights"].sum(), name='Pertes simulées'))
+fig_mc.add_vline(x=res_irc["irc"]/1e6, line_dash="dash", line_color="red", annotation_text="IRC (99.9%)")
+fig_mc.update_layout(title=f"Distribution des Pertes ({n_obligors} émetteurs, {n_sim_mc:,} scénarios)", xaxis_title="Perte (M€)", yaxis_title="Probabilité")
+st.plotly_chart(fig_mc, use_container_width=True)
+
+with st.expander("🔎 Allocation d'Euler par émetteur (Top 10 contributeurs à l'IRC)", expanded=False):
+    st.markdown("""
+    Les contributions sont lues sur la **même simulation** (pas de relance par émetteur) :
+    *   **Contribution IRC** = E[Perte émetteur | Perte portefeuille ≈ IRC], elles s'additionnent à l'IRC ;
+    *   **Contribution ES** = E[Perte émetteur | Perte portefeuille ≥ IRC] ;
+    *   **Contribution EL** = Σ probabilité d'état x perte de l'état (calcul analytique, hors simulation).
+    """)
+    df_contrib = positions_irc.join(res_irc["contributions"]).sort_values("Contribution IRC", ascending=False).head(10)
+    st.dataframe(df_contrib.style.format({"EAD": "{:,.0f}", "PD": "{:.2%}", "LGD": "{:.0%}", "Duration": "{:.1f}",
+                                          "Contribution EL": "{:,.0f}", "Contribution IRC": "{:,.0f}", "Contribution ES": "{:,.0f}"}))
+
 st.divider()
 
 # --- 3. CRM (Comprehensive Risk Measure) ---
@@ -157,102 +337,140 @@ with col_crm2:
 # Visualisation conceptuelle : Impact de la corrélation sur les tranches
 st.subheader("Illustration : Sensibilité à la Corrélation (Tranches CDO)")
 
-corr_range = np.linspace(0, 1, 100)
-# Modèle jouet pour l'illustration
-el_equity = 1 - 0.8 * corr_range # Equity souffre moins si corrélation haute (tout ou rien)
-el_senior = 0.2 * corr_range**2  # Senior souffre plus si corrélation haute
+st.markdown("""
+Pertes attendues des tranches d'un indice CDS de 125 noms dans un **copule gaussien à un facteur**.
+La distribution conditionnelle des pertes est construite par **récursion (Andersen-Sidenius-Basu)** ou par l'approximation
+**Large Homogeneous Pool**, puis intégrée sur le facteur commun par **quadrature de Gauss-Hermite**.
+Toute la grille de corrélations est valorisée en un seul calcul.
+""")
+
+col_cdo1, col_cdo2 = st.columns(2)
+with col_cdo1:
+    cdo_pd = st.slider("PD 1 an des noms de l'indice (%)", 0.2, 10.0, 2.0, 0.1) / 100
+    cdo_lgd = st.slider("LGD des noms de l'indice (%)", 10.0, 100.0, 60.0, 5.0) / 100
+with col_cdo2:
+    cdo_method = st.radio("Méthode", ["Récursion (ASB)", "Large Homogeneous Pool"], horizontal=True)
+    n_names = 125
+
+@st.cache_data
+def run_tranche_engine(pd_names, lgd_names, method):
+    start = time.perf_counter()
+    corr_grid = np.linspace(0, MAX_CORRELATION, 100)
+    el = tranche_expected_losses(corr_grid, np.full(n_names, pd_names), lgd_names, method=method)
+    return el, time.perf_counter() - start
+
+el_tranches, cdo_elapsed = run_tranche_engine(cdo_pd, cdo_lgd, "recursion" if cdo_method.startswith("Récursion") else "lhp")
 
 fig_crm = go.Figure()
-fig_crm.add_trace(go.Scatter(x=corr_range, y=el_equity, name="Perte Attendue Tranche Equity (0-3%)", line=dict(color='red')))
-fig_crm.add_trace(go.Scatter(x=corr_range, y=el_senior, name="Perte Attendue Tranche Senior (10-100%)", line=dict(color='green')))
-fig_crm.update_layout(title="Impact de la Corrélation sur le Risque des Tranches (Conceptuel)", xaxis_title="Corrélation", yaxis_title="Niveau de Risque (Perte)")
+for tranche_label in el_tranches.columns:
+    fig_crm.add_trace(go.Scatter(x=el_tranches.index, y=el_tranches[tranche_label]*100, name=f"Tranche {tranche_label}"))
+fig_crm.update_layout(title="Impact de la Corrélation sur la Perte Attendue des Tranches", xaxis_title="Corrélation", yaxis_title="Perte Attendue (% du nominal de la tranche)")
 st.plotly_chart(fig_crm, use_container_width=True)
+st.caption(f"{n_names} noms x {len(el_tranches)} corrélations x {len(el_tranches.columns)} tranches valorisés en {cdo_elapsed*1000:,.0f} ms. "
+           "L'Equity (0-3%) bénéficie d'une corrélation élevée (tout ou rien), les tranches Senior en souffrent.")
 
 st.divider()
 
-# # --- 4. FUTUR : FRTB ---
-# st.header("4. L'avenir : FRTB (Fundamental Review of the Trading Book)")
-# st.markdown("""
-# La réforme FRTB remplace ces mesures par une approche plus cohérente.
-# """)
-# with st.expander("🔬 De la VaR à l'Expected Shortfall (ES)", expanded=True):
-#     st.markdown("""
-#     FRTB remplace la VaR par l'**Expected Shortfall (ES)** pour les modèles internes.
-#     *   **VaR :** "Quelle est la perte maximale qui ne sera pas dépassée avec X% de confiance ?" (un point sur la distribution).
-#     *   **ES :** "SI la perte dépasse le seuil de la VaR, quelle est sa valeur moyenne ?" (la moyenne de la queue de distribution).
-    
-#     L'ES est donc plus sensible aux événements extrêmes (Fat Tails).
-#     """)
-    
-#     es_vol = st.slider("Volatilité du P&L (%)", 1.0, 30.0, 10.0, 1.0, key="es_vol") / 100
-#     es_conf = 0.975 # Standard FRTB
-    
-#     # Calculs
-#     pnl_stdev = 1_000_000 * es_vol
-#     alpha = 1 - es_conf
-    
-#     var_975 = -norm.ppf(alpha) * pnl_stdev
-#     es_975 = pnl_stdev * norm.pdf(norm.ppf(alpha)) / alpha
-    
-#     # Graphique
-#     x_es = np.linspace(-5 * pnl_stdev, 5 * pnl_stdev, 1000)
-#     pdf_es = norm.pdf(x_es, 0, pnl_stdev)
-    
-#     fig_es = go.Figure()
-#     fig_es.add_trace(go.Scatter(x=x_es, y=pdf_es, name="Distribution P&L", line=dict(color='blue')))
-    
-#     # Zone de la queue
-#     tail_x = np.linspace(-5 * pnl_stdev, -var_975, 100)
-#     tail_y = norm.pdf(tail_x, 0, pnl_stdev)
-#     fig_es.add_trace(go.Scatter(x=np.concatenate([tail_x, tail_x[::-1]]), y=np.concatenate([tail_y, np.zeros(len(tail_y))]), 
-#                                 fill='toself', fillcolor='rgba(255,0,0,0.3)', line=dict(width=0), name=f'Queue ({alpha*100:.1f}%)'))
-
-#     fig_es.add_vline(x=-var_975, line_dash="dash", line_color="red", annotation_text=f"VaR {es_conf*100:.1f}%")
-#     fig_es.add_vline(x=-es_975, line_dash="dash", line_color="purple", annotation_text=f"ES {es_conf*100:.1f}%")
-    
-#     fig_es.update_layout(title="Comparaison VaR vs. Expected Shortfall", xaxis_title="P&L (€)", yaxis_title="Densité")
-#     st.plotly_chart(fig_es, use_container_width=True)
+# --- 4. FUTUR : FRTB ---
+st.header("4. L'avenir : FRTB (Fundamental Review of the Trading Book)")
+st.markdown("""
+La réforme FRTB remplace ces mesures par une approche plus cohérente.
+""")
+with st.expander("🔬 De la VaR à l'Expected Shortfall (ES)", expanded=True):
+    st.markdown("""
+    FRTB remplace la VaR par l'**Expected Shortfall (ES)** pour les modèles internes.
+    *   **VaR :** "Quelle est la perte maximale qui ne sera pas dépassée avec X% de confiance ?" (un point sur la distribution).
+    *   **ES :** "SI la perte dépasse le seuil de la VaR, quelle est sa valeur moyenne ?" (la moyenne de la queue de distribution).
     
-#     st.metric("Expected Shortfall (ES)", f"{es_975:,.0f} €", delta=f"{(es_975/var_975 - 1)*100:.1f}% plus élevé que la VaR", delta_color="inverse")
+    L'ES est donc plus sensible aux événements extrêmes (Fat Tails).
+    """)
 
-# with st.expander("🧱 Du IRC/CRM au Default Risk Charge (DRC)", expanded=True):
-#     st.markdown("""
-#     Le **DRC** remplace l'IRC et le CRM. Il couvre le risque de saut au défaut (Jump-to-Default) pour toutes les positions exposées au risque d'émetteur, **y compris les actions** (en cas de faillite, l'action vaut 0).
+    st.markdown(r"""
+    **Horizons de liquidité :** chaque facteur de risque reçoit un horizon (10, 20, 40, 60 ou 120 jours).
+    L'ES 10 jours est recalculé en ne choquant que les facteurs d'horizon $\ge LH_j$, puis agrégé en cascade :
+
+    $$ ES = \sqrt{ES_T(P)^2 + \sum_{j \ge 2} \left( ES_T(P, j) \sqrt{\frac{LH_j - LH_{j-1}}{T}} \right)^2 } $$
+
+    **Calibration stressée :** $ES = ES_{R,S} \times \max\left(\frac{ES_{F,C}}{ES_{R,C}}, 1\right)$ (ensemble réduit de facteurs
+    sur la période de stress, rapporté à l'ensemble complet sur la période courante).
+    """)
+
+    col_es1, col_es2 = st.columns(2)
+    with col_es1:
+        es_corr = st.slider("Corrélation entre facteurs", 0.0, 90.0, 30.0, 5.0, key="es_corr") / 100
+        es_n_scen = st.select_slider("Scénarios de P&L 10 jours", options=[250, 1000, 5000, 20000], value=1000, key="es_n_scen")
+    with col_es2:
+        es_stress_mult = st.slider("Multiplicateur de volatilité (période de stress)", 1.0, 4.0, 2.5, 0.1, key="es_stress")
+        es_conf = 0.975 # Standard FRTB
+
+    # Scénarios de P&L par facteur de risque : période courante et période de stress
+    pnl_current = simulate_desk_scenarios(DESK_FACTORS, es_n_scen, es_corr)
+    pnl_stressed = simulate_desk_scenarios(DESK_FACTORS, es_n_scen, min(es_corr + 0.3, 0.95), es_stress_mult, seed=7)
+    frtb = frtb_expected_shortfall(pnl_current, pnl_stressed, DESK_FACTORS, es_conf)
+
+    m1, m2, m3 = st.columns(3)
+    m1.metric("IMCC (Capital Modèle Interne)", f"{frtb['imcc']/1e6:,.1f} M€", help="0.5 x ES Desk + 0.5 x Somme des ES par classe de risque.")
+    m2.metric("ES Desk (Cascade + Stress)", f"{frtb['by_scope'].at['Desk', 'ES']/1e6:,.1f} M€")
+    m3.metric("ES Desk 10j (Courant, sans cascade)", f"{frtb['by_horizon'].iloc[0, 0]/1e6:,.1f} M€")
+
+    st.dataframe(frtb["by_scope"].style.format({c: "{:,.0f}" for c in frtb["by_scope"].columns if c != "Ratio"} | {"Ratio": "{:.2f}"}))
+
+    st.markdown("**Allocation d'Euler de l'ES 10j courant par facteur de risque** (lue sur la même matrice de scénarios)")
+    es_alloc = euler_allocation(-pnl_current, es_conf, index=DESK_FACTORS["Classe"] + " — " + DESK_FACTORS["Facteur"])
+    st.dataframe(es_alloc.sort_values("ES Composante", ascending=False).style.format(
+        {"VaR Composante": "{:,.0f}", "ES Composante": "{:,.0f}", "Part VaR (%)": "{:.1%}", "Part ES (%)": "{:.1%}"}))
+
+    # Graphique : ES 10 jours par palier d'horizon de liquidité
+    fig_es = go.Figure()
+    for scope in frtb["by_horizon"].index[1:]:
+        fig_es.add_trace(go.Bar(x=frtb["by_horizon"].columns, y=frtb["by_horizon"].loc[scope]/1e6, name=scope))
+    fig_es.update_layout(title="ES 97.5% (10j) par palier d'horizon de liquidité — Période courante", barmode='group',
+                         xaxis_title="Facteurs choqués", yaxis_title="ES (M€)")
+    st.plotly_chart(fig_es, use_container_width=True)
+
+with st.expander("🧱 Du IRC/CRM au Default Risk Charge (DRC)", expanded=True):
+    st.markdown("""
+    Le **DRC** remplace l'IRC et le CRM. Il couvre le risque de saut au défaut (Jump-to-Default) pour toutes les positions exposées au risque d'émetteur, **y compris les actions** (en cas de faillite, l'action vaut 0).
     
-#     *   **Horizon :** 1 an.
-#     *   **Confiance :** 99.9%.
-#     *   **Méthodologie :** VaR sur la distribution des pertes de défaut. Pas de diversification avec les autres risques de marché.
-#     """)
+    *   **Horizon :** 1 an.
+    *   **Confiance :** 99.9%.
+    *   **Méthodologie :** VaR sur la distribution des pertes de défaut. Pas de diversification avec les autres risques de marché.
+    """)
     
-#     st.subheader("Simulateur DRC (Simplifié)")
+    st.subheader("Simulateur DRC (Moteur Multi-Émetteurs, Défaut Seul)")
     
-#     col_drc1, col_drc2 = st.columns(2)
+    col_drc1, col_drc2 = st.columns(2)
 
-#     with col_drc1:
-#         drc_exp_bonds = st.slider("Exposition Obligations (M€)", 0, 1000, 500, key="drc_bonds") * 1e6
-#         drc_exp_equity = st.slider("Exposition Actions (M€)", 0, 1000, 200, key="drc_equity") * 1e6
-#         drc_pd = st.slider("PD moyenne", 0.1, 5.0, 2.0, 0.1, key="drc_pd") / 100
-#         drc_corr = st.slider("Corrélation", 0.0, 100.0, 30.0, 5.0, key="drc_corr") / 100
+    with col_drc1:
+        drc_exp_bonds = st.slider("Exposition Obligations (M€)", 0, 1000, 500, key="drc_bonds") * 1e6
+        drc_exp_equity = st.slider("Exposition Actions (M€)", 0, 1000, 200, key="drc_equity") * 1e6
+        drc_pd = st.slider("PD moyenne", 0.1, 5.0, 2.0, 0.1, key="drc_pd") / 100
+        drc_corr = st.slider("Corrélation", 0.0, 100.0, 30.0, 5.0, key="drc_corr") / 100
     
-#     with col_drc2:
-#         # Hypothèses LGD
-#         lgd_bonds = 0.50
-#         lgd_equity = 1.00
-        
-#         # Simulation
-#         Z_drc = np.random.normal(0, 1, 10000)
-#         thresh_drc = norm.ppf(drc_pd)
-#         cond_pd_drc = norm.cdf((thresh_drc - np.sqrt(drc_corr) * Z_drc) / np.sqrt(1 - drc_corr))
-        
-#         losses_bonds = drc_exp_bonds * lgd_bonds * cond_pd_drc
-#         losses_equity = drc_exp_equity * lgd_equity * cond_pd_drc
-#         total_losses_drc = losses_bonds + losses_equity
-        
-#         drc_value = np.percentile(total_losses_drc, 99.9)
+    with col_drc2:
+        # Hypothèses LGD : 50% sur les obligations, 100% sur les actions
+        # 100 émetteurs obligataires et 50 émetteurs actions, facteur systémique unique (sector_corr = 1)
+        @st.cache_data
+        def run_drc_engine(exp_bonds, exp_equity, pd_drc, corr):
+            n_bonds, n_equity = 100, 50
+            positions = pd.DataFrame({
+                "EAD": np.r_[np.full(n_bonds, exp_bonds / n_bonds), np.full(n_equity, exp_equity / n_equity)],
+                "PD": pd_drc,
+                "LGD": np.r_[np.full(n_bonds, 0.50), np.full(n_equity, 1.00)],
+                "Secteur": "Corporate",
+                "Rating": "BBB",
+            })
+            return simulate_credit_losses(positions, n_sim=20_000, rho=corr, sector_corr=1.0, contributions=False,
+                                          importance_shift=importance_shift_for(0.999), with_migration=False)
+
+        res_drc = run_drc_engine(drc_exp_bonds, drc_exp_equity, drc_pd, drc_corr)
+        drc_value = res_drc["irc"]
         
-#         st.metric("Default Risk Charge (DRC)", f"{drc_value/1e6:,.1f} M€", help="VaR 99.9% des pertes de défaut sur 1 an.")
+        st.metric("Default Risk Charge (DRC)", f"{drc_value/1e6:,.1f} M€", help="VaR 99.9% des pertes de défaut sur 1 an.",
+                  delta=f"± {res_drc['irc_stderr']/1e6:,.1f} M€ (erreur standard)", delta_color="off")
         
-#         fig_drc = go.Figure(go.Histogram(x=total_losses_drc/1e6, nbinsx=50, name='Distribution des Pertes', histnorm='probability'))
-#         fig_drc.add_vline(x=drc_value/1e6, line_dash="dash", line_color="red", annotation_text="DRC (99.9%)")
-#         fig_drc.update_layout(title="Distribution des Pertes de Défaut (DRC)", xaxis_title="Perte (M€)", yaxis_title="Probabilité")
-#         st.plotly_chart(fig_drc, use_container_width=True)
\ No newline at end of file
+        hist_drc, edges_drc = np.histogram(res_drc["losses"]/1e6, bins=50, weights=res_drc["weights"])
+        fig_drc = go.Figure(go.Bar(x=(edges_drc[:-1] + edges_drc[1:]) / 2, y=hist_drc / res_drc["weights"].sum(), name='Distribution des Pertes'))
+        fig_drc.add_vline(x=drc_value/1e6, line_dash="dash", line_color="red", annotation_text="DRC (99.9%)")
+        fig_drc.update_layout(title="Distribution des Pertes de Défaut (DRC)", xaxis_title="Perte (M€)", yaxis_title="Probabilité")
+        st.plotly_chart(fig_drc, use_container_width=True)
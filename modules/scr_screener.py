@@ -3,6 +3,10 @@ import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 
+from utils.asset_portfolio import load_asset_portfolio
+from utils.risk_cube import build_risk_cube, cube_totals, rollup
+from utils.spread_risk import CREDIT_QUALITY_STEPS, spread_scr, spread_shock
+
 # --- LOGIQUE DE CALCUL RÉGLEMENTAIRE (Moteur Solvabilité II) ---
 
 def calculate_diversified_scr(scr_dict):
@@ -28,6 +32,16 @@ def calculate_diversified_scr(scr_dict):
     scr_total = np.sqrt(np.dot(scr_vector.T, np.dot(corr_matrix, scr_vector)))
     return scr_total
 
+@st.cache_data(max_entries=4)
+def load_portfolio_scr(file_id, _inventory):
+    """
+    SCR par module du portefeuille existant, à partir d'un inventaire CSV / Parquet (chargé par blocs).
+    """
+    cube = build_risk_cube(load_asset_portfolio(_inventory))
+    by_class = rollup(cube, "Classe d'Actif")["Valeur de Marché (M€)"]
+    return {"Equity": by_class.get("Actions", 0.0) * 0.39, "Spread": cube_totals(cube)["scr_spread"],
+            "Property": by_class.get("Immobilier", 0.0) * 0.25}
+
 # --- INTERFACE UTILISATEUR STREAMLIT ---
 
 st.title("🛡️ SCR Asset Screener & Analyse de Rentabilité")
@@ -49,7 +63,7 @@ with col_a:
 with col_b:
     yield_expected = st.number_input("Rendement annuel attendu (%)", value=4.50, step=0.05) / 100
     if asset_type == "Obligations":
-        rating = st.select_slider("Notation (Rating)", options=["AAA", "AA", "A", "BBB", "HY"], value="BBB")
+        rating = st.select_slider("Notation (Rating)", options=list(CREDIT_QUALITY_STEPS), value="BBB")
         duration = st.slider("Sensibilité & Horizon (Années)", 1.0, 20.0, 6.0)
         horizon = duration
     else:
@@ -72,12 +86,11 @@ with col_text:
         scr_results["Equity"] = nominal * 0.39
     
     elif asset_type == "Obligations":
-        # Facteurs de stress Spread EIOPA (simplifiés pour démonstration)
-        stress_map = {"AAA": 0.009, "AA": 0.011, "A": 0.014, "BBB": 0.025, "HY": 0.045}
-        f_spread = stress_map[rating]
-        st.info(f"**Module Spread :** Application d'un choc basé sur le rating (**{rating}**) et la duration (**{duration:.1f}**).")
-        st.latex(r"SCR_{Spread} = Nominal \times Duration \times F(Rating)")
-        scr_results["Spread"] = nominal * duration * f_spread
+        # Même moteur Art. 176 que le portefeuille existant (obligation d'entreprise : dans le périmètre spread)
+        st.info(f"**Module Spread :** Choc de l'Article 176 pour le rating (**{rating}**) et la duration (**{duration:.1f}**) : "
+                f"**{float(spread_shock([rating], [duration])[0]):.2%}** de la valeur de marché.")
+        st.latex(r"SCR_{Spread} = VM \times \min\left(a_i + b_i \, (dur_i - d_i), \, 100\%\right)")
+        scr_results["Spread"] = float(spread_scr([nominal], [rating], [duration])[0])
         
     elif asset_type == "Immobilier":
         st.info("**Module Immobilier :** Application d'un choc forfaitaire de **25%** (Article 174).")
@@ -91,6 +104,24 @@ with col_calc:
 scr_div = calculate_diversified_scr(scr_results)
 diversification_gain = sum(scr_results.values()) - scr_div
 
+# SCR marginal : impact de l'investissement sur le SCR diversifié du portefeuille existant
+with st.expander("📂 SCR marginal par rapport au portefeuille existant (inventaire CSV / Parquet)"):
+    inventory_file = st.file_uploader("Inventaire de placements (une ligne par titre)", type=["csv", "parquet"],
+                                      help="Colonnes obligatoires (renseignées sur chaque ligne) : Nom de l'Actif, Classe d'Actif, Valeur de Marché (M€), Pays.")
+    if inventory_file is not None:
+        try:
+            scr_portfolio = load_portfolio_scr(inventory_file.file_id, inventory_file)
+        except ValueError as e:
+            st.error(f"Inventaire invalide : {e}")
+        else:
+            scr_before = calculate_diversified_scr(scr_portfolio)
+            scr_after = calculate_diversified_scr({k: v + scr_results.get(k, 0) for k, v in scr_portfolio.items()})
+            p1, p2, p3 = st.columns(3)
+            p1.metric("SCR Marché Portefeuille", f"{scr_before:,.0f} €")
+            p2.metric("SCR Marché avec l'Investissement", f"{scr_after:,.0f} €")
+            p3.metric("SCR Marginal", f"{scr_after - scr_before:,.0f} €", delta=f"{scr_after - scr_before - scr_div:,.0f} € vs SCR isolé",
+                      delta_color="inverse", help="Effet de diversification avec les expositions existantes.")
+
 # --- SECTION 3 : EFFICACITÉ DU CAPITAL (Vision Horizon) ---
 st.divider()
 st.header("3️⃣ Efficacité du Capital (Vision Horizon)")
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from utils.alm_engine import (_buy_at_par, allocate_profit_sharing, central_scenario, generate_bond_ladder, ladder_buckets,
+                              ladder_market_value, project_alm, simulate_economic_scenarios, time_value_of_guarantees)
+
+STRATEGY = dict(aum=1_000.0, pm=900.0, ppb=20.0, alloc_bond=0.8, tmg=0.005, target_rate=0.025)
+
+
+def test_profit_sharing_rules():
+    pm, ppb = np.full(3, 100.0), np.full(3, 5.0)
+    pb, dotation, reprise, guarantee = allocate_profit_sharing(np.array([4.0, 1.0, -10.0]), pm, ppb, tmg=0.0, target_rate=0.02)
+    # Marge suffisante : cible servie, surplus doté en PPB ; marge insuffisante : reprise ; marge négative : coût de garantie
+    np.testing.assert_allclose(pb, [2.0, 2.0, 0.0])
+    np.testing.assert_allclose(dotation, [2.0, 0.0, 0.0])
+    np.testing.assert_allclose(reprise, [0.0, 1.0, 5.0])
+    np.testing.assert_allclose(guarantee, [0.0, 0.0, 5.0])
+
+
+def test_risk_neutral_scenarios_are_martingales():
+    scen = simulate_economic_scenarios(n_scen=20_000, horizon=5, seed=1)
+    excess = scen["equity"] - scen["rates"]
+    assert np.abs(excess.mean(axis=0)).max() < 4 * excess.std(axis=0).max() / np.sqrt(20_000)
+    np.testing.assert_allclose(scen["deflators"], np.cumprod(1 / (1 + scen["rates"]), axis=1))
+
+
+def test_guarantee_is_always_served():
+    res = project_alm(simulate_economic_scenarios(500, 10, seed=2), **STRATEGY)
+    assert (res["rate_served"] >= STRATEGY["tmg"] - 1e-12).all()
+
+
+def test_tvog_vanishes_on_deterministic_scenarios():
+    central = central_scenario(10)
+    copies = {k: np.repeat(v, 50, axis=0) for k, v in central.items()}
+    tvog = time_value_of_guarantees(project_alm(copies, **STRATEGY), project_alm(central, **STRATEGY), copies, central)
+    assert tvog["tvog"] == pytest.approx(0.0, abs=1e-9)
+    assert tvog["stderr"] == pytest.approx(0.0, abs=1e-9)
+
+
+def test_par_bonds_are_worth_their_nominal():
+    y = np.array([0.01, 0.03, 0.05])
+    ladder = np.zeros((3, 3, 10))
+    _buy_at_par(ladder, np.full(3, 100.0), y, maturity=7)
+    np.testing.assert_allclose(ladder_market_value(ladder, y), 100.0)
+    assert (ladder_market_value(ladder, y + 0.01) < 100.0).all()
+
+
+def test_ladder_buckets_aggregate_lines_exactly():
+    lines = generate_bond_ladder(n_lines=500, total_nominal=1_000.0, market_yield=0.03, max_maturity=15)
+    y = np.array([0.02])
+    ladder = ladder_buckets(lines, 1, 15)
+    m = lines["Maturité"].to_numpy()
+    per_line = lines["Nominal"] * (1.02 ** -m + lines["Coupon"] * (1 - 1.02 ** -m) / 0.02)
+    assert ladder_market_value(ladder, y)[0] == pytest.approx(per_line.sum())
+    assert ladder[0].sum() == pytest.approx(1_000.0)
+
+
+def test_unrealised_gains_follow_rates():
+    scen = central_scenario(5, r0=0.03)
+    res = project_alm(scen, **STRATEGY, realise_gains=False)
+    res_low = project_alm(scen | {"rates": scen["rates"] - 0.01}, **STRATEGY, realise_gains=False)
+    assert (res_low["unrealised_gains"][:, 0] > res["unrealised_gains"][:, 0]).all()
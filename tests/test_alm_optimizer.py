@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.alm_engine import project_alm, simulate_economic_scenarios
+from utils.alm_optimizer import efficient_frontier, sweep_strategies
+
+BASE = dict(aum=1_000.0, pm=900.0, ppb=20.0, tmg=0.005)
+
+
+def test_frontier_keeps_only_non_dominated_points():
+    results = pd.DataFrame({"Solvabilité P5": [1.0, 2.0, 3.0, 2.5, 1.5],
+                            "Taux Servi Moyen": [0.04, 0.03, 0.01, 0.005, 0.02]})
+    frontier = efficient_frontier(results)
+    assert frontier.index.tolist() == [0, 1, 2]
+
+
+def test_sweep_matches_a_direct_projection():
+    scen = simulate_economic_scenarios(200, 5, seed=4)
+    sweep = sweep_strategies(scen, BASE, alloc_bond=[0.7, 0.9], target_rate=[0.02], ppb_cap=[0.15], max_workers=1)
+    assert len(sweep) == 2
+    res = project_alm(scen, **BASE, alloc_bond=0.9, target_rate=0.02, ppb_cap=0.15)
+    row = sweep.iloc[1]
+    assert row["Taux Servi Moyen"] == pytest.approx(res["rate_served"].mean())
+    assert row["Solvabilité P5"] == pytest.approx(np.percentile(res["solvency"][:, -1], 5))
+
+
+def test_sweep_in_parallel_matches_serial():
+    # Le pool de processus doit redonner la grille séquentielle, dans le même ordre
+    scen = simulate_economic_scenarios(200, 5, seed=4)
+    grid = dict(alloc_bond=[0.6, 0.8], target_rate=[0.01, 0.02], ppb_cap=[0.15])
+    serial = sweep_strategies(scen, BASE, **grid, max_workers=1)
+    parallel = sweep_strategies(scen, BASE, **grid, max_workers=2)
+    pd.testing.assert_frame_equal(parallel, serial)
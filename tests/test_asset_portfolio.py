@@ -0,0 +1,72 @@
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from utils import asset_portfolio
+from utils.asset_portfolio import ASSET_CLASSES, ISSUERS_GOV, PORTFOLIO_SCHEMA, generate_asset_portfolio, load_asset_portfolio
+
+
+@pytest.fixture(scope="module")
+def portfolio():
+    return generate_asset_portfolio(20_000, seed=1)
+
+
+def test_generator_schema_and_reproducibility(portfolio):
+    assert list(portfolio.columns) == list(PORTFOLIO_SCHEMA)
+    assert len(portfolio) == 20_000
+    pd.testing.assert_frame_equal(portfolio, generate_asset_portfolio(20_000, seed=1))
+    assert set(portfolio["Classe d'Actif"].cat.categories) == set(ASSET_CLASSES)
+
+
+def test_only_bonds_carry_rating_and_duration(portfolio):
+    is_bond = portfolio["Classe d'Actif"].str.startswith("Obligations")
+    assert (portfolio.loc[~is_bond, "Rating"] == "N/A").all()
+    assert (portfolio.loc[~is_bond, "Duration"] == 0).all()
+    assert portfolio.loc[is_bond, "Duration"].between(2, 15).all()
+
+
+def test_sovereign_country_follows_issuer(portfolio):
+    gov = portfolio[portfolio["Classe d'Actif"] == "Obligations Gouv."]
+    expected = gov["Nom de l'Actif"].astype(str).map(ISSUERS_GOV)
+    assert (gov["Pays"].astype(str) == expected).all()
+
+
+def test_parquet_inventory_round_trips_in_chunks(portfolio, tmp_path):
+    path = tmp_path / "inventaire.parquet"
+    portfolio.to_parquet(path, index=False)
+    loaded = load_asset_portfolio(path, chunk_rows=3_000)
+    pd.testing.assert_frame_equal(loaded.astype(str), portfolio.astype(str))
+
+
+def test_csv_aliases_and_defaults(tmp_path):
+    path = tmp_path / "s0602.csv"
+    path.write_text("Issuer Name,Asset Class,Market Value,Country,Credit Rating\n"
+                    "OAT France 2032,Obligations Gouv.,12.5,France,AA\n"
+                    "Sanofi,Actions,3.0,France,\n")
+    loaded = load_asset_portfolio(path)
+    assert list(loaded.columns) == list(PORTFOLIO_SCHEMA)
+    assert loaded["Rating"].tolist() == ["AA", "N/A"]
+    assert loaded["Duration"].tolist() == [0.0, 0.0]
+
+
+@pytest.mark.parametrize("content, message", [
+    ("Nom de l'Actif,Classe d'Actif,Pays\nA,Actions,France\n", "obligatoires"),
+    ("Nom de l'Actif,Classe d'Actif,Valeur de Marché (M€),Pays\nA,Crypto,1.0,France\n", "inconnues"),
+    ("Nom de l'Actif,Classe d'Actif,Valeur de Marché (M€),Pays\nA,Actions,1.0,France\nB,,2.0,\n",
+     r"1 ligne\(s\) sans Classe d'Actif, 1 ligne\(s\) sans Pays"),
+    ("Nom de l'Actif,Classe d'Actif,Valeur de Marché (M€),Pays\nA,Actions,,France\n", r"non renseignées : 1 ligne\(s\) sans Valeur de Marché"),
+])
+def test_invalid_inventory_is_rejected(tmp_path, content, message):
+    path = tmp_path / "inventaire.csv"
+    path.write_text(content)
+    with pytest.raises(ValueError, match=message):
+        load_asset_portfolio(path)
+
+
+def test_every_batch_is_validated(portfolio, monkeypatch):
+    # Second bloc au schéma incomplet (ex. partie Parquet sans colonne Pays)
+    first = pa.RecordBatch.from_pandas(portfolio.head(10), preserve_index=False)
+    second = pa.RecordBatch.from_pandas(portfolio.head(10).drop(columns="Pays"), preserve_index=False)
+    monkeypatch.setattr(asset_portfolio, "_iter_batches", lambda source, chunk_rows: iter([first, second]))
+    with pytest.raises(ValueError, match=r"bloc 2\) : \['Pays'\]"):
+        load_asset_portfolio("inventaire.parquet")
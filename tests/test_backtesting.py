@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.backtesting import backtest_var
+
+
+def _history(n_exceptions, n_days=300, span=240):
+    """
+    VaR constante de 1 et P&L de 0, sauf n_exceptions pertes de 2 réparties sur les span derniers jours.
+    """
+    index = pd.bdate_range("2020-01-01", periods=n_days)
+    pnl = pd.Series(0.0, index=index)
+    pnl.iloc[np.linspace(n_days - span, n_days - 1, n_exceptions, dtype=int)] = -2.0
+    return pd.Series(1.0, index=index), pnl
+
+
+@pytest.mark.parametrize("n_exceptions, zone, plus_factor", [
+    (0, "Verte", 0.0), (4, "Verte", 0.0), (5, "Jaune", 0.40), (7, "Jaune", 0.65), (9, "Jaune", 0.85), (10, "Rouge", 1.0),
+])
+def test_basel_traffic_light_on_known_counts(n_exceptions, zone, plus_factor):
+    last = backtest_var(*_history(n_exceptions)).iloc[-1]
+    assert last[("Exceptions", 0)] == n_exceptions
+    assert last[("Zone", 0)] == zone
+    assert last[("Plus Factor", 0)] == pytest.approx(plus_factor)
+
+
+def test_plus_factor_only_defined_at_99_percent():
+    # À 97.5%, 11 exceptions sur 250 jours : probabilité binomiale cumulée de 97.5%, zone jaune
+    res = backtest_var(*_history(11), alpha=0.975)
+    assert res["Zone"].iloc[-1, 0] == "Jaune"
+    assert res["Plus Factor"].iloc[-1].isna().all()
+
+
+def test_kupiec_statistic_is_zero_at_expected_frequency():
+    last = backtest_var(*_history(5, n_days=200, span=90), alpha=0.95, window=100).iloc[-1]
+    assert last[("Exceptions", 0)] == 5
+    assert last[("Kupiec LR", 0)] == pytest.approx(0.0, abs=1e-12)
+    assert last[("Kupiec p-value", 0)] == pytest.approx(1.0)
+
+
+def test_clustered_exceptions_fail_independence():
+    var, pnl = _history(0)
+    pnl.iloc[-20:-14] = -2.0
+    last = backtest_var(var, pnl).iloc[-1]
+    assert last[("Christoffersen p-value", 0)] < 0.01
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from utils.cdo_tranches import STANDARD_TRANCHES, tranche_expected_losses
+
+WIDTHS = np.array([d - a for a, d in STANDARD_TRANCHES])
+
+
+def test_independent_names_follow_the_binomial():
+    el = tranche_expected_losses([0.0], np.full(10, 0.1), lgd=1.0, tranches=[(0.0, 0.1), (0.0, 1.0)])
+    assert el.iloc[0, 0] == pytest.approx(1 - 0.9 ** 10)
+    assert el.iloc[0, 1] == pytest.approx(0.1)
+
+
+@pytest.mark.parametrize("method", ["recursion", "lhp"])
+def test_tranches_add_up_to_portfolio_expected_loss(method):
+    el = tranche_expected_losses([0.1, 0.3, 0.6], np.full(100, 0.02), lgd=0.6, method=method)
+    np.testing.assert_allclose(el.to_numpy() @ WIDTHS, 0.02 * 0.6, rtol=1e-3)
+
+
+def test_recursion_converges_to_large_pool_limit():
+    corr = [0.2, 0.5]
+    exact = tranche_expected_losses(corr, np.full(2_000, 0.02), method="recursion")
+    lhp = tranche_expected_losses(corr, np.full(2_000, 0.02), method="lhp")
+    np.testing.assert_allclose(exact, lhp, atol=5e-3)
+
+
+def test_unknown_method_is_rejected():
+    with pytest.raises(ValueError):
+        tranche_expected_losses([0.3], [0.01], method="monte-carlo")
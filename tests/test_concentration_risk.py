@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from utils.concentration_risk import concentration_scr
+
+
+@pytest.fixture(scope="module")
+def result():
+    # Assiette de 1 000 hors cash : 35 petits émetteurs AAA (1% chacun, sous le seuil de 3%)
+    issuer = ["A", "B", "P", "G", "Cash"] + [f"F{i}" for i in range(35)]
+    exposure = [100.0, 50.0, 200.0, 300.0, 500.0] + [10.0] * 35
+    rating = ["A", "BBB", "N/A", "AA", "N/A"] + ["AAA"] * 35
+    asset_class = ["Obligations Corp.", "Obligations Corp.", "Immobilier", "Obligations Gouv.", "Cash"] + ["Actions"] * 35
+    return concentration_scr(exposure, issuer, rating, asset_class)
+
+
+def test_article_186_thresholds_and_factors(result):
+    by_issuer = result["by_issuer"]
+    assert result["assets_xl"] == pytest.approx(1_000.0)
+    # CQS 2 : CT = 3%, g = 21% ; CQS 3 : CT = 1.5%, g = 27% ; immobilier : CT = 10%, g = 12%
+    assert by_issuer.loc["A", "SCR Concentration"] == pytest.approx(0.21 * (100 - 30))
+    assert by_issuer.loc["B", "SCR Concentration"] == pytest.approx(0.27 * (50 - 15))
+    assert by_issuer.loc["P", "SCR Concentration"] == pytest.approx(0.12 * (200 - 100))
+    assert by_issuer.loc["G", "Facteur g"] == 0.0
+    assert "Cash" not in by_issuer.index
+    assert result["scr"] == pytest.approx(np.sqrt(14.7 ** 2 + 9.45 ** 2 + 12.0 ** 2))
+
+
+def test_issuer_quality_is_exposure_weighted_and_rounded_up():
+    res = concentration_scr([50.0, 50.0, 900.0], ["X", "X", "Y"], ["AAA", "BBB", "AAA"], ["Obligations Corp."] * 3)
+    assert res["by_issuer"].loc["X", "CQS"] == "2"
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from utils.credit_portfolio import generate_credit_portfolio, importance_shift_for, simulate_credit_losses
+
+
+@pytest.fixture(scope="module")
+def positions():
+    return generate_credit_portfolio(200, seed=1)
+
+
+def test_streaming_run_matches_stored_losses(positions):
+    stored = simulate_credit_losses(positions, n_sim=5_000, chunk_size=700, contributions=False)
+    streamed = simulate_credit_losses(positions, n_sim=5_000, chunk_size=700, contributions=False, keep_losses=False)
+    assert streamed["losses"] is None
+    assert streamed["irc"] == stored["irc"] == np.sort(stored["losses"])[-5]
+    assert streamed["expected_shortfall"] == pytest.approx(stored["expected_shortfall"])
+
+
+def test_analytic_expected_loss_matches_simulated_mean(positions):
+    res = simulate_credit_losses(positions, n_sim=50_000, contributions=False)
+    stderr = res["losses"].std() / np.sqrt(len(res["losses"]))
+    assert abs(res["losses"].mean() - res["expected_loss"]) < 4 * stderr
+
+
+def test_contributions_add_up(positions):
+    res = simulate_credit_losses(positions, n_sim=20_000)
+    contrib = res["contributions"]
+    assert contrib["Contribution IRC"].sum() == pytest.approx(res["irc"])
+    assert contrib["Contribution ES"].sum() == pytest.approx(res["expected_shortfall"])
+    assert contrib["Contribution EL"].sum() == pytest.approx(res["expected_loss"])
+
+
+def test_es_contributions_add_up_on_a_homogeneous_portfolio(positions):
+    # EAD et LGD identiques, défauts seuls : pertes discrètes, nombreux ex-aequo au quantile
+    homogeneous = positions.assign(EAD=1e6, LGD=0.6)
+    res = simulate_credit_losses(homogeneous, n_sim=20_000, with_migration=False)
+    assert (res["losses"] == res["irc"]).sum() > 1
+    assert res["contributions"]["Contribution ES"].sum() == pytest.approx(res["expected_shortfall"])
+
+
+def test_importance_sampling_agrees_with_plain_monte_carlo(positions):
+    plain = simulate_credit_losses(positions, n_sim=200_000, contributions=False, keep_losses=False, seed=7)
+    shifted = simulate_credit_losses(positions, n_sim=20_000, contributions=False, keep_losses=False, seed=8,
+                                     importance_shift=importance_shift_for(0.999))
+    assert abs(shifted["irc"] - plain["irc"]) < 4 * np.hypot(shifted["irc_stderr"], plain["irc_stderr"])
+    # Variance par scénario plus faible sous Importance Sampling
+    assert shifted["irc_stderr"] ** 2 * 20_000 < plain["irc_stderr"] ** 2 * 200_000
+    assert shifted["expected_loss"] == plain["expected_loss"]
@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from utils.dynamic_lapse import ONC_LAWS, cyclical_lapse, lapse_rate
+
+
+@pytest.mark.parametrize("law", list(ONC_LAWS))
+def test_onc_law_knots_and_plateaus(law):
+    p = ONC_LAWS[law]
+    gaps = np.array([p["alpha"] - 0.05, p["alpha"], p["beta"], 0.5 * (p["beta"] + p["gamma"]), p["gamma"], p["delta"], p["delta"] + 0.05])
+    expected = [p["rc_max"], p["rc_max"], 0.0, 0.0, 0.0, p["rc_min"], p["rc_min"]]
+    np.testing.assert_allclose(cyclical_lapse(gaps + 0.03, 0.03, law), expected, atol=1e-12)
+
+
+def test_onc_law_is_linear_between_knots():
+    p = ONC_LAWS["ONC Plafond Max"]
+    mid = 0.5 * (p["alpha"] + p["beta"])
+    assert cyclical_lapse(mid, 0.0) == pytest.approx(0.5 * p["rc_max"])
+
+
+def test_lapse_rate_bounds_and_static_case():
+    served = np.array([[-0.20, 0.03, 0.20]])
+    total = lapse_rate(0.05, served, 0.03, "ONC Plafond Max")
+    np.testing.assert_allclose(total, [[0.45, 0.05, 0.01]])
+    assert lapse_rate(1.2, served, 0.03, "ONC Plafond Max").max() == 1.0
+    static = lapse_rate(0.05, served)
+    assert static.shape == served.shape
+    np.testing.assert_allclose(static, 0.05)
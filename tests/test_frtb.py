@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from utils.frtb import DESK_FACTORS, _cascade, _expected_shortfall, frtb_expected_shortfall, simulate_desk_scenarios
+
+
+def test_expected_shortfall_is_mean_of_worst_losses():
+    pnl = -np.arange(1.0, 101.0)[:, None]
+    assert _expected_shortfall(pnl, 0.975)[0] == 99.0
+
+
+def test_cascade_scales_by_liquidity_horizon_increments():
+    # Incréments d'horizon 10, 10, 20, 20, 60 jours pour une base de 10 jours
+    es = np.array([3.0, 1.0, 1.0, 0.0, 0.0])
+    assert _cascade(es) == pytest.approx(np.sqrt(9 + 1 + 2))
+
+
+def test_single_horizon_fully_reduced_desk():
+    factors = DESK_FACTORS.assign(Horizon=10, **{"Ensemble Réduit": True})
+    pnl = simulate_desk_scenarios(factors, n_scen=400, seed=1)
+    res = frtb_expected_shortfall(pnl, pnl, factors, rho=1.0)
+    desk = res["by_scope"].loc["Desk"]
+    assert desk["Ratio"] == pytest.approx(1.0)
+    assert res["imcc"] == pytest.approx(desk["ES"])
+    assert desk["ES"] == pytest.approx(_expected_shortfall(pnl.sum(axis=1, keepdims=True), 0.975)[0])
+
+
+def test_stressed_calibration_scales_with_stress():
+    current = simulate_desk_scenarios(n_scen=500, seed=2)
+    res = frtb_expected_shortfall(current, 2 * current)
+    np.testing.assert_allclose(res["by_scope"]["ES Réduit Stressé"], 2 * res["by_scope"]["ES Réduit Courant"])
+    assert (res["by_scope"]["Ratio"] >= 1.0).all()
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from scipy.integrate import quad
+
+from utils.heston import HESTON_PARAMS, calibrate_heston, heston_char_func, heston_prices
+from utils.option_pricing import implied_volatility
+
+S, R = 100.0, 0.02
+PARAMS = (0.04, 1.5, 0.06, 0.6, -0.7)
+
+
+def _gil_pelaez_call(K, T):
+    """
+    Prix de référence par quadrature : C = S P1 - K e^{-rT} P2 (probabilités d'exercice sous les deux mesures).
+    """
+    phi = lambda u: heston_char_func(u, S, T, R, *PARAMS)
+    forward = S * np.exp(R * T)
+    p1 = quad(lambda u: (np.exp(-1j * u * np.log(K)) * phi(u - 1j) / (1j * u * forward)).real, 1e-10, 200, limit=500)[0]
+    p2 = quad(lambda u: (np.exp(-1j * u * np.log(K)) * phi(u) / (1j * u)).real, 1e-10, 200, limit=500)[0]
+    return S * (0.5 + p1 / np.pi) - K * np.exp(-R * T) * (0.5 + p2 / np.pi)
+
+
+def test_fft_prices_match_quadrature():
+    strikes, maturities = np.array([80.0, 100.0, 120.0, 100.0]), np.array([0.5, 0.5, 0.5, 2.0])
+    fft = heston_prices(S, strikes, maturities, R, PARAMS)
+    reference = [_gil_pelaez_call(k, t) for k, t in zip(strikes, maturities)]
+    np.testing.assert_allclose(fft, reference, atol=2e-3)
+
+
+def test_puts_follow_parity():
+    call = heston_prices(S, 90.0, 1.0, R, PARAMS)
+    put = heston_prices(S, 90.0, 1.0, R, PARAMS, "Put")
+    assert call - put == pytest.approx(S - 90.0 * np.exp(-R))
+
+
+def test_calibration_recovers_heston_parameters():
+    strikes, maturities = (g.ravel() for g in np.meshgrid(np.linspace(80.0, 120.0, 9), [0.25, 0.5, 1.0, 2.0]))
+    vols, converged = implied_volatility(heston_prices(S, strikes, maturities, R, PARAMS), S, strikes, maturities, R)
+    assert converged.all()
+    fit = calibrate_heston(S, R, strikes, maturities, vols)
+    assert fit["rmse_vol"] < 1e-3
+    np.testing.assert_allclose([fit["params"][p] for p in HESTON_PARAMS], PARAMS, rtol=0.1, atol=0.01)
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.historical_var import (find_stressed_period, fit_garch, rolling_filtered_historical_var, rolling_historical_var,
+                                  simulate_pnl_history)
+
+
+@pytest.fixture(scope="module")
+def pnl():
+    return simulate_pnl_history(6 * 252, seed=3)
+
+
+def test_rolling_var_matches_window_order_statistics(pnl):
+    window, alpha = 250, 0.99
+    res = rolling_historical_var(pnl, window, alpha)
+    k = int(np.ceil(window * (1 - alpha)))
+    for end in (window - 1, 700, len(pnl) - 1):
+        losses = np.sort(-pnl.iloc[end - window + 1:end + 1].to_numpy())[-k:]
+        assert res["VaR"].iloc[end, 0] == pytest.approx(losses[0])
+        assert res["ES"].iloc[end, 0] == pytest.approx(losses.mean())
+    assert res["VaR"].iloc[:window - 1, 0].isna().all()
+
+
+def test_rolling_var_handles_several_desks(pnl):
+    desks = pd.concat([pnl.rename("A"), (2 * pnl).rename("B")], axis=1)
+    res = rolling_historical_var(desks)
+    np.testing.assert_allclose(res["VaR"]["B"], 2 * res["VaR"]["A"])
+
+
+def test_garch_fit_recovers_simulated_persistence(pnl):
+    params = fit_garch(simulate_pnl_history(20 * 252, seed=4).to_numpy())
+    assert params["alpha"] + params["beta"] == pytest.approx(0.98, abs=0.02)
+
+
+def test_filtered_var_uses_past_data_only(pnl):
+    full = rolling_filtered_historical_var(pnl)["VaR"].iloc[:, 0]
+    truncated = rolling_filtered_historical_var(pnl.iloc[:900])["VaR"].iloc[:, 0]
+    np.testing.assert_allclose(truncated, full.iloc[:900])
+    assert full.first_valid_index() == pnl.index[2 * 250 - 1]
+
+
+def test_stressed_period_finds_planted_crisis():
+    rng = np.random.default_rng(5)
+    values = rng.standard_normal(5 * 252)
+    values[600:850] *= 4
+    pnl = pd.Series(values, index=pd.bdate_range("2015-01-01", periods=len(values)))
+    stress = find_stressed_period(pnl)
+    overlap = pnl.index[600:850].intersection(pnl.loc[stress["start"]:stress["end"]].index)
+    assert len(overlap) >= 125
+    assert stress["svar"] == stress["scan"]["VaR Historique"].max()
+
+
+def test_stressed_period_rejects_short_history(pnl):
+    with pytest.raises(ValueError):
+        find_stressed_period(pnl.iloc[:100])
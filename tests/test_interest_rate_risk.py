@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from utils.interest_rate_risk import (MIN_UP_SHIFT, TIME_GRID, cash_flow_matrix, interest_rate_scr, nelson_siegel_rates,
+                                      shocked_curves, single_flow_matrix)
+
+RATES = nelson_siegel_rates()
+DF = (1 + RATES) ** -TIME_GRID
+
+
+def _pv_and_duration(flows):
+    pv = flows @ DF
+    return pv, flows @ (DF * TIME_GRID) / pv
+
+
+def test_shocked_curves_follow_article_166_167():
+    base, up, down = shocked_curves(np.array([0.001, 0.03, -0.002]), grid=np.array([1.0, 10.0, 20.0]))
+    np.testing.assert_allclose(up - base, [MIN_UP_SHIFT, 0.03 * 0.42, MIN_UP_SHIFT])
+    np.testing.assert_allclose(down, [0.001 * 0.25, 0.03 * 0.69, -0.002])
+
+
+def test_bond_flows_keep_value_and_duration():
+    duration = np.array([1.0, 2.5, 7.3, 15.0])
+    flows = cash_flow_matrix(np.full(4, 100.0), duration, RATES)
+    pv, dur = _pv_and_duration(flows)
+    np.testing.assert_allclose(pv, 100.0)
+    np.testing.assert_allclose(dur, duration, atol=0.05)
+    # Coupons à chaque date jusqu'à la maturité, remboursement à l'échéance
+    row = flows[2].toarray().ravel()
+    assert (row[1:8] > 0).all() and (row[10:] == 0).all()
+    assert row[8] > 10 * row[1]
+
+
+def test_single_flow_keeps_value_and_duration_exactly():
+    pv, dur = _pv_and_duration(single_flow_matrix([50.0], [12.4], RATES))
+    assert pv[0] == pytest.approx(50.0)
+    assert dur[0] == pytest.approx(12.4)
+
+
+def test_matched_flows_carry_no_rate_scr():
+    flows = cash_flow_matrix([100.0, 40.0], [4.0, 9.0], RATES)
+    res = interest_rate_scr(flows, flows, shocked_curves(RATES))
+    assert res["scr"] == pytest.approx(0.0, abs=1e-9)
+
+
+def test_short_assets_lose_in_the_down_scenario():
+    res = interest_rate_scr(cash_flow_matrix([100.0], [3.0], RATES), single_flow_matrix([90.0], [15.0], RATES), shocked_curves(RATES))
+    assert res["scenario"] == "Down"
+    assert res["scr"] > 0
+    assert res["pv"].loc["NAV", "Base"] == pytest.approx(10.0)
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from utils.lsmc_proxy import evaluate_proxy, fit_proxy, polynomial_powers, proxy_scr, sample_risk_drivers
+
+
+def _cubic(x):
+    return 100.0 + 50.0 * x[:, 0] - 20.0 * x[:, 1] + 30.0 * x[:, 0] * x[:, 1] ** 2 - 10.0 * x[:, 0] ** 3
+
+
+def test_polynomial_powers_cover_all_monomials():
+    powers = polynomial_powers(2, 3)
+    assert len(powers) == 10
+    assert len({tuple(p) for p in powers}) == 10
+    assert powers.sum(axis=1).max() == 3
+    np.testing.assert_array_equal(powers[0], [0, 0])
+
+
+def test_proxy_recovers_an_exact_polynomial():
+    drivers = sample_risk_drivers(2_000, seed=1)
+    proxy = fit_proxy(drivers, _cubic(drivers), degree=3, ridge=1e-12)
+    assert proxy["r2"] == pytest.approx(1.0, abs=1e-10)
+    test_drivers = sample_risk_drivers(500, seed=2)
+    np.testing.assert_allclose(evaluate_proxy(proxy, test_drivers), _cubic(test_drivers), rtol=1e-6)
+
+
+def test_proxy_scr_is_discounted_mean_minus_quantile():
+    drivers = sample_risk_drivers(5_000, seed=3)
+    proxy = fit_proxy(drivers, _cubic(drivers), ridge=1e-12)
+    res = proxy_scr(proxy, drivers, r0=0.02)
+    own_funds = evaluate_proxy(proxy, drivers)
+    assert res["quantile"] == pytest.approx(np.quantile(own_funds, 0.005))
+    assert res["scr"] == pytest.approx((own_funds.mean() - res["quantile"]) / 1.02)
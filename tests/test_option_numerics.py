@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from utils.option_numerics import barrier_price, crank_nicolson, geometric_asian_price, monte_carlo_exotic, simulate_paths
+from utils.option_pricing import bs_price_greeks
+
+S, K, T, R, SIGMA = 100.0, 100.0, 1.0, 0.05, 0.2
+
+
+@pytest.mark.parametrize("opt_type", ["Call", "Put"])
+def test_crank_nicolson_matches_closed_form(opt_type):
+    exact = bs_price_greeks(S, K, T, R, SIGMA, opt_type)
+    pde = crank_nicolson(S, K, T, R, SIGMA, opt_type, n_space=400, n_time=400)
+    assert pde["Prix"] == pytest.approx(exact["Prix"], abs=1e-2)
+    assert pde["Delta"] == pytest.approx(exact["Delta"], abs=1e-3)
+    assert pde["Gamma"] == pytest.approx(exact["Gamma"], abs=1e-3)
+
+
+def test_early_exercise_premium():
+    american_put = crank_nicolson(S, K, T, R, SIGMA, "Put", american=True)["Prix"]
+    assert american_put > crank_nicolson(S, K, T, R, SIGMA, "Put")["Prix"] + 0.1
+    # Sans dividende, l'exercice anticipé d'un Call n'est jamais optimal
+    assert crank_nicolson(S, K, T, R, SIGMA, "Call", american=True)["Prix"] == pytest.approx(
+        crank_nicolson(S, K, T, R, SIGMA, "Call")["Prix"], abs=1e-10)
+
+
+def test_discrete_barrier_matches_corrected_closed_form():
+    mc = monte_carlo_exotic(S, K, T, R, SIGMA, "Call", "Barrière", barrier=90.0, n_paths=200_000, n_steps=52, seed=3)
+    assert mc["Prix"] == pytest.approx(barrier_price(S, K, T, R, SIGMA, 90.0, "Call", n_steps=52), abs=4 * mc["Erreur Type"])
+
+
+def test_up_and_out_put_matches_corrected_closed_form():
+    mc = monte_carlo_exotic(S, K, T, R, SIGMA, "Put", "Barrière", barrier=115.0, n_paths=200_000, n_steps=52, seed=5)
+    assert mc["Prix"] == pytest.approx(barrier_price(S, K, T, R, SIGMA, 115.0, "Put", n_steps=52), abs=4 * mc["Erreur Type"])
+
+
+@pytest.mark.parametrize("opt_type, barrier, strike", [("Call", 110.0, K), ("Call", 90.0, 80.0), ("Put", 90.0, K), ("Put", 110.0, 120.0)])
+def test_unsupported_barriers_are_rejected(opt_type, barrier, strike):
+    with pytest.raises(ValueError, match="non supportée"):
+        monte_carlo_exotic(S, strike, T, R, SIGMA, opt_type, "Barrière", barrier=barrier, n_paths=1_000)
+    with pytest.raises(ValueError, match="non supportée"):
+        barrier_price(S, strike, T, R, SIGMA, barrier, opt_type)
+
+
+def test_geometric_asian_matches_simulated_payoff():
+    paths = simulate_paths(S, T, R, SIGMA, n_paths=200_000, n_steps=12, seed=4)
+    payoff = np.exp(-R * T) * np.maximum(np.exp(np.log(paths).mean(axis=1)) - K, 0.0)
+    assert geometric_asian_price(S, K, T, R, SIGMA, 12) == pytest.approx(payoff.mean(), abs=4 * payoff.std() / np.sqrt(len(payoff)))
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.option_pricing import (bs_price_greeks, generate_smile_quotes, implied_volatility, option_sign, price_surface,
+                                  revalue_book)
+
+S, K, T, R, SIGMA = 100.0, 95.0, 0.75, 0.03, 0.25
+
+
+def _price(opt_type, dS=0.0, dT=0.0, dr=0.0, dsigma=0.0):
+    return bs_price_greeks(S + dS, K, T + dT, R + dr, SIGMA + dsigma, opt_type)["Prix"]
+
+
+def test_option_sign_accepts_labels_and_booleans():
+    np.testing.assert_array_equal(option_sign(["Call", "Put"]), [1.0, -1.0])
+    np.testing.assert_array_equal(option_sign(np.array([True, False])), [1.0, -1.0])
+    assert option_sign("Put") == -1.0
+
+
+def test_put_call_parity():
+    res = bs_price_greeks(S, K, T, R, SIGMA, np.array(["Call", "Put"]))
+    assert res["Prix"][0] - res["Prix"][1] == pytest.approx(S - K * np.exp(-R * T))
+    assert res["Delta"][0] - res["Delta"][1] == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("opt_type", ["Call", "Put"])
+def test_greeks_match_finite_differences(opt_type):
+    g = bs_price_greeks(S, K, T, R, SIGMA, opt_type)
+    h = 1e-4
+    assert g["Delta"] == pytest.approx((_price(opt_type, dS=h) - _price(opt_type, dS=-h)) / (2 * h), rel=1e-6)
+    assert g["Gamma"] == pytest.approx((_price(opt_type, dS=h) - 2 * _price(opt_type) + _price(opt_type, dS=-h)) / h ** 2, rel=1e-4)
+    # Conventions de la page : Vega et Rho pour 1%, Theta par jour (passage du temps : T diminue)
+    assert g["Vega"] == pytest.approx((_price(opt_type, dsigma=h) - _price(opt_type, dsigma=-h)) / (2 * h) / 100, rel=1e-6)
+    assert g["Rho"] == pytest.approx((_price(opt_type, dr=h) - _price(opt_type, dr=-h)) / (2 * h) / 100, rel=1e-6)
+    assert g["Theta"] == pytest.approx(-(_price(opt_type, dT=h) - _price(opt_type, dT=-h)) / (2 * h) / 365, rel=1e-6)
+
+
+def test_book_revaluation_weights_by_quantity():
+    book = pd.DataFrame({"S": [S, S], "K": [K, K], "T": [T, T], "r": [R, R], "sigma": [SIGMA, SIGMA],
+                         "Type": pd.Categorical(["Call", "Put"]), "Quantité": [3.0, -2.0]})
+    positions, totals = revalue_book(book)
+    prices = bs_price_greeks(S, K, T, R, SIGMA, np.array(["Call", "Put"]))["Prix"]
+    np.testing.assert_allclose(positions["Prix"], [3 * prices[0], -2 * prices[1]])
+    assert totals["Prix"] == pytest.approx(3 * prices[0] - 2 * prices[1])
+
+
+@pytest.mark.parametrize("opt_type", ["Call", "Put"])
+def test_implied_volatility_round_trip(opt_type):
+    strikes, sigmas = np.meshgrid(np.linspace(60.0, 140.0, 9), [0.1, 0.2, 0.6])
+    prices = bs_price_greeks(S, strikes, T, R, sigmas, opt_type)["Prix"]
+    iv, converged = implied_volatility(prices, S, strikes, T, R, opt_type)
+    assert converged.all()
+    np.testing.assert_allclose(iv, sigmas, atol=1e-6)
+
+
+def test_implied_volatility_rejects_arbitrage_violations():
+    iv, converged = implied_volatility([S + 1.0, 0.5 * (S - K * np.exp(-R * T))], S, K, T, R, "Call")
+    assert not converged.any()
+    assert np.isnan(iv).all()
+
+
+def test_smile_quotes_are_inverted_exactly():
+    quotes = generate_smile_quotes(n_strikes=20, n_maturities=10)
+    iv, converged = implied_volatility(quotes["Prix"], 100.0, quotes["K"], quotes["T"], 0.03, quotes["Type"].to_numpy())
+    # Les cotations sans valeur temps (prix de l'ordre de la précision machine) ne portent aucune volatilité
+    priced = quotes["Prix"].to_numpy() > 1e-8
+    assert converged[priced].all()
+    np.testing.assert_allclose(iv[converged], quotes["Vol Vraie"][converged], atol=1e-6)
+
+
+def test_price_surface_is_cached_and_read_only():
+    price_surface.cache_clear()
+    spots, times, surfaces = price_surface(K, R, SIGMA, "Put", n_spot=11, n_time=5)
+    assert price_surface(K, R, SIGMA, "Put", n_spot=11, n_time=5)[2] is surfaces
+    assert price_surface.cache_info().hits == 1
+    assert not surfaces["Prix"].flags.writeable
+    # Dernière ligne : maturité t_max
+    assert times[-1] == pytest.approx(1.0)
+    np.testing.assert_allclose(surfaces["Delta"][-1], bs_price_greeks(spots, K, 1.0, R, SIGMA, "Put")["Delta"])
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from utils.risk_allocation import euler_allocation
+from utils.tail_estimators import StreamingTailEstimator
+
+
+@pytest.fixture(scope="module")
+def losses():
+    rng = np.random.default_rng(0)
+    return rng.standard_normal((50_000, 4)) * [1.0, 2.0, 0.5, 3.0]
+
+
+def test_components_add_up_to_portfolio_var_and_es(losses):
+    res = euler_allocation(losses, alpha=0.99)
+    total = np.sort(losses.sum(axis=1))
+    k = int(np.ceil(len(total) * 0.01))
+    assert res["VaR Composante"].sum() == pytest.approx(total[-k])
+    assert res["ES Composante"].sum() == pytest.approx(total[-k:].mean())
+    assert res["Part ES (%)"].sum() == pytest.approx(1.0)
+
+
+def test_components_add_up_with_ties_at_the_var():
+    # Pertes de défaut 0/1 : de nombreux scénarios sont à égalité avec la VaR
+    rng = np.random.default_rng(1)
+    defaults = (rng.random((10_000, 20)) < 0.05).astype(float)
+    res = euler_allocation(defaults, alpha=0.99)
+    assert res["ES Composante"].sum() == pytest.approx(np.sort(defaults.sum(axis=1))[-100:].mean())
+    assert res["Part ES (%)"].sum() == pytest.approx(1.0)
+
+    weights = rng.uniform(0.5, 1.5, 10_000)
+    weighted = euler_allocation(defaults, alpha=0.99, weights=weights)
+    es = StreamingTailEstimator(10_000, (0.99,)).update(defaults.sum(axis=1), weights).es(0.99)
+    assert weighted["ES Composante"].sum() == pytest.approx(es)
+
+
+def test_independent_gaussian_components_follow_variance_shares(losses):
+    # Pour des pertes gaussiennes indépendantes, ES_i / ES = σ_i² / σ²
+    res = euler_allocation(losses, alpha=0.99)
+    variances = np.array([1.0, 4.0, 0.25, 9.0])
+    np.testing.assert_allclose(res["Part ES (%)"], variances / variances.sum(), atol=0.02)
+
+
+def test_marginal_contributions_divide_by_exposure(losses):
+    exposures = np.array([10.0, 20.0, 5.0, 30.0])
+    res = euler_allocation(losses, exposures=exposures)
+    np.testing.assert_allclose(res["ES Marginale"] * exposures, res["ES Composante"])
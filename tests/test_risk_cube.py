@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from utils.asset_portfolio import generate_asset_portfolio
+from utils.risk_cube import MV, build_risk_cube, cube_totals, rollup
+from utils.spread_risk import spread_scr
+
+
+@pytest.fixture(scope="module")
+def positions():
+    return generate_asset_portfolio(5_000, seed=2)
+
+
+def test_spread_scope_excludes_government_bonds(positions):
+    totals = rollup(build_risk_cube(positions), "Classe d'Actif")["SCR Spread"]
+    corp = positions[positions["Classe d'Actif"] == "Obligations Corp."]
+    assert totals["Obligations Gouv."] == 0.0
+    assert totals.drop("Obligations Corp.").sum() == 0.0
+    assert totals["Obligations Corp."] == pytest.approx(spread_scr(corp[MV], corp["Rating"], corp["Duration"]).sum())
+
+
+def test_rollups_match_line_level_sums(positions):
+    cube = build_risk_cube(positions)
+    assert cube["Nombre de Lignes"].sum() == len(positions)
+    by_country = rollup(cube, "Pays")[MV]
+    expected = positions.groupby("Pays", observed=True)[MV].sum()
+    np.testing.assert_allclose(by_country.sort_index(), expected.sort_index())
+
+
+def test_filtered_rollup_and_weighted_totals(positions):
+    cube = build_risk_cube(positions)
+    bonds = ["Obligations Gouv.", "Obligations Corp."]
+    filtered = rollup(cube, "Rating", where={"Classe d'Actif": bonds})[MV].sum()
+    assert filtered == pytest.approx(positions.loc[positions["Classe d'Actif"].isin(bonds), MV].sum())
+    totals = cube_totals(cube)
+    mv = positions[MV]
+    assert totals["duration"] == pytest.approx((mv * positions["Duration"]).sum() / mv.sum())
+    assert totals["aum"] == pytest.approx(mv.sum())
@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.spread_risk import UNRATED, credit_quality_step, spread_scope, spread_scr, spread_shock
+
+
+@pytest.mark.parametrize("rating, duration, shock", [
+    ("AAA", 3.0, 0.009 * 3),                # CQS 0, tranche (0, 5] : b x dur
+    ("AAA", 5.0, 0.045),                    # borne de tranche : continuité avec a de la tranche suivante
+    ("BBB", 7.0, 0.125 + 0.015 * 2),        # CQS 3, tranche (5, 10]
+    ("A", 25.0, 0.155 + 0.005 * 5),         # CQS 2, au-delà de 20 ans
+    ("N/A", 4.0, 0.030 * 4),                # non noté
+    ("CCC", 100.0, 1.0),                    # plafond de 100%
+])
+def test_article_176_table_lookup(rating, duration, shock):
+    assert spread_shock([rating], [duration])[0] == pytest.approx(shock)
+
+
+def test_credit_quality_step_maps_categories_and_missing_values():
+    ratings = pd.Series(["AA", None, "BB", "NR"], dtype="category")
+    np.testing.assert_array_equal(credit_quality_step(ratings), [1, UNRATED, 4, UNRATED])
+
+
+def test_scr_is_zero_outside_scope():
+    scr = spread_scr([100.0, 100.0], ["BBB", "BBB"], [7.0, 7.0], in_scope=[True, False])
+    np.testing.assert_allclose(scr, [15.5, 0.0])
+
+
+def test_scope_covers_bonds_except_exempt_sovereigns():
+    classes = pd.Categorical(["Obligations Corp.", "Obligations Gouv.", "Actions", "Cash"])
+    np.testing.assert_array_equal(spread_scope(classes), [True, False, False, False])
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from utils.tail_estimators import StreamingTailEstimator
+
+LEVELS = (0.99, 0.995, 0.999)
+
+
+@pytest.fixture(scope="module")
+def sample():
+    return np.random.default_rng(0).standard_t(4, 100_000)
+
+
+def _streamed(sample, chunk=7_000):
+    estimator = StreamingTailEstimator(len(sample), LEVELS)
+    for start in range(0, len(sample), chunk):
+        estimator.update(sample[start:start + chunk])
+    return estimator
+
+
+@pytest.mark.parametrize("level", LEVELS)
+def test_streaming_var_and_es_match_full_sample(sample, level):
+    estimator = _streamed(sample)
+    k = int(np.ceil(len(sample) * (1 - level) - 1e-9))
+    top = np.sort(sample)[-k:]
+    assert estimator.var(level) == top[0]
+    assert estimator.es(level) == pytest.approx(top.mean())
+    assert estimator.var(level) == pytest.approx(np.quantile(sample, level), rel=1e-2)
+
+
+def test_buffer_is_pruned_and_mean_is_exact(sample):
+    estimator = _streamed(sample)
+    assert len(estimator._values) < 0.05 * len(sample)
+    assert estimator.mean == pytest.approx(sample.mean())
+
+
+def test_levels_outside_buffer_are_rejected(sample):
+    with pytest.raises(ValueError):
+        _streamed(sample).var(0.95)
+
+
+def test_stderr_matches_dispersion_across_seeds():
+    n, level = 20_000, 0.99
+    quantiles, stderrs = [], []
+    for seed in range(40):
+        losses = np.random.default_rng(seed).standard_normal(n)
+        estimator = StreamingTailEstimator(n, (level,)).update(losses)
+        quantiles.append(estimator.var(level))
+        stderrs.append(estimator.stderr(level))
+    assert np.mean(stderrs) == pytest.approx(np.std(quantiles, ddof=1), rel=0.35)
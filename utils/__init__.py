@@ -0,0 +1,3 @@
+"""
+Moteurs de calcul partagés entre les pages de l'application (sans dépendance à Streamlit).
+"""
@@ -0,0 +1,233 @@
+import numpy as np
+import pandas as pd
+
+from utils.dynamic_lapse import lapse_rate
+
+# --- HYPOTHÈSES DU FONDS EUROS ---
+
+FEES = 0.006          # Frais de gestion (0.60% des PM)
+PPB_CAP = 0.08        # Plafond de PPB (8% des PM) : au-delà, le surplus est distribué
+VIF_RATE = 0.015      # Proxy VIF : valeur actuelle des marges futures (~1.5% des PM)
+EQUITY_SHOCK = 0.39   # Choc actions S2 (type 1)
+LIFE_SHOCK = 0.03     # Proxy chocs Vie / Opérationnel (3% des PM)
+LAC_TP = 0.50         # Absorption par les provisions techniques (baisse de la PB future)
+REINVEST_MATURITY = 10  # Maturité des obligations achetées (réinvestissement au pair)
+
+
+def simulate_economic_scenarios(n_scen=1000, horizon=20, r0=0.025, r_mean=None, kappa=0.15, rate_vol=0.01,
+                                equity_return=None, equity_vol=0.18, seed=42):
+    """
+    Scénarios économiques annuels (scénarios x années) : taux Vasicek (discrétisation exacte) et
+    rendement actions lognormal. equity_return=None : univers risque neutre (rendement espéré
+    des actions égal au taux sans risque du scénario), sinon monde réel.
+    rates[:, t] est le taux de l'année t+1 ; deflators[:, t] actualise un flux de fin d'année t+1.
+    """
+    rng = np.random.default_rng(seed)
+    r_mean = r0 if r_mean is None else r_mean
+    decay = np.exp(-kappa)
+    step_vol = rate_vol * np.sqrt((1 - decay ** 2) / (2 * kappa))
+
+    rates = np.empty((n_scen, horizon))
+    rates[:, 0] = r0
+    eps = rng.standard_normal((n_scen, horizon - 1))
+    for t in range(1, horizon):
+        rates[:, t] = r_mean + (rates[:, t - 1] - r_mean) * decay + step_vol * eps[:, t - 1]
+
+    drift = np.log1p(rates if equity_return is None else np.full_like(rates, equity_return))
+    equity = np.expm1(drift - 0.5 * equity_vol ** 2 + equity_vol * rng.standard_normal((n_scen, horizon)))
+    return {"rates": rates, "equity": equity, "deflators": np.cumprod(1 / (1 + rates), axis=1)}
+
+
+def central_scenario(horizon=20, r0=0.025, r_mean=None, kappa=0.15, equity_return=None):
+    """
+    Scénario déterministe équivalent (volatilités nulles), référence du calcul de la TVOG.
+    """
+    return simulate_economic_scenarios(1, horizon, r0, r_mean, kappa, 0.0, equity_return, 0.0)
+
+
+def generate_bond_ladder(n_lines=2000, total_nominal=800.0, market_yield=0.025, max_maturity=20, seed=42):
+    """
+    Portefeuille obligataire fictif ligne à ligne, acheté au pair (valeur comptable = nominal) à des dates
+    passées : coupons dispersés autour du taux de marché, d'où des plus ou moins-values latentes initiales.
+    Colonnes : Nominal, Coupon, Maturité (années restantes), Valeur Comptable.
+    """
+    rng = np.random.default_rng(seed)
+    nominal = rng.lognormal(0, 0.5, n_lines)
+    return pd.DataFrame({
+        "Nominal": nominal * total_nominal / nominal.sum(),
+        "Coupon": np.maximum(0.0, market_yield + rng.normal(0, 0.01, n_lines)),
+        "Maturité": rng.integers(1, max_maturity + 1, n_lines),
+        "Valeur Comptable": nominal * total_nominal / nominal.sum(),
+    })
+
+
+def ladder_buckets(lines, n_scen, n_buckets):
+    """
+    Agrège les lignes par maturité résiduelle (1 à n_buckets années) et réplique l'état sur les scénarios :
+    tableau (nominal / montant de coupon / valeur comptable) x scénarios x maturités. À taux actuariel commun,
+    la valorisation est linéaire en coupons et nominaux : l'agrégation par maturité est exacte.
+    """
+    m = np.clip(lines["Maturité"].to_numpy(dtype=np.int64), 1, n_buckets) - 1
+    nominal = lines["Nominal"].to_numpy(dtype=np.float64)
+    weights = [nominal, nominal * lines["Coupon"].to_numpy(), lines["Valeur Comptable"].to_numpy(dtype=np.float64)]
+    per_bucket = np.stack([np.bincount(m, weights=w, minlength=n_buckets) for w in weights])
+    return np.repeat(per_bucket[:, None, :], n_scen, axis=1)
+
+
+def discount_grid(market_yield, n_buckets):
+    """
+    Facteurs v^m et annuités a(m, y) par scénario pour m = 1 ... n_buckets (produits cumulés, sans puissance).
+    """
+    vpow = np.cumprod(np.broadcast_to((1 / (1 + market_yield))[:, None], (len(market_yield), n_buckets)), axis=1)
+    return np.stack([vpow, np.cumsum(vpow, axis=1)])
+
+
+def ladder_market_value(ladder, market_yield=None, grid=None):
+    """
+    Valeur de marché du portefeuille obligataire par scénario : MV = somme_m [N_m x v^m + C_m x a(m, y)].
+    """
+    grid = discount_grid(market_yield, ladder.shape[2]) if grid is None else grid
+    return np.einsum('kij,kij->i', ladder[:2], grid)
+
+
+def _sell_pro_rata(ladder, fraction):
+    """
+    Cession d'une fraction de chaque ligne (même proportion sur toute l'échelle, forme préservée).
+    """
+    ladder *= (1 - fraction)[None, :, None]
+
+
+def _buy_at_par(ladder, amount, market_yield, maturity):
+    """
+    Achat au pair d'une obligation de maturité donnée au taux de marché du scénario (pas de coupon négatif).
+    """
+    ladder[:, :, maturity - 1] += np.stack([amount, amount * np.maximum(market_yield, 0.0), amount])
+
+
+def allocate_profit_sharing(gross_margin, pm, ppb, tmg, target_rate, ppb_cap=PPB_CAP):
+    """
+    Politique de PB vectorisée (masques sur les scénarios) : la cible concurrentielle est servie si la marge
+    le permet (surplus en PPB, plafonnée), sinon on reprend la PPB ; le TMG est toujours servi et l'éventuel
+    manque est absorbé par les fonds propres (coût de la garantie).
+    Renvoie (PB distribuée, dotation PPB, reprise PPB, coût de la garantie).
+    """
+    pb_target = np.maximum(0.0, (target_rate - tmg) * pm)
+    solde = gross_margin - pb_target
+    favourable = solde >= 0
+
+    surplus = np.maximum(0.0, ppb + solde - ppb_cap * pm)
+    reprise = np.where(favourable, 0.0, np.minimum(ppb, -solde))
+    dotation = np.where(favourable, solde - surplus, 0.0)
+    pb = np.where(favourable, pb_target + surplus, np.maximum(0.0, gross_margin + reprise))
+    guarantee_cost = np.where(favourable, 0.0, np.maximum(0.0, -(gross_margin + reprise)))
+    return pb, dotation, reprise, guarantee_cost
+
+
+def project_alm(scenarios, aum, pm, ppb, alloc_bond, tmg, target_rate, fees=FEES, ppb_cap=PPB_CAP,
+                ladder=None, reinvest_maturity=REINVEST_MATURITY, realise_gains=True,
+                lapse=0.0, lapse_law=None, competitor_rate=None):
+    """
+    Projection bilantielle du fonds euros sur tous les scénarios à la fois : l'état (échelle obligataire
+    par maturité, actions, PM, PPB) est indexé par scénario et chaque année est une suite d'opérations sur tableaux.
+    Obligations : coupons et remboursements en produits, valorisation au taux du scénario (plus ou moins-values
+    latentes), réinvestissement au pair. Si la marge ne permet pas de servir la cible, des plus-values latentes
+    sont réalisées (cessions au prorata, réinvesties) et alimentent la PB. Actions : rendement comptabilisé.
+    Rachats : taux structurel, plus une composante dynamique (lapse_law, ex: "ONC Plafond Max") fonction de
+    l'écart entre taux servi et taux concurrent (competitor_rate : scalaire ou scénarios x années, défaut : taux cible).
+    Renvoie les trajectoires (scénarios x années).
+    """
+    rates, equity_returns = scenarios["rates"], scenarios["equity"]
+    n_scen, horizon = rates.shape
+    pm, ppb = np.full(n_scen, float(pm)), np.full(n_scen, float(ppb))
+
+    if ladder is None:
+        ladder = generate_bond_ladder(total_nominal=alloc_bond * aum, market_yield=rates[0, 0])
+    n_buckets = max(int(ladder["Maturité"].max()), reinvest_maturity)
+    ladder = ladder_buckets(ladder, n_scen, n_buckets)
+    ladder *= alloc_bond * aum / ladder_market_value(ladder[:, :1], rates[:1, 0])[0]
+    equity = np.full(n_scen, (1 - alloc_bond) * aum)
+
+    competitor = np.broadcast_to(target_rate if competitor_rate is None else competitor_rate, (n_scen, horizon))
+
+    keys = ["yield_asset", "book_yield", "market_rate", "rate_served", "lapse_rate", "surrenders", "ppb", "own_funds", "solvency", "guarantee_cost",
+            "unrealised_gains", "realised_gains"]
+    out = {k: np.empty((n_scen, horizon)) for k in keys}
+
+    for t in range(horizon):
+        y = rates[:, t]
+        grid = discount_grid(y, n_buckets)
+        book_start = ladder[2].sum(axis=1) + equity
+
+        # 1. Produits obligataires : coupons et remboursements (tombée de la 1ère maturité, décalage de l'échelle)
+        coupon_income = ladder[1].sum(axis=1)
+        redemption, redemption_gain = ladder[0, :, 0].copy(), ladder[0, :, 0] - ladder[2, :, 0]
+        ladder[:, :, :-1] = ladder[:, :, 1:]
+        ladder[:, :, -1] = 0.0
+        equity_result = equity * equity_returns[:, t]
+        equity = equity + equity_result
+        bond_mv = ladder_market_value(ladder, grid=grid)
+
+        # 2. Marge financière brute ; réalisation de plus-values latentes si la cible n'est pas atteinte
+        fee_amount = pm * fees
+        fin_result = coupon_income + redemption_gain + equity_result
+        gross_margin = fin_result - pm * tmg - fee_amount
+        realised = np.zeros(n_scen)
+        if realise_gains:
+            shortfall = np.maximum(0.0, np.maximum(0.0, (target_rate - tmg) * pm) - gross_margin)
+            latent = bond_mv - ladder[2].sum(axis=1)
+            fraction = np.divide(shortfall, latent, out=np.zeros(n_scen), where=latent > 0).clip(0.0, 1.0)
+            realised = fraction * np.maximum(latent, 0.0)
+            _sell_pro_rata(ladder, fraction)
+            _buy_at_par(ladder, fraction * bond_mv, y, reinvest_maturity)  # réinvestissement du produit de cession
+            fin_result, gross_margin = fin_result + realised, gross_margin + realised
+
+        pb, dotation, reprise, guarantee_cost = allocate_profit_sharing(gross_margin, pm, ppb, tmg, target_rate, ppb_cap)
+        rate_served = np.divide(pm * tmg + pb, pm, out=np.zeros(n_scen), where=pm > 0)
+        ppb = ppb + dotation - reprise
+        pm = pm * (1 + rate_served)
+
+        # Rachats en fin d'année (structurels + dynamiques), payés sur la trésorerie du fonds
+        lapse_t = lapse_rate(lapse, rate_served, competitor[:, t], lapse_law)
+        surrenders = pm * lapse_t
+        pm = pm - surrenders
+
+        # 3. Trésorerie (coupons + remboursements - frais - rachats) et réallocation vers la cible obligataire
+        bond_mv = ladder_market_value(ladder, grid=grid)
+        total = bond_mv + equity + coupon_income + redemption - fee_amount - surrenders
+        buy = alloc_bond * total - bond_mv
+        sell_fraction = np.divide(-buy, bond_mv, out=np.zeros(n_scen), where=(buy < 0) & (bond_mv > 0))
+        rebalancing_gain = sell_fraction * (bond_mv - ladder[2].sum(axis=1))  # hors PB de l'exercice : impute les fonds propres
+        _sell_pro_rata(ladder, sell_fraction)
+        _buy_at_par(ladder, np.maximum(buy, 0.0), y, reinvest_maturity)
+        equity = (1 - alloc_bond) * total
+        bond_mv = ladder_market_value(ladder, grid=grid)
+        book_bonds = ladder[2].sum(axis=1)
+        aum = bond_mv + equity
+
+        # 4. Proxy Solvabilité II : FP économiques (actif en valeur de marché - PM - PPB + VIF) / SCR net de LAC TP
+        own_funds = (aum - pm - ppb) + VIF_RATE * pm
+        scr_net = (equity * EQUITY_SHOCK + pm * LIFE_SHOCK) * (1 - LAC_TP)
+
+        out["yield_asset"][:, t] = (fin_result + rebalancing_gain) / book_start
+        out["market_rate"][:, t] = y
+        out["book_yield"][:, t] = ladder[1].sum(axis=1) / np.maximum(book_bonds, 1e-12)
+        out["rate_served"][:, t] = rate_served
+        out["lapse_rate"][:, t] = lapse_t
+        out["surrenders"][:, t] = surrenders
+        out["ppb"][:, t] = ppb
+        out["own_funds"][:, t] = own_funds
+        out["solvency"][:, t] = np.divide(own_funds, scr_net, out=np.zeros(n_scen), where=scr_net > 0)
+        out["guarantee_cost"][:, t] = guarantee_cost
+        out["unrealised_gains"][:, t] = bond_mv - book_bonds
+        out["realised_gains"][:, t] = realised + rebalancing_gain
+    return out
+
+
+def time_value_of_guarantees(stochastic, central, scenarios, central_scen):
+    """
+    TVOG : valeur actuelle moyenne du coût de la garantie (TMG) sur les scénarios stochastiques,
+    moins sa valeur dans le scénario central. Renvoie aussi l'erreur standard Monte Carlo.
+    """
+    pv = (stochastic["guarantee_cost"] * scenarios["deflators"]).sum(axis=1)
+    pv_central = (central["guarantee_cost"] * central_scen["deflators"]).sum()
+    return {"tvog": pv.mean() - pv_central, "stderr": pv.std(ddof=1) / np.sqrt(len(pv)), "pv_central": pv_central}
@@ -0,0 +1,60 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+import numpy as np
+import pandas as pd
+
+from utils.alm_engine import project_alm
+
+# --- BALAYAGE DES STRATÉGIES ALM (allocation, taux cible, politique de PPB) ---
+
+STRATEGY_PARAMS = ["alloc_bond", "target_rate", "ppb_cap"]
+
+# État partagé des processus de calcul : scénarios et échelle obligataire transmis une seule fois par processus
+_shared = {}
+
+
+def _init_worker(scenarios, base_params):
+    _shared["scenarios"], _shared["base_params"] = scenarios, base_params
+
+
+def _evaluate_strategy(strategy):
+    """
+    Projection complète d'une stratégie sur le jeu de scénarios partagé ; seuls les indicateurs sont renvoyés.
+    """
+    res = project_alm(_shared["scenarios"], **_shared["base_params"], **dict(zip(STRATEGY_PARAMS, strategy)))
+    solvency = res["solvency"][:, -1]
+    return {
+        "Taux Servi Moyen": res["rate_served"].mean(),
+        "Solvabilité P5": np.percentile(solvency, 5),
+        "Solvabilité Médiane": np.median(solvency),
+        "Proba. Taux < TMG + 0.1%": (res["rate_served"] < _shared["base_params"]["tmg"] + 1e-3).mean(),
+    }
+
+
+def sweep_strategies(scenarios, base_params, alloc_bond, target_rate, ppb_cap, max_workers=None):
+    """
+    Évalue la grille alloc_bond x target_rate x ppb_cap sur les mêmes scénarios (trajectoires d'actifs
+    simulées une fois). Les points de grille sont répartis sur un pool de processus ; les scénarios sont
+    copiés une fois par processus via l'initialiseur, pas à chaque tâche.
+    """
+    grid = list(product(alloc_bond, target_rate, ppb_cap))
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers == 1:
+        _init_worker(scenarios, base_params)
+        metrics = list(map(_evaluate_strategy, grid))
+    else:
+        with ProcessPoolExecutor(max_workers, initializer=_init_worker, initargs=(scenarios, base_params)) as pool:
+            metrics = list(pool.map(_evaluate_strategy, grid, chunksize=max(1, len(grid) // (4 * max_workers))))
+    return pd.concat([pd.DataFrame(grid, columns=STRATEGY_PARAMS), pd.DataFrame(metrics)], axis=1)
+
+
+def efficient_frontier(results, x="Solvabilité P5", y="Taux Servi Moyen"):
+    """
+    Stratégies non dominées (maximisation des deux critères) : tri par x décroissant, puis on ne garde
+    que les points améliorant strictement le meilleur y rencontré.
+    """
+    ordered = results.sort_values([x, y], ascending=False)
+    best_y = ordered[y].cummax().shift(fill_value=-np.inf)
+    return ordered[ordered[y] > best_y].sort_values(x)
@@ -0,0 +1,173 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+# --- RÉFÉRENTIELS DU PORTEFEUILLE D'ACTIFS ---
+
+ASSET_CLASSES = ['Obligations Gouv.', 'Obligations Corp.', 'Actions', 'Immobilier', 'Cash']
+ASSET_WEIGHTS = [0.40, 0.30, 0.15, 0.10, 0.05]
+
+RATINGS = ['AAA', 'AA', 'A', 'BBB', 'BB', 'B']
+RATING_WEIGHTS = [0.2, 0.3, 0.3, 0.15, 0.04, 0.01]
+
+COUNTRIES = ["France", "Allemagne", "Italie", "Espagne", "Pays-Bas", "UK", "Monde"]
+
+# Noms fictifs par classe d'actif (Obligations Gouv. : pays de l'émetteur associé)
+ISSUERS_GOV = {"OAT France 2032": "France", "Bund Allemagne 2028": "Allemagne",
+               "BTP Italie 2030": "Italie", "Bonos Espagne 2029": "Espagne"}
+ISSUERS = {
+    'Obligations Gouv.': list(ISSUERS_GOV),
+    'Obligations Corp.': ["TotalEnergies Bond", "LVMH Corp", "BNP Paribas Senior", "AXA Subordinated", "Danone Credit", "Orange SA"],
+    'Actions': ["Air Liquide", "L'Oréal", "Schneider Electric", "Sanofi", "Airbus", "Vinci"],
+    'Immobilier': ["SCPI Bureau Paris", "OPCI Logistique", "Foncière Santé", "Immeuble La Défense"],
+    'Cash': ["Cash Account"],
+}
+
+# Répartition géographique des émetteurs non souverains
+COUNTRY_WEIGHTS_CORP = {"France": 0.6, "Allemagne": 0.2, "Pays-Bas": 0.1, "UK": 0.1}
+COUNTRY_WEIGHTS_OTHER = {"France": 0.5, "Allemagne": 0.3, "Monde": 0.2}
+
+# Schéma cible de l'inventaire : colonne -> (type compact, valeur par défaut si absente ; None = obligatoire)
+PORTFOLIO_SCHEMA = {
+    "Nom de l'Actif": ("category", None),
+    "Classe d'Actif": ("category", None),
+    "Valeur de Marché (M€)": ("float64", None),
+    "Rating": ("category", "N/A"),
+    "Duration": ("float32", 0.0),
+    "Performance YTD (%)": ("float32", 0.0),
+    "Pays": ("category", None),
+}
+
+# Libellés alternatifs acceptés (extractions type S.06.02 / inventaire de placements)
+COLUMN_ALIASES = {
+    "Issuer Name": "Nom de l'Actif", "Emetteur": "Nom de l'Actif", "Émetteur": "Nom de l'Actif",
+    "Asset Class": "Classe d'Actif", "Classe": "Classe d'Actif",
+    "Total Solvency II Amount": "Valeur de Marché (M€)", "Market Value": "Valeur de Marché (M€)",
+    "Valeur de Marché": "Valeur de Marché (M€)",
+    "Credit Rating": "Rating", "Notation": "Rating",
+    "Modified Duration": "Duration", "Sensibilité": "Duration",
+    "Issuer Country": "Pays", "Country": "Pays",
+}
+
+# Taille des blocs lus (lignes pour le Parquet, octets pour le CSV)
+CHUNK_ROWS = 500_000
+CSV_BLOCK_BYTES = 64 << 20
+
+
+def _country_codes(rng, weights, n):
+    return rng.choice([COUNTRIES.index(c) for c in weights], size=n, p=list(weights.values()))
+
+
+def generate_asset_portfolio(n_assets=100, seed=42):
+    """
+    Génère un portefeuille d'actifs fictif (une ligne par position), entièrement par tableaux :
+    tous les tirages sont faits en une fois sur les n_assets lignes, sans boucle Python.
+    Les colonnes texte sont catégorielles et les colonnes secondaires en float32 (1M de lignes ~ 30 Mo).
+    """
+    rng = np.random.default_rng(seed)
+    asset_class = rng.choice(len(ASSET_CLASSES), size=n_assets, p=ASSET_WEIGHTS)
+    is_bond = asset_class <= 1
+
+    # Émetteur : tirage uniforme dans la liste de la classe (décalage dans le référentiel concaténé)
+    issuer_names = [name for cls in ASSET_CLASSES for name in ISSUERS[cls]]
+    n_issuers = np.array([len(ISSUERS[cls]) for cls in ASSET_CLASSES])
+    offsets = np.concatenate([[0], np.cumsum(n_issuers)[:-1]])
+    issuer = offsets[asset_class] + (rng.random(n_assets) * n_issuers[asset_class]).astype(np.int64)
+
+    # Pays : déduit du nom pour les souverains, tiré selon la classe sinon
+    gov_country = np.array([COUNTRIES.index(ISSUERS_GOV.get(name, "France")) for name in issuer_names])
+    country = np.select(
+        [asset_class == 0, asset_class == 1, asset_class == 4],
+        [gov_country[issuer], _country_codes(rng, COUNTRY_WEIGHTS_CORP, n_assets), COUNTRIES.index("France")],
+        _country_codes(rng, COUNTRY_WEIGHTS_OTHER, n_assets),
+    )
+
+    # Rating et duration : obligations uniquement ("N/A" et 0 pour les autres classes)
+    rating = np.where(is_bond, rng.choice(len(RATINGS), size=n_assets, p=RATING_WEIGHTS), len(RATINGS))
+    duration = np.where(is_bond, rng.uniform(2, 15, n_assets), 0.0)
+
+    return pd.DataFrame({
+        "Nom de l'Actif": pd.Categorical.from_codes(issuer, issuer_names),
+        "Classe d'Actif": pd.Categorical.from_codes(asset_class, ASSET_CLASSES),
+        "Valeur de Marché (M€)": rng.lognormal(15, 1, n_assets),
+        "Rating": pd.Categorical.from_codes(rating, RATINGS + ["N/A"]),
+        "Duration": duration.astype(np.float32),
+        "Performance YTD (%)": rng.normal(0.02, 0.05, n_assets).astype(np.float32),
+        "Pays": pd.Categorical.from_codes(country, COUNTRIES),
+    })
+
+
+def _compact_batch(batch):
+    """
+    Renomme les colonnes connues et caste un bloc Arrow vers les types compacts du schéma
+    (dictionnaire pour les libellés, float32 pour les colonnes secondaires).
+    """
+    columns = {}
+    for name, column in zip(batch.schema.names, batch.columns):
+        target = COLUMN_ALIASES.get(name.strip(), name.strip())
+        if target not in PORTFOLIO_SCHEMA or target in columns:
+            continue
+        dtype, _ = PORTFOLIO_SCHEMA[target]
+        if dtype == "category":
+            column = pc.dictionary_encode(column.cast(pa.string()))
+        else:
+            column = column.cast(pa.float32() if dtype == "float32" else pa.float64())
+        columns[target] = column
+    return pa.Table.from_pydict(columns)
+
+
+def _iter_batches(source, chunk_rows=CHUNK_ROWS):
+    name = getattr(source, "name", str(source)).lower()
+    if name.endswith((".parquet", ".pq")):
+        yield from pq.ParquetFile(source).iter_batches(batch_size=chunk_rows)
+    else:
+        # Libellés lus en texte (pas d'inférence bloc par bloc), montants en float64 ; cellule vide = valeur manquante
+        column_types = {c: pa.string() for c, (dtype, _) in PORTFOLIO_SCHEMA.items() if dtype == "category"}
+        column_types |= {alias: column_types[target] for alias, target in COLUMN_ALIASES.items() if target in column_types}
+        yield from pacsv.open_csv(source, read_options=pacsv.ReadOptions(block_size=CSV_BLOCK_BYTES),
+                                  convert_options=pacsv.ConvertOptions(column_types=column_types, strings_can_be_null=True))
+
+
+def load_asset_portfolio(source, chunk_rows=CHUNK_ROWS):
+    """
+    Charge un inventaire de placements (CSV ou Parquet, plusieurs millions de lignes) par blocs avec pyarrow.
+    Chaque bloc est converti en types compacts dès sa lecture (catégories, float32), puis les dictionnaires
+    sont unifiés en une seule table. Le schéma est validé sur chaque bloc (colonnes obligatoires présentes
+    dans chaque bloc CSV ou partie Parquet), puis : colonnes obligatoires toutes renseignées, classes
+    d'actifs connues.
+    """
+    required = [c for c, (_, default) in PORTFOLIO_SCHEMA.items() if default is None]
+    tables = []
+    for i, batch in enumerate(_iter_batches(source, chunk_rows)):
+        table = _compact_batch(batch)
+        missing = [c for c in required if c not in table.column_names]
+        if missing:
+            raise ValueError(f"Colonnes obligatoires absentes de l'inventaire (bloc {i + 1}) : {missing}")
+        tables.append(table)
+    if not tables:
+        raise ValueError("Inventaire vide : aucune ligne lue.")
+
+    table = pa.concat_tables(tables, promote_options="default")
+    # Un libellé manquant ferait disparaître la ligne des agrégations (groupby observed) : rejet explicite
+    nulls = {c: table.column(c).null_count for c in required}
+    if any(nulls.values()):
+        detail = ", ".join(f"{n:,} ligne(s) sans {c}" for c, n in nulls.items() if n)
+        raise ValueError(f"Colonnes obligatoires non renseignées : {detail}")
+    df = table.unify_dictionaries().to_pandas()
+
+    for column, (dtype, default) in PORTFOLIO_SCHEMA.items():
+        if column not in df:
+            df[column] = default
+        df[column] = df[column].astype(dtype)
+
+    unknown = set(df["Classe d'Actif"].cat.categories) - set(ASSET_CLASSES)
+    if unknown:
+        raise ValueError(f"Classes d'actifs inconnues : {sorted(unknown)} (attendues : {ASSET_CLASSES})")
+    if "N/A" not in df["Rating"].cat.categories:
+        df["Rating"] = df["Rating"].cat.add_categories("N/A")
+    df["Rating"] = df["Rating"].fillna("N/A")
+    df[["Duration", "Performance YTD (%)"]] = df[["Duration", "Performance YTD (%)"]].fillna(0.0)
+    return df[list(PORTFOLIO_SCHEMA)]
@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+from scipy.special import erfc, xlogy
+from scipy.stats import binom
+
+# Zones du test de Bâle (feux tricolores) et facteurs additionnels (plus factor) de la zone jaune
+# Le barème des plus factors n'est défini que pour une VaR 99% backtestée sur 250 jours
+ZONES = ['Verte', 'Jaune', 'Rouge']
+PLUS_FACTORS = {5: 0.40, 6: 0.50, 7: 0.65, 8: 0.75, 9: 0.85}
+PLUS_FACTOR_ALPHA, PLUS_FACTOR_WINDOW = 0.99, 250
+
+
+def _as_frame(x):
+    return x.to_frame() if isinstance(x, pd.Series) else x
+
+
+def _rolling_sum(x, window):
+    """
+    Sommes glissantes par sommes cumulées (dates x desks) ; NaN tant que la fenêtre n'est pas pleine.
+    """
+    cs = np.vstack([np.zeros((1, x.shape[1])), np.cumsum(x, axis=0)])
+    out = np.full(x.shape, np.nan)
+    out[window - 1:] = cs[window:] - cs[:-window]
+    return out
+
+
+def _bernoulli_loglik(n_hit, n_miss, p):
+    return xlogy(n_hit, p) + xlogy(n_miss, 1 - p)
+
+
+def _chi2_sf(lr, dof):
+    """
+    Survie du chi-deux en forme fermée pour 1 et 2 degrés de liberté (bien plus rapide que scipy.stats.chi2).
+    """
+    return erfc(np.sqrt(np.maximum(lr, 0) / 2)) if dof == 1 else np.exp(-np.maximum(lr, 0) / 2)
+
+
+def backtest_var(var, pnl, alpha=0.99, window=250, lag=1):
+    """
+    Backtesting de la VaR sur fenêtres glissantes, pour toutes les dates et tous les desks à la fois.
+    var, pnl : Series ou DataFrame (dates x desks), VaR en montant positif. La VaR calculée en t
+    (lag=1) est comparée au P&L de t+1 : exception si P&L < -VaR.
+    Renvoie pour chaque fenêtre : nombre d'exceptions, Kupiec POF, Christoffersen (indépendance),
+    test conditionnel combiné, zone de Bâle et plus factor.
+    Les zones sont lues sur la loi binomiale au niveau alpha choisi ; le plus factor réglementaire
+    n'existe qu'à 99% sur 250 jours et vaut NaN sinon.
+    """
+    var, pnl = _as_frame(var), _as_frame(pnl)
+    var = var.shift(lag).reindex(pnl.index)
+    var.columns = pnl.columns
+    valid = var.notna().to_numpy() & pnl.notna().to_numpy()
+    hits = (pnl.to_numpy() < -var.to_numpy()) & valid
+    p = 1 - alpha
+
+    # Kupiec POF : LR = -2 ln[ L(p) / L(N/T) ]
+    n_obs = _rolling_sum(valid.astype(float), window)
+    n_exc = _rolling_sum(hits.astype(float), window)
+    pi_hat = np.divide(n_exc, n_obs, out=np.zeros_like(n_exc), where=n_obs > 0)
+    lr_pof = -2 * (_bernoulli_loglik(n_exc, n_obs - n_exc, p) - _bernoulli_loglik(n_exc, n_obs - n_exc, pi_hat))
+
+    # Christoffersen : comptage des transitions I_{t-1} -> I_t dans la fenêtre (window - 1 transitions)
+    prev = np.vstack([np.zeros((1, hits.shape[1]), dtype=bool), hits[:-1]])
+    both_valid = np.vstack([np.zeros((1, hits.shape[1]), dtype=bool), valid[:-1]]) & valid
+    n01 = _rolling_sum((~prev & hits & both_valid).astype(float), window - 1)
+    n11 = _rolling_sum((prev & hits & both_valid).astype(float), window - 1)
+    n0 = _rolling_sum((~prev & both_valid).astype(float), window - 1)
+    n1 = _rolling_sum((prev & both_valid).astype(float), window - 1)
+    pi01 = np.divide(n01, n0, out=np.zeros_like(n01), where=n0 > 0)
+    pi11 = np.divide(n11, n1, out=np.zeros_like(n11), where=n1 > 0)
+    pi = np.divide(n01 + n11, n0 + n1, out=np.zeros_like(n01), where=(n0 + n1) > 0)
+    lr_ind = -2 * (_bernoulli_loglik(n01 + n11, n0 + n1 - n01 - n11, pi)
+                   - _bernoulli_loglik(n01, n0 - n01, pi01) - _bernoulli_loglik(n11, n1 - n11, pi11))
+    lr_ind[:window - 1] = np.nan
+
+    # Feux tricolores : probabilité cumulée binomiale du nombre d'exceptions
+    cdf = binom.cdf(n_exc, n_obs, p)
+    zone_idx = np.where(cdf < 0.95, 0, np.where(cdf < 0.9999, 1, 2))
+    zone_idx[np.isnan(n_exc)] = -1
+    plus_table = np.array([PLUS_FACTORS[n] for n in range(5, 10)])
+    yellow_plus = plus_table[np.clip(np.nan_to_num(n_exc).astype(int), 5, 9) - 5]
+    plus = np.where(zone_idx == 2, 1.0, np.where(zone_idx == 1, yellow_plus, 0.0))
+    plus[zone_idx < 0] = np.nan
+    if not (np.isclose(alpha, PLUS_FACTOR_ALPHA) and window == PLUS_FACTOR_WINDOW):
+        plus[:] = np.nan
+
+    frame = lambda values: pd.DataFrame(values, index=pnl.index, columns=pnl.columns)
+    lr_cc = lr_pof + lr_ind
+    return pd.concat({
+        "Exceptions": frame(n_exc),
+        "Kupiec LR": frame(lr_pof),
+        "Kupiec p-value": frame(_chi2_sf(lr_pof, 1)),
+        "Christoffersen LR": frame(lr_ind),
+        "Christoffersen p-value": frame(_chi2_sf(lr_ind, 1)),
+        "Conditionnel p-value": frame(_chi2_sf(lr_cc, 2)),
+        "Zone": pd.DataFrame({c: pd.Categorical.from_codes(zone_idx[:, j], ZONES, ordered=True) for j, c in enumerate(pnl.columns)},
+                             index=pnl.index),
+        "Plus Factor": frame(plus),
+    }, axis=1)
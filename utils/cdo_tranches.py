@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+from numpy.polynomial.hermite_e import hermegauss
+from scipy.stats import norm
+
+# Tranches standard d'un indice CDS (point d'attachement, point de détachement)
+STANDARD_TRANCHES = [(0.00, 0.03), (0.03, 0.07), (0.07, 0.10), (0.10, 0.15), (0.15, 0.30), (0.30, 1.00)]
+
+# Plafond de corrélation : au-delà, la PD conditionnelle devient une marche que la quadrature ne capte plus
+MAX_CORRELATION = 0.95
+
+
+def _factor_quadrature(n_quad):
+    """
+    Noeuds et poids de Gauss-Hermite (forme probabiliste) pour intégrer sur Z ~ N(0, 1).
+    """
+    nodes, weights = hermegauss(n_quad)
+    return nodes, weights / weights.sum()
+
+
+def _tranche_payoff(portfolio_loss, tranches):
+    """
+    Perte de chaque tranche en % de son nominal : min(max(L - A, 0), D - A) / (D - A).
+    """
+    attach = np.array([a for a, _ in tranches])
+    detach = np.array([d for _, d in tranches])
+    return np.clip(portfolio_loss[..., None] - attach, 0, detach - attach) / (detach - attach)
+
+
+def _conditional_pd(pd_names, correlations, nodes):
+    """
+    PD conditionnelles au facteur du copule gaussien, de forme (corrélations x noeuds x noms).
+    """
+    rho = np.clip(np.asarray(correlations, dtype=float), 1e-6, MAX_CORRELATION)[:, None, None]
+    return norm.cdf((norm.ppf(pd_names)[None, None, :] - np.sqrt(rho) * nodes[None, :, None]) / np.sqrt(1 - rho))
+
+
+def tranche_expected_losses(correlations, pd_names, lgd=0.60, notionals=None, tranches=STANDARD_TRANCHES,
+                            method="recursion", n_quad=40):
+    """
+    Pertes attendues des tranches d'un CDO synthétique (copule gaussienne à un facteur),
+    pour toute une grille de corrélations en un seul calcul par lot.
+    - method="recursion" : distribution conditionnelle exacte des pertes du portefeuille par la récursion
+      d'Andersen-Sidenius-Basu (nominaux arrondis à une unité de perte commune) ;
+    - method="lhp" : approximation Large Homogeneous Pool (perte conditionnelle = LGD x PD conditionnelle moyenne).
+    L'intégration sur le facteur se fait par quadrature de Gauss-Hermite.
+    """
+    pd_names = np.atleast_1d(np.asarray(pd_names, dtype=float))
+    notionals = np.ones_like(pd_names) if notionals is None else np.asarray(notionals, dtype=float)
+    lgd = np.broadcast_to(np.asarray(lgd, dtype=float), pd_names.shape)
+    nodes, weights = _factor_quadrature(n_quad)
+    cond_pd = _conditional_pd(pd_names, correlations, nodes)
+    total_notional = notionals.sum()
+
+    if method == "lhp":
+        cond_loss = (cond_pd * lgd * notionals).sum(axis=-1) / total_notional
+        expected = np.einsum("q,cqt->ct", weights, _tranche_payoff(cond_loss, tranches))
+    elif method == "recursion":
+        # Pertes en défaut exprimées en multiples entiers d'une unité commune
+        loss_given_default = lgd * notionals
+        unit = loss_given_default.min()
+        units = np.maximum(np.rint(loss_given_default / unit).astype(int), 1)
+        n_units = units.sum()
+
+        # Récursion : dist[..., k] = P(perte = k unités | Z), vectorisée sur (corrélations x noeuds)
+        dist = np.zeros(cond_pd.shape[:2] + (n_units + 1,))
+        dist[..., 0] = 1.0
+        filled = 0
+        for i, u in enumerate(units):
+            p = cond_pd[..., i:i + 1]
+            shifted = dist[..., :filled + 1] * p
+            dist[..., :filled + 1] *= 1 - p
+            dist[..., u:filled + u + 1] += shifted
+            filled += u
+
+        loss_grid = np.arange(n_units + 1) * unit / total_notional
+        expected = np.einsum("q,cqk,kt->ct", weights, dist, _tranche_payoff(loss_grid, tranches))
+    else:
+        raise ValueError(f"Méthode inconnue : {method} (attendu : 'recursion' ou 'lhp')")
+
+    labels = [f"{a:.0%}-{d:.0%}" for a, d in tranches]
+    return pd.DataFrame(expected, index=pd.Index(np.asarray(correlations), name="Corrélation"), columns=labels)
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+from utils.spread_risk import EXEMPT_CLASSES, UNRATED, credit_quality_step
+
+# --- SOUS-MODULE CONCENTRATION (Règlement Délégué 2015/35, Art. 182 à 187) ---
+
+# Seuil de concentration CT (Art. 185) et facteur g_i (Art. 186) par échelon de qualité de crédit (CQS 0 à 6, puis non noté)
+CONCENTRATION_THRESHOLDS = np.array([0.03, 0.03, 0.03, 0.015, 0.015, 0.015, 0.015, 0.015])
+CONCENTRATION_FACTORS = np.array([0.12, 0.12, 0.21, 0.27, 0.73, 0.73, 0.73, 0.73])
+
+# Immobilier : un seul nom par actif, seuil de 10% et facteur de 12%
+PROPERTY_THRESHOLD, PROPERTY_FACTOR = 0.10, 0.12
+
+# Classes hors sous-module (cash : risque de contrepartie) ; les classes exonérées (g_i = 0) sont celles du spread
+EXCLUDED_CLASSES = ['Cash']
+
+
+def concentration_scr(exposure, issuer, rating, asset_class):
+    """
+    SCR concentration : exposition E_i par émetteur (regroupement par table de hachage, via pd.factorize),
+    échelon de qualité de crédit moyen pondéré arrondi à l'entier supérieur, excès au-delà du seuil
+    XS_i = max(0, E_i - CT_i x Assets_xl), Conc_i = g_i x XS_i et SCR = racine de la somme des Conc_i².
+    Renvoie le SCR et le détail par émetteur (trié par contribution décroissante).
+    """
+    exposure = np.asarray(exposure, dtype=np.float64)
+    asset_class = pd.Series(asset_class).astype("category")
+    in_scope = ~asset_class.isin(EXCLUDED_CLASSES).to_numpy()
+    exposure = np.where(in_scope, exposure, 0.0)
+    assets_xl = exposure.sum()
+
+    codes, issuers = pd.factorize(pd.Series(issuer), sort=False)
+    n_issuers = len(issuers)
+    group_sum = lambda w: np.bincount(codes, weights=w, minlength=n_issuers)
+
+    e_i = group_sum(exposure)
+    cqs = credit_quality_step(rating)
+    rated = cqs < UNRATED
+    rated_exposure = group_sum(exposure * rated)
+    mean_cqs = np.divide(group_sum(exposure * cqs * rated), rated_exposure, out=np.zeros(n_issuers), where=rated_exposure > 0)
+    group_cqs = np.where(rated_exposure > 0, np.ceil(mean_cqs - 1e-9), UNRATED).astype(np.int64)
+
+    # Nature de l'émetteur selon la classe d'actif majoritaire en exposition
+    is_property = group_sum(exposure * (asset_class == 'Immobilier').to_numpy()) > 0.5 * e_i
+    is_exempt = group_sum(exposure * asset_class.isin(EXEMPT_CLASSES).to_numpy()) > 0.5 * e_i
+
+    threshold = np.where(is_property, PROPERTY_THRESHOLD, CONCENTRATION_THRESHOLDS[group_cqs])
+    g_i = np.where(is_exempt, 0.0, np.where(is_property, PROPERTY_FACTOR, CONCENTRATION_FACTORS[group_cqs]))
+    excess = np.maximum(e_i - threshold * assets_xl, 0.0)
+    conc = g_i * excess
+
+    details = pd.DataFrame({
+        "Exposition": e_i,
+        "Part des Actifs (%)": e_i / assets_xl * 100 if assets_xl > 0 else 0.0,
+        "CQS": np.where(group_cqs == UNRATED, "Non noté", group_cqs.astype(str)),
+        "Seuil CT (%)": threshold * 100,
+        "Excès XS": excess,
+        "Facteur g": g_i,
+        "SCR Concentration": conc,
+    }, index=pd.Index(np.asarray(issuers), name="Émetteur"))
+    details = details[e_i > 0].sort_values("SCR Concentration", ascending=False)
+    return {"scr": np.sqrt(np.sum(conc ** 2)), "assets_xl": assets_xl, "by_issuer": details}
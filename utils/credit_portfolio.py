@@ -0,0 +1,207 @@
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+
+from utils.tail_estimators import StreamingTailEstimator
+
+# --- PARAMÈTRES DE MARCHÉ ---
+
+RATINGS = ['AAA', 'AA', 'A', 'BBB', 'BB', 'B', 'CCC']
+
+# Matrice de transition à 1 an (lignes : AAA ... CCC / colonnes : AAA ... CCC, Défaut)
+# Source : matrice historique type CreditMetrics (en %)
+TRANSITION_MATRIX = np.array([
+    [90.81, 8.33, 0.68, 0.06, 0.12, 0.00, 0.00, 0.00],
+    [0.70, 90.65, 7.79, 0.64, 0.06, 0.14, 0.02, 0.00],
+    [0.09, 2.27, 91.05, 5.52, 0.74, 0.26, 0.01, 0.06],
+    [0.02, 0.33, 5.95, 86.93, 5.30, 1.17, 0.12, 0.18],
+    [0.03, 0.14, 0.67, 7.73, 80.53, 8.84, 1.00, 1.06],
+    [0.00, 0.11, 0.24, 0.43, 6.48, 83.46, 4.07, 5.20],
+    [0.22, 0.00, 0.22, 1.30, 2.38, 11.24, 64.86, 19.79],
+]) / 100
+
+# Spreads de crédit par notation (utilisés pour valoriser les migrations)
+RATING_SPREADS = np.array([0.0040, 0.0055, 0.0080, 0.0130, 0.0300, 0.0500, 0.1000])
+
+SECTORS = ['Banques', 'Assurances', 'Industrie', 'Énergie', 'Télécoms', 'Consommation', 'Souverains']
+
+# Plancher réglementaire de PD (3 bp)
+PD_FLOOR = 0.0003
+
+# Budget de cellules (scénarios x émetteurs) traitées par bloc : borne la mémoire (~16 Mo en float32)
+CELL_BUDGET = 4_000_000
+
+
+def generate_credit_portfolio(n_obligors=500, seed=42):
+    """
+    Génère un portefeuille de crédit fictif du Trading Book (une ligne par émetteur).
+    Colonnes : EAD, PD, LGD, Secteur, Rating, Duration.
+    """
+    rng = np.random.default_rng(seed)
+    rating_idx = rng.choice(len(RATINGS), size=n_obligors, p=[0.05, 0.15, 0.30, 0.30, 0.12, 0.06, 0.02])
+    return pd.DataFrame({
+        "EAD": rng.lognormal(15, 1, n_obligors),
+        "PD": np.maximum(TRANSITION_MATRIX[rating_idx, -1], PD_FLOOR),
+        "LGD": rng.choice([0.45, 0.60, 0.75], size=n_obligors, p=[0.5, 0.3, 0.2]),
+        "Secteur": pd.Categorical.from_codes(rng.integers(0, len(SECTORS), n_obligors), SECTORS),
+        "Rating": pd.Categorical.from_codes(rating_idx, RATINGS),
+        "Duration": rng.uniform(1, 10, n_obligors),
+    })
+
+
+def _migration_setup(positions, with_migration=True):
+    """
+    Prépare les seuils de migration, la matrice des pertes et celle des probabilités par état final.
+    États ordonnés par valeur d'actif croissante : 0 = Défaut, 1 = CCC, ..., 7 = AAA.
+    Avec with_migration=False (DRC), seules les pertes de défaut sont retenues.
+    """
+    rating_idx = pd.Categorical(positions["Rating"], categories=RATINGS).codes
+    if (rating_idx < 0).any():
+        raise ValueError(f"Rating inconnu : les notations acceptées sont {RATINGS}")
+
+    ead = positions["EAD"].to_numpy(dtype=float)
+    pd_obl = np.clip(positions["PD"].to_numpy(dtype=float), PD_FLOOR, 1.0)
+    lgd = positions["LGD"].to_numpy(dtype=float)
+    duration = positions["Duration"].to_numpy(dtype=float) if "Duration" in positions else np.full(len(positions), 4.0)
+
+    # Probabilités de migration hors défaut (CCC -> AAA), renormalisées à 1 - PD de l'émetteur
+    migr = TRANSITION_MATRIX[rating_idx, :-1][:, ::-1]
+    migr = migr / migr.sum(axis=1, keepdims=True) * (1 - pd_obl)[:, None]
+    cum_probs = pd_obl[:, None] + np.cumsum(migr, axis=1)[:, :-1]
+    thresholds = norm.ppf(np.column_stack([pd_obl, cum_probs]).clip(0, 1))
+
+    # Pertes par état : défaut = EAD x LGD, migration = EAD x variation de spread x duration
+    new_spreads = RATING_SPREADS[::-1]
+    migr_loss = ead[:, None] * (new_spreads[None, :] - RATING_SPREADS[rating_idx][:, None]) * duration[:, None]
+    loss_by_state = np.column_stack([ead * lgd, migr_loss if with_migration else np.zeros_like(migr_loss)])
+
+    return thresholds.astype(np.float32), loss_by_state, np.column_stack([pd_obl, migr])
+
+
+def importance_shift_for(confidence):
+    """
+    Décalage du facteur systémique Z vers la zone de défaut : point de stress du quantile visé (LHP).
+    """
+    return norm.ppf(1 - confidence)
+
+
+def tail_statistics(losses, weights=None, confidence=0.999):
+    """
+    Quantile, erreur standard et Expected Shortfall d'un vecteur de pertes éventuellement pondéré
+    (rapports de vraisemblance de l'Importance Sampling).
+    """
+    estimator = StreamingTailEstimator(len(losses), (confidence,)).update(losses, weights)
+    return estimator.var(confidence), estimator.stderr(confidence), estimator.es(confidence)
+
+
+def _iter_loss_chunks(positions, n_sim, rho, sector_corr, chunk_size, seed, shift=0.0, with_migration=True):
+    """
+    Génère les pertes (scénarios x émetteurs) bloc par bloc, au format creux (ligne, colonne, perte) :
+    seules les cellules ayant quitté leur notation initiale portent une perte non nulle.
+    Chaque bloc a sa propre graine : une seconde passe reproduit exactement les mêmes tirages.
+    Si shift != 0, Z est tiré sous N(shift, 1) et chaque scénario porte son rapport de vraisemblance.
+    """
+    thresholds, loss_by_state, _ = _migration_setup(positions, with_migration)
+    n_obl, n_states = loss_by_state.shape
+    sector_idx = pd.Categorical(positions["Secteur"]).codes
+    n_sectors = sector_idx.max() + 1
+
+    # Bande de maintien de la notation initiale : ]seuil(état - 1), seuil(état)]
+    stay_state = n_states - 1 - pd.Categorical(positions["Rating"], categories=RATINGS).codes
+    bounds = np.column_stack([np.full(n_obl, -np.inf, dtype=np.float32), thresholds, np.full(n_obl, np.inf, dtype=np.float32)])
+    stay_low = bounds[np.arange(n_obl), stay_state]
+    stay_high = bounds[np.arange(n_obl), stay_state + 1]
+    thresholds_by_level = np.ascontiguousarray(thresholds.T)
+
+    if chunk_size is None:
+        chunk_size = max(1, CELL_BUDGET // n_obl)
+    n_chunks = -(-n_sim // chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+
+    for c in range(n_chunks):
+        start = c * chunk_size
+        size = min(chunk_size, n_sim - start)
+        rng = np.random.default_rng(seeds[c])
+
+        # Facteur systémique global Z, facteurs sectoriels et chocs idiosyncratiques
+        Z = rng.standard_normal(size) + shift
+        weights = np.exp(-shift * Z + 0.5 * shift ** 2)
+        sector_factors = np.sqrt(sector_corr) * Z[:, None] + np.sqrt(1 - sector_corr) * rng.standard_normal((size, n_sectors))
+        X = rng.standard_normal((size, n_obl), dtype=np.float32)
+        X *= np.sqrt(1 - rho)
+        X += (np.sqrt(rho) * sector_factors).astype(np.float32)[:, sector_idx]
+
+        # Cellules ayant migré ou fait défaut, puis état final = nombre de seuils franchis (0 = défaut)
+        rows, cols = np.nonzero((X <= stay_low) | (X > stay_high))
+        x_moved = X[rows, cols]
+        state = np.zeros(len(rows), dtype=np.int64)
+        for level in thresholds_by_level:
+            state += x_moved > level[cols]
+
+        yield start, size, weights, rows, cols, loss_by_state[cols, state]
+
+
+def simulate_credit_losses(positions, n_sim=100_000, rho=0.20, sector_corr=0.50, confidence=0.999,
+                           chunk_size=None, seed=42, contributions=True, importance_shift=0.0, keep_losses=True,
+                           with_migration=True):
+    """
+    Moteur IRC Monte Carlo multi-émetteurs (défaut + migration, horizon 1 an).
+    Modèle de Merton à facteurs : X_i = sqrt(rho) * Y_secteur + sqrt(1 - rho) * eps_i,
+    Y_secteur = sqrt(sector_corr) * Z + sqrt(1 - sector_corr) * eta_secteur.
+    L'axe des scénarios est traité par blocs de taille fixe ; avec keep_losses=False, les pertes
+    passent par un StreamingTailEstimator et la mémoire ne dépend plus de n_sim.
+    importance_shift < 0 active l'Importance Sampling (voir importance_shift_for) : il ne sert qu'au
+    quantile, à l'ES et à leur erreur standard. La perte attendue et ses contributions sont calculées
+    analytiquement (somme sur les états des probabilités x pertes), sans bruit de simulation.
+    with_migration=False restreint le moteur au risque de défaut (DRC FRTB).
+    """
+    n_obl = len(positions)
+    estimator = StreamingTailEstimator(n_sim, (confidence,))
+    losses = np.empty(n_sim) if keep_losses else None
+    weights = np.empty(n_sim) if keep_losses else None
+    chunks = lambda: _iter_loss_chunks(positions, n_sim, rho, sector_corr, chunk_size, seed, importance_shift, with_migration)
+    for start, size, w, rows, cols, cell_losses in chunks():
+        chunk_losses = np.bincount(rows, cell_losses, minlength=size)
+        estimator.update(chunk_losses, w)
+        if keep_losses:
+            losses[start:start + size] = chunk_losses
+            weights[start:start + size] = w
+
+    _, loss_by_state, state_probs = _migration_setup(positions, with_migration)
+    el_contrib = (state_probs * loss_by_state).sum(axis=1)
+    irc = estimator.var(confidence)
+    result = {
+        "losses": losses,
+        "weights": weights,
+        "irc": irc,
+        "irc_stderr": estimator.stderr(confidence),
+        "expected_loss": el_contrib.sum(),
+        "expected_shortfall": estimator.es(confidence),
+    }
+
+    if contributions:
+        # Seconde passe (mêmes graines) : allocation d'Euler de l'IRC et de l'ES aux émetteurs
+        # VaR_i = E[L_i | L = IRC] (bande de scénarios autour du quantile), ES_i = E[L_i | L >= IRC]
+        # Pertes discrètes : les scénarios à égalité avec l'IRC ne comptent que pour la masse retenue par l'ES
+        band_low, band_high = estimator.var_band(confidence)
+        _, boundary_mass, tail_mass = estimator.es_boundary(confidence)
+        var_contrib, es_above, es_tied = np.zeros(n_obl), np.zeros(n_obl), np.zeros(n_obl)
+        band_weight, tied_weight = 0.0, 0.0
+        for start, size, w, rows, cols, cell_losses in chunks():
+            chunk_losses = np.bincount(rows, cell_losses, minlength=size)
+            weighted_cells = w[rows] * cell_losses
+            in_band = (chunk_losses >= band_low) & (chunk_losses <= band_high)
+            above, tied = chunk_losses > irc, chunk_losses == irc
+            band_weight += w[in_band].sum()
+            tied_weight += w[tied].sum()
+            var_contrib += np.bincount(cols[in_band[rows]], weighted_cells[in_band[rows]], minlength=n_obl)
+            es_above += np.bincount(cols[above[rows]], weighted_cells[above[rows]], minlength=n_obl)
+            es_tied += np.bincount(cols[tied[rows]], weighted_cells[tied[rows]], minlength=n_obl)
+        var_contrib /= band_weight
+        result["contributions"] = pd.DataFrame({
+            "Contribution EL": el_contrib,
+            "Contribution IRC": var_contrib * irc / var_contrib.sum(),
+            "Contribution ES": (es_above + boundary_mass / tied_weight * es_tied) / tail_mass,
+        }, index=positions.index)
+
+    return result
@@ -0,0 +1,31 @@
+import numpy as np
+
+# --- RACHATS DYNAMIQUES (Orientations Nationales Complémentaires ACPR, 2013) ---
+
+# Rachat conjoncturel RC(R) en fonction de l'écart R = taux servi - taux attendu (concurrence) :
+# RC_max si R < α, linéaire jusqu'à 0 en β, nul entre β et γ, linéaire jusqu'à RC_min en δ, RC_min au-delà.
+ONC_LAWS = {
+    "ONC Plafond Min": {"alpha": -0.06, "beta": -0.02, "gamma": 0.01, "delta": 0.02, "rc_min": -0.06, "rc_max": 0.20},
+    "ONC Plafond Max": {"alpha": -0.04, "beta": 0.00, "gamma": 0.01, "delta": 0.04, "rc_min": -0.04, "rc_max": 0.40},
+}
+
+
+def cyclical_lapse(rate_served, competitor_rate, law="ONC Plafond Max"):
+    """
+    Taux de rachat conjoncturel (ou dynamique). La fonction ONC étant linéaire par morceaux et constante
+    aux extrémités, elle se réduit à une seule interpolation np.interp sur les écarts, quelle que soit
+    leur forme (scénarios, model points, années : tableaux compatibles par broadcasting).
+    """
+    p = ONC_LAWS[law] if isinstance(law, str) else law
+    gap = np.asarray(rate_served, dtype=np.float64) - competitor_rate
+    return np.interp(gap, [p["alpha"], p["beta"], p["gamma"], p["delta"]], [p["rc_max"], 0.0, 0.0, p["rc_min"]])
+
+
+def lapse_rate(structural, rate_served=None, competitor_rate=None, law=None):
+    """
+    Taux de rachat total = rachat structurel + rachat conjoncturel, borné à [0, 1].
+    law=None : rachats statiques (structurel seul).
+    """
+    if law is None:
+        return np.broadcast_to(np.clip(structural, 0.0, 1.0), np.shape(rate_served))
+    return np.clip(structural + cyclical_lapse(rate_served, competitor_rate, law), 0.0, 1.0)
@@ -0,0 +1,186 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.optimize import minimize
+from scipy.stats import norm
+from scipy.signal import lfilter
+
+# Budget de cellules (dates x desks x fenêtre) traitées par bloc lors du calcul glissant
+CELL_BUDGET = 5_000_000
+
+
+def load_pnl_history(source, date_col=None, exposures=None):
+    """
+    Charge un historique de P&L (ou de rendements de facteurs de risque) depuis un CSV ou un Parquet.
+    Si exposures (facteur -> montant) est fourni, les colonnes sont des rendements de facteurs
+    et le P&L du portefeuille courant est reconstruit : P&L_t = somme_j exposition_j x r_t,j.
+    """
+    name = getattr(source, "name", str(source)).lower()
+    df = pd.read_parquet(source) if name.endswith((".parquet", ".pq")) else pd.read_csv(source)
+
+    date_col = date_col or df.columns[0]
+    df[date_col] = pd.to_datetime(df[date_col])
+    df = df.set_index(date_col).sort_index()
+
+    if exposures is not None:
+        exposures = pd.Series(exposures, dtype=float)
+        missing = exposures.index.difference(df.columns)
+        if len(missing):
+            raise ValueError(f"Facteurs de risque absents de l'historique : {list(missing)}")
+        return (df[exposures.index] * exposures).sum(axis=1).rename("P&L")
+    return df.select_dtypes("number")
+
+
+def simulate_pnl_history(n_days=15 * 252, start="2010-01-04", vol=10_000.0, seed=42):
+    """
+    Génère un historique de P&L journalier fictif (GARCH(1,1) à innovations de Student)
+    présentant des regroupements de volatilité (périodes calmes / périodes de stress).
+    """
+    rng = np.random.default_rng(seed)
+    omega, a, b = 0.02, 0.08, 0.90
+    z = rng.standard_t(5, n_days) / np.sqrt(5 / 3)
+    h = np.empty(n_days)
+    pnl = np.empty(n_days)
+    h_prev, r_prev = 1.0, 0.0
+    for t in range(n_days):
+        h[t] = omega + a * r_prev ** 2 + b * h_prev
+        pnl[t] = np.sqrt(h[t]) * z[t]
+        h_prev, r_prev = h[t], pnl[t]
+    dates = pd.bdate_range(start, periods=n_days)
+    return pd.Series(pnl * vol, index=dates, name="P&L")
+
+
+def _as_frame(pnl):
+    return pnl.to_frame() if isinstance(pnl, pd.Series) else pnl
+
+
+def _rolling_tail(losses, window, alpha):
+    """
+    VaR et ES glissantes sur une matrice de pertes (dates x desks) par statistiques d'ordre :
+    np.partition sélectionne les k plus grandes pertes de chaque fenêtre en O(fenêtre), sans tri complet.
+    """
+    n, d = losses.shape
+    k = int(np.ceil(window * (1 - alpha)))
+    var = np.full((n, d), np.nan)
+    es = np.full((n, d), np.nan)
+    if n < window:
+        return var, es
+
+    # Vue (dates, desks, fenêtre) sans copie ; traitement par blocs de dates pour borner la mémoire
+    windows = sliding_window_view(losses, window, axis=0)
+    block = max(1, CELL_BUDGET // (window * d))
+    for start in range(0, len(windows), block):
+        top_k = np.partition(windows[start:start + block], window - k, axis=-1)[..., window - k:]
+        var[window - 1 + start:window - 1 + start + len(top_k)] = top_k.min(axis=-1)
+        es[window - 1 + start:window - 1 + start + len(top_k)] = top_k.mean(axis=-1)
+    return var, es
+
+
+def rolling_historical_var(pnl, window=250, alpha=0.99):
+    """
+    VaR et ES historiques glissantes pour chaque date (fenêtre se terminant à la date incluse).
+    pnl : Series (un portefeuille) ou DataFrame (un desk par colonne). Pertes exprimées en positif.
+    """
+    df = _as_frame(pnl)
+    var, es = _rolling_tail(-df.to_numpy(dtype=float), window, alpha)
+    return pd.concat({"VaR": pd.DataFrame(var, index=df.index, columns=df.columns),
+                      "ES": pd.DataFrame(es, index=df.index, columns=df.columns)}, axis=1)
+
+
+def _garch_variance(returns, omega, a, b, var0=None):
+    """
+    Variance conditionnelle GARCH(1,1) h_t = omega + a r_{t-1}^2 + b h_{t-1}, vectorisée par lfilter.
+    Renvoie aussi la prévision à un jour h_{t+1|t} pour chaque date.
+    var0 : variance d'initialisation (par défaut la variance empirique de returns).
+    """
+    var0 = np.var(returns) if var0 is None else var0
+    innov = omega + a * np.concatenate([[var0], returns[:-1] ** 2])
+    h = lfilter([1.0], [1.0, -b], innov, zi=[b * var0])[0]
+    return h, omega + a * returns ** 2 + b * h
+
+
+def fit_garch(returns):
+    """
+    Estimation GARCH(1,1) par maximum de vraisemblance gaussien avec ciblage de variance
+    (omega = variance x (1 - a - b)) : seuls a et b sont optimisés.
+    """
+    returns = np.asarray(returns, dtype=float)
+    var0 = np.var(returns)
+
+    def neg_loglik(params):
+        a, b = params
+        if a + b >= 0.999:
+            return 1e10
+        h, _ = _garch_variance(returns, var0 * (1 - a - b), a, b)
+        return np.sum(np.log(h) + returns ** 2 / h)
+
+    res = minimize(neg_loglik, x0=[0.05, 0.90], bounds=[(1e-6, 0.5), (0.0, 0.999)], method="L-BFGS-B")
+    a, b = res.x
+    return {"omega": var0 * (1 - a - b), "alpha": a, "beta": b}
+
+
+def rolling_filtered_historical_var(pnl, window=250, alpha=0.99, refit_every=250):
+    """
+    Filtered Historical Simulation : le P&L est dévolatilisé par un GARCH(1,1), les statistiques
+    d'ordre glissantes portent sur les résidus standardisés, puis sont remises à l'échelle de la
+    volatilité prévue pour le lendemain : VaR_t = sigma_{t+1|t} x VaR(résidus sur la fenêtre).
+    Sans biais d'anticipation : le GARCH est réestimé tous les refit_every jours sur le seul historique
+    passé (fenêtre croissante d'au moins window jours), et chaque date n'utilise que des paramètres
+    estimés avant elle. La première VaR est donc produite après 2 x window - 1 jours.
+    """
+    df = _as_frame(pnl)
+    values = df.to_numpy(dtype=float)
+    n = len(values)
+    resid = np.full_like(values, np.nan)
+    sigma_next = np.full_like(values, np.nan)
+    for j in range(values.shape[1]):
+        for fit_end in range(window, n, refit_every):
+            params = fit_garch(values[:fit_end, j])
+            var0 = params["omega"] / (1 - params["alpha"] - params["beta"])
+            segment = slice(fit_end, min(fit_end + refit_every, n))
+            h, h_next = _garch_variance(values[:segment.stop, j], params["omega"], params["alpha"], params["beta"], var0)
+            resid[segment, j] = values[segment, j] / np.sqrt(h[segment])
+            sigma_next[segment, j] = np.sqrt(h_next[segment])
+
+    var, es = np.full_like(values, np.nan), np.full_like(values, np.nan)
+    var[window:], es[window:] = _rolling_tail(-resid[window:], window, alpha)
+    return pd.concat({"VaR": pd.DataFrame(var * sigma_next, index=df.index, columns=df.columns),
+                      "ES": pd.DataFrame(es * sigma_next, index=df.index, columns=df.columns)}, axis=1)
+
+
+def find_stressed_period(pnl, window=250, alpha=0.99):
+    """
+    Recherche de la période de stress pour la calibration de la SVaR : parcourt toutes les fenêtres
+    de 12 mois de l'historique et retient celle qui maximise la VaR historique du portefeuille courant.
+    Un seul balayage vectorisé : statistiques d'ordre glissantes pour la VaR historique (critère retenu),
+    sommes cumulées pour la volatilité et la VaR paramétrique de chaque fenêtre (comparaison).
+    """
+    pnl = _as_frame(pnl).iloc[:, 0]
+    values = pnl.to_numpy(dtype=float)
+    if len(values) < window:
+        raise ValueError(f"Historique trop court : {len(values)} dates pour une fenêtre de {window} jours")
+
+    # Moyenne et écart-type glissants en O(n) par sommes cumulées
+    cs = np.concatenate([[0.0], np.cumsum(values)])
+    cs2 = np.concatenate([[0.0], np.cumsum(values ** 2)])
+    mean = (cs[window:] - cs[:-window]) / window
+    std = np.sqrt(np.maximum((cs2[window:] - cs2[:-window]) / window - mean ** 2, 0.0) * window / (window - 1))
+
+    var_hist, es_hist = _rolling_tail(-values[:, None], window, alpha)
+    scan = pd.DataFrame({
+        "Début": pnl.index[:len(values) - window + 1],
+        "VaR Historique": var_hist[window - 1:, 0],
+        "ES Historique": es_hist[window - 1:, 0],
+        "VaR Paramétrique": norm.ppf(alpha) * std - mean,
+        "Volatilité": std,
+    }, index=pnl.index[window - 1:])
+
+    end = scan["VaR Historique"].idxmax()
+    return {
+        "start": scan.at[end, "Début"],
+        "end": end,
+        "svar": scan.at[end, "VaR Historique"],
+        "ses": scan.at[end, "ES Historique"],
+        "stressed_vol": scan.at[end, "Volatilité"],
+        "scan": scan,
+    }
@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# --- SOUS-MODULE TAUX D'INTÉRÊT (Règlement Délégué 2015/35, Art. 166-167) ---
+
+# Grille de projection annuelle des flux (0 à 60 ans)
+TIME_GRID = np.arange(0, 61, dtype=np.float64)
+
+# Chocs relatifs à la hausse / à la baisse par maturité (1 à 20 ans, puis 90 ans ; interpolation linéaire)
+SHOCK_MATURITIES = np.array([1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16, 17, 18, 19, 20, 90], dtype=np.float64)
+SHOCK_UP = np.array([0.70, 0.70, 0.64, 0.59, 0.55, 0.52, 0.49, 0.47, 0.44, 0.42, 0.39,
+                     0.37, 0.35, 0.34, 0.33, 0.31, 0.30, 0.29, 0.27, 0.26, 0.20])
+SHOCK_DOWN = np.array([0.75, 0.65, 0.56, 0.50, 0.46, 0.42, 0.39, 0.36, 0.33, 0.31, 0.30,
+                       0.29, 0.28, 0.28, 0.27, 0.28, 0.28, 0.28, 0.29, 0.29, 0.20])
+
+# Hausse absolue minimale de 1 point (Art. 166(2))
+MIN_UP_SHIFT = 0.01
+
+SCENARIOS = ["Base", "Up", "Down"]
+
+
+def nelson_siegel_rates(grid=TIME_GRID, b0=0.03, b1=0.01, b2=0.0, tau=2.0):
+    """
+    Courbe zéro-coupon Nelson-Siegel sur la grille (limite b0 + b1 en t = 0).
+    """
+    x = np.maximum(grid, 1e-8) / tau
+    term1 = (1 - np.exp(-x)) / x
+    return b0 + b1 * term1 + b2 * (term1 - np.exp(-x))
+
+
+def shocked_curves(rates, grid=TIME_GRID):
+    """
+    Courbes Base / Up / Down (3 x grille) : chocs relatifs Art. 166-167, hausse d'au moins 1 point,
+    pas de choc à la baisse sur les taux négatifs.
+    """
+    s_up = np.interp(grid, SHOCK_MATURITIES, SHOCK_UP)
+    s_down = np.interp(grid, SHOCK_MATURITIES, SHOCK_DOWN)
+    up = rates + np.maximum(rates * s_up, MIN_UP_SHIFT)
+    down = np.where(rates > 0, rates * (1 - s_down), rates)
+    return np.vstack([rates, up, down])
+
+
+def discount_factors(curves, grid=TIME_GRID):
+    """
+    Facteurs d'actualisation (grille x scénarios), capitalisation annuelle.
+    """
+    return ((1 + curves) ** -grid).T
+
+
+def _par_bond_duration(maturity, y):
+    """
+    Duration de Macaulay d'une obligation au pair à coupon annuel y : (1 + y) / y x (1 - (1 + y)^-m).
+    """
+    y = np.where(np.abs(y) < 1e-9, 1e-9, y)
+    return (1 + y) / y * -np.expm1(-maturity * np.log1p(y))
+
+
+def cash_flow_matrix(market_value, duration, rates, grid=TIME_GRID):
+    """
+    Matrice creuse des flux (positions x grille), construite une seule fois. Chaque ligne est une obligation
+    in fine au pair (coupon annuel = taux zéro-coupon à sa duration) : coupons de 1 à m ans et remboursement
+    en m. La maturité déduite de la duration tombant entre deux années, la ligne est répartie entre les
+    maturités entières encadrantes au prorata qui conserve la duration ; les nominaux sont ajustés pour que
+    la valeur actuelle sur la courbe de base égale la valeur de marché.
+    """
+    market_value = np.asarray(market_value, dtype=np.float64)
+    y = np.interp(np.asarray(duration, dtype=np.float64), grid, rates)
+    max_duration = _par_bond_duration(grid[-1], y)
+    t = np.clip(np.asarray(duration, dtype=np.float64), 1.0, max_duration)
+
+    # Maturité du titre au pair de même duration, encadrée par deux maturités entières
+    maturity = -np.log1p(-t * y / (1 + y)) / np.log1p(y)
+    lo = np.clip(np.floor(maturity), 1, grid[-1] - 1).astype(np.int64)
+    d_lo, d_hi = _par_bond_duration(lo, y), _par_bond_duration(lo + 1, y)
+    theta = np.clip((t - d_lo) / (d_hi - d_lo), 0.0, 1.0)
+
+    # Stockage CSR direct : la ligne i porte un flux à chaque date 1 ... lo_i + 1
+    n_flows = lo + 1
+    indptr = np.concatenate([[0], np.cumsum(n_flows)])
+    rows = np.repeat(np.arange(len(t)), n_flows)
+    dates = np.arange(indptr[-1]) - indptr[rows] + 1
+    flows = y[rows] * np.where(dates <= lo[rows], 1.0, theta[rows])
+    flows += np.where(dates == lo[rows], 1 - theta[rows], 0.0) + np.where(dates == n_flows[rows], theta[rows], 0.0)
+
+    pv = np.bincount(rows, flows * (1 + rates[dates]) ** -grid[dates], minlength=len(t))
+    flows *= (market_value / pv)[rows]
+    return sparse.csr_matrix((flows, dates, indptr), shape=(len(t), len(grid)))
+
+
+def single_flow_matrix(market_value, duration, rates, grid=TIME_GRID):
+    """
+    Matrice creuse des flux (positions x grille) d'engagements connus par leur seule duration : un flux unique
+    à la duration, réparti sur les deux dates de grille encadrantes au prorata de la valeur actuelle
+    (valeur et duration en base conservées exactement).
+    """
+    market_value = np.asarray(market_value, dtype=np.float64)
+    t = np.clip(np.asarray(duration, dtype=np.float64), grid[0], grid[-1])
+    lo = np.minimum(np.searchsorted(grid, t, side="right") - 1, len(grid) - 2)
+    theta = (t - grid[lo]) / (grid[lo + 1] - grid[lo])
+    df_base = (1 + rates) ** -grid
+
+    rows = np.repeat(np.arange(len(t)), 2)
+    cols = np.column_stack([lo, lo + 1]).ravel()
+    flows = np.column_stack([market_value * (1 - theta) / df_base[lo], market_value * theta / df_base[lo + 1]]).ravel()
+    return sparse.csr_matrix((flows, (rows, cols)), shape=(len(t), len(grid)))
+
+
+def interest_rate_scr(asset_flows, liability_flows, curves, grid=TIME_GRID):
+    """
+    Valeurs actuelles Base / Up / Down de l'actif, du passif et de la NAV par un seul produit matriciel
+    (flux agrégés x facteurs d'actualisation des trois scénarios), puis SCR = max(ΔNAV_up, ΔNAV_down, 0).
+    Les flux peuvent être une matrice (positions x grille) ou déjà sommés par date.
+    """
+    flows = np.vstack([np.asarray(f.sum(axis=0)).ravel() if sparse.issparse(f) else np.atleast_2d(f).sum(axis=0)
+                       for f in (asset_flows, liability_flows)])
+    pv = pd.DataFrame(flows @ discount_factors(curves, grid), index=["Actif", "Passif"], columns=SCENARIOS)
+    pv.loc["NAV"] = pv.loc["Actif"] - pv.loc["Passif"]
+    loss = pv.loc["NAV", "Base"] - pv.loc["NAV", ["Up", "Down"]]
+    return {"pv": pv, "scr": max(loss.max(), 0.0), "scenario": loss.idxmax()}
@@ -0,0 +1,104 @@
+from itertools import product
+
+import numpy as np
+
+from utils.alm_engine import project_alm, simulate_economic_scenarios
+
+# --- FONCTION PROXY (LSMC) DES FONDS PROPRES À 1 AN ---
+
+RISK_DRIVERS = ["Taux 1 an", "Rendement Actions 1 an"]
+
+
+def sample_risk_drivers(n_outer, r0=0.025, r_mean=None, kappa=0.15, rate_vol=0.01, equity_return=0.06,
+                        equity_vol=0.18, widen=1.0, seed=42):
+    """
+    Scénarios externes (monde réel) des facteurs de risque à horizon 1 an : taux court en fin d'année
+    (Vasicek exact) et rendement actions de l'année. widen > 1 élargit les chocs (scénarios de calibrage
+    couvrant les queues de distribution, pratique usuelle des proxys LSMC).
+    """
+    rng = np.random.default_rng(seed)
+    r_mean = r0 if r_mean is None else r_mean
+    decay = np.exp(-kappa)
+    step_vol = rate_vol * np.sqrt((1 - decay ** 2) / (2 * kappa))
+    z = widen * rng.standard_normal((2, n_outer))
+    rate = r_mean + (r0 - r_mean) * decay + step_vol * z[0]
+    equity = np.expm1(np.log1p(equity_return) - 0.5 * equity_vol ** 2 + equity_vol * z[1])
+    return np.column_stack([rate, equity])
+
+
+def nested_scenarios(drivers, n_inner, horizon, r0=0.025, r_mean=None, kappa=0.15, rate_vol=0.01, equity_vol=0.18, seed=43):
+    """
+    Trajectoires complètes (n_outer x n_inner lignes) : année 1 fixée par le scénario externe, puis n_inner
+    chemins internes risque neutre repartant du taux atteint. Réutilise le GSE avec un taux initial par ligne.
+    """
+    r_mean = r0 if r_mean is None else r_mean
+    rate, equity = np.repeat(drivers[:, 0], n_inner), np.repeat(drivers[:, 1], n_inner)
+    inner = simulate_economic_scenarios(len(rate), horizon - 1, rate, r_mean, kappa, rate_vol, None, equity_vol, seed)
+    rates = np.column_stack([np.full(len(rate), r0), inner["rates"]])
+    return {"rates": rates, "equity": np.column_stack([equity, inner["equity"]]),
+            "deflators": np.cumprod(1 / (1 + rates), axis=1)}
+
+
+def own_funds_at_one_year(drivers, n_inner, horizon, alm_params, gse_params, seed=43):
+    """
+    Fonds propres en t = 1 par scénario externe : valeur actuelle (déflateurs risque neutre de 1 à T) des fonds
+    propres de fin de projection, moyennée sur les chemins internes. Avec peu de chemins internes l'estimation
+    est bruitée : c'est la régression qui filtre le bruit (principe du LSMC).
+    """
+    scenarios = nested_scenarios(drivers, n_inner, horizon, seed=seed, **gse_params)
+    res = project_alm(scenarios, **alm_params)
+    deflator = scenarios["deflators"][:, -1] / scenarios["deflators"][:, 0]
+    return (res["own_funds"][:, -1] * deflator).reshape(len(drivers), n_inner).mean(axis=1)
+
+
+def polynomial_powers(n_drivers, degree):
+    """
+    Exposants de tous les monômes de degré total <= degree (constante comprise).
+    """
+    return np.array(sorted((p for p in product(range(degree + 1), repeat=n_drivers) if sum(p) <= degree), key=sum))
+
+
+def _design(proxy, drivers):
+    """
+    Matrice des monômes (scénarios x termes) : puissances entières de chaque facteur calculées une fois
+    par produits cumulés, puis combinées par indexation.
+    """
+    x = (drivers - proxy["center"]) / proxy["scale"]
+    degree = proxy["powers"].max()
+    design = np.ones((len(x), len(proxy["powers"])))
+    for d in range(x.shape[1]):
+        x_pow = np.cumprod(np.column_stack([np.ones(len(x))] + [x[:, d]] * degree), axis=1)
+        design *= x_pow[:, proxy["powers"][:, d]]
+    return design
+
+
+def fit_proxy(drivers, own_funds, degree=3, ridge=1e-3):
+    """
+    Régression polynomiale régularisée (ridge, constante non pénalisée) des fonds propres sur les facteurs
+    de risque centrés-réduits. Renvoie les coefficients, les exposants et le R² de calibrage.
+    """
+    proxy = {"center": drivers.mean(axis=0), "scale": drivers.std(axis=0), "powers": polynomial_powers(drivers.shape[1], degree)}
+    X = _design(proxy, drivers)
+    penalty = ridge * len(X) * np.eye(X.shape[1])
+    penalty[0, 0] = 0.0
+    proxy["coef"] = np.linalg.solve(X.T @ X + penalty, X.T @ own_funds)
+    fitted = X @ proxy["coef"]
+    proxy["r2"] = 1 - np.sum((own_funds - fitted) ** 2) / np.sum((own_funds - own_funds.mean()) ** 2)
+    return proxy
+
+
+def evaluate_proxy(proxy, drivers):
+    """
+    Fonds propres proxy : un produit matriciel (scénarios x monômes) @ coefficients.
+    """
+    return _design(proxy, drivers) @ proxy["coef"]
+
+
+def proxy_scr(proxy, drivers, r0=0.025, alpha=0.995):
+    """
+    SCR à 1 an (VaR 99.5%) sur la distribution proxy des fonds propres : écart entre les fonds propres
+    moyens et le quantile 0.5%, actualisé d'un an au taux court.
+    """
+    own_funds = evaluate_proxy(proxy, drivers)
+    quantile = np.quantile(own_funds, 1 - alpha)
+    return {"scr": (own_funds.mean() - quantile) / (1 + r0), "quantile": quantile, "own_funds": own_funds}
@@ -0,0 +1,194 @@
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.linalg import solve_banded
+from scipy.special import ndtr
+
+from utils.option_pricing import bs_price_greeks, option_sign
+
+# --- MÉTHODES NUMÉRIQUES : EDP (CRANK-NICOLSON) ET MONTE CARLO ---
+
+# Pas d'amortissement de Rannacher (Euler implicite) pour lisser le point anguleux du payoff
+RANNACHER_STEPS = 2
+
+# Correction de Broadie-Glasserman (barrière observée discrètement)
+BARRIER_SHIFT = 0.5826
+
+
+def crank_nicolson(S, K, T, r, sigma, opt_type="Put", american=False, n_space=200, n_time=200, s_max_mult=4.0):
+    """
+    EDP de Black-Scholes sur une grille uniforme en spot [0, S_max], schéma de Crank-Nicolson (θ = 1/2) avec
+    démarrage de Rannacher. Chaque pas résout un système tridiagonal (stockage en bandes, solve_banded).
+    Exercice américain par projection sur le payoff après chaque pas. Renvoie prix, Delta et Gamma en S.
+    """
+    sign = option_sign(opt_type)
+    s_max = s_max_mult * max(S, K)
+    grid = np.linspace(0.0, s_max, n_space + 1)
+    dt = T / n_time
+    payoff = np.maximum(sign * (grid - K), 0.0)
+    values = payoff.copy()
+
+    # Opérateur L V_i = a_i V_{i-1} + b_i V_i + c_i V_{i+1} sur les noeuds intérieurs (S_i = i dS)
+    i = np.arange(1, n_space)
+    a = 0.5 * (sigma ** 2 * i ** 2 - r * i)
+    b = -(sigma ** 2 * i ** 2 + r)
+    c = 0.5 * (sigma ** 2 * i ** 2 + r * i)
+
+    def banded(theta):
+        ab = np.zeros((3, n_space - 1))
+        ab[0, 1:], ab[1], ab[2, :-1] = -theta * dt * c[:-1], 1 - theta * dt * b, -theta * dt * a[1:]
+        return ab
+
+    systems = {theta: banded(theta) for theta in (1.0, 0.5)}
+    for step in range(n_time):
+        theta = 1.0 if step < RANNACHER_STEPS else 0.5
+        tau = (step + 1) * dt
+        # Conditions aux bords : valeur européenne asymptotique, au moins le payoff si exercice anticipé
+        low, high = max(-sign * K * np.exp(-r * tau), 0.0), max(sign * (s_max - K * np.exp(-r * tau)), 0.0)
+        if american:
+            low, high = max(low, payoff[0]), max(high, payoff[-1])
+        explicit = (1 - theta) * dt
+        rhs = values[1:-1] + explicit * (a * values[:-2] + b * values[1:-1] + c * values[2:])
+        rhs[0] += theta * dt * a[0] * low
+        rhs[-1] += theta * dt * c[-1] * high
+        values[1:-1] = solve_banded((1, 1), systems[theta], rhs, check_finite=False)
+        values[0], values[-1] = low, high
+        if american:
+            np.maximum(values, payoff, out=values)
+
+    ds = grid[1] - grid[0]
+    j = int(np.clip(np.searchsorted(grid, S) - 1, 1, n_space - 2))
+    w = (S - grid[j]) / ds
+    price = (1 - w) * values[j] + w * values[j + 1]
+    delta = np.interp(S, grid[1:-1], (values[2:] - values[:-2]) / (2 * ds))
+    gamma = np.interp(S, grid[1:-1], (values[2:] - 2 * values[1:-1] + values[:-2]) / ds ** 2)
+    return {"Prix": price, "Delta": delta, "Gamma": gamma}
+
+
+def simulate_paths(S, T, r, sigma, n_paths, n_steps, antithetic=True, seed=42):
+    """
+    Trajectoires du sous-jacent aux dates d'observation (chemins x dates), log-Euler exact.
+    Antithétiques : la seconde moitié des chocs est l'opposée de la première.
+    """
+    rng = np.random.default_rng(seed)
+    dt = T / n_steps
+    z = rng.standard_normal(((n_paths + 1) // 2 if antithetic else n_paths, n_steps))
+    if antithetic:
+        z = np.vstack([z, -z])
+    log_paths = np.cumsum((r - 0.5 * sigma ** 2) * dt + sigma * np.sqrt(dt) * z, axis=1)
+    return S * np.exp(log_paths)
+
+
+def geometric_asian_price(S, K, T, r, sigma, n_steps, opt_type="Call"):
+    """
+    Option asiatique géométrique à observation discrète (t_i = i T / n) : formule fermée, la moyenne
+    géométrique étant lognormale. Sert de variable de contrôle pour l'asiatique arithmétique.
+    """
+    sign = option_sign(opt_type)
+    dt = T / n_steps
+    mean = np.log(S) + (r - 0.5 * sigma ** 2) * dt * (n_steps + 1) / 2
+    var = sigma ** 2 * dt * (n_steps + 1) * (2 * n_steps + 1) / (6 * n_steps)
+    d1 = (mean - np.log(K) + var) / np.sqrt(var)
+    d2 = d1 - np.sqrt(var)
+    return np.exp(-r * T) * sign * (np.exp(mean + 0.5 * var) * ndtr(sign * d1) - K * ndtr(sign * d2))
+
+
+def barrier_supported(S, K, barrier, opt_type="Call"):
+    """
+    Barrières désactivantes traitées : du côté hors de la monnaie uniquement, Call down-and-out
+    (barrière sous le spot et le strike) ou Put up-and-out (barrière au-dessus du spot et du strike).
+    """
+    if option_sign(opt_type) > 0:
+        return barrier < S and barrier <= K
+    return barrier > S and barrier >= K
+
+
+def _check_barrier(S, K, barrier, opt_type):
+    if barrier is None or not barrier_supported(S, K, barrier, opt_type):
+        raise ValueError(f"Barrière {barrier} non supportée pour un {opt_type} (S = {S}, K = {K}) : Call down-and-out "
+                         "avec barrière < S et <= K, ou Put up-and-out avec barrière > S et >= K.")
+
+
+def monte_carlo_exotic(S, K, T, r, sigma, opt_type="Call", product="Asiatique", barrier=None, n_paths=100_000,
+                       n_steps=52, antithetic=True, control_variate=True, seed=42):
+    """
+    Monte Carlo des options dépendantes du chemin : asiatique arithmétique (contrôle : asiatique géométrique)
+    ou barrière désactivante observée à chaque date (contrôle : vanille européenne Black-Scholes), limitée
+    aux cas de barrier_supported (ValueError sinon).
+    Coefficient de contrôle optimal estimé par régression ; avec antithétiques, l'erreur type est calculée
+    sur les moyennes de paires. Renvoie prix, erreur type et temps de calcul.
+    """
+    if product != "Asiatique":
+        _check_barrier(S, K, barrier, opt_type)
+    start = time.perf_counter()
+    sign = option_sign(opt_type)
+    paths = simulate_paths(S, T, r, sigma, n_paths, n_steps, antithetic, seed)
+    discount = np.exp(-r * T)
+
+    if product == "Asiatique":
+        payoff = np.maximum(sign * (paths.mean(axis=1) - K), 0.0)
+        control = np.maximum(sign * (np.exp(np.log(paths).mean(axis=1)) - K), 0.0)
+        control_price = geometric_asian_price(S, K, T, r, sigma, n_steps, opt_type)
+    else:
+        vanilla = np.maximum(sign * (paths[:, -1] - K), 0.0)
+        knocked = (paths.min(axis=1) <= barrier) if sign > 0 else (paths.max(axis=1) >= barrier)
+        payoff = np.where(knocked, 0.0, vanilla)
+        control = vanilla
+        control_price = bs_price_greeks(S, K, T, r, sigma, opt_type)["Prix"]
+
+    y, x = discount * payoff, discount * control
+    if antithetic:
+        half = len(y) // 2
+        y, x = 0.5 * (y[:half] + y[half:]), 0.5 * (x[:half] + x[half:])
+    if control_variate:
+        beta = np.cov(y, x)[0, 1] / np.var(x, ddof=1)
+        y = y - beta * (x - control_price)
+    return {"Prix": y.mean(), "Erreur Type": y.std(ddof=1) / np.sqrt(len(y)), "Temps (ms)": (time.perf_counter() - start) * 1000}
+
+
+def barrier_price(S, K, T, r, sigma, barrier, opt_type="Call", n_steps=None):
+    """
+    Barrière désactivante (Call down-and-out ou Put up-and-out, barrière du côté hors de la monnaie), formule
+    fermée en observation continue ; n_steps : correction de Broadie-Glasserman pour l'observation discrète.
+    ValueError pour une barrière hors des cas de barrier_supported.
+    """
+    _check_barrier(S, K, barrier, opt_type)
+    sign = option_sign(opt_type)
+    if n_steps:
+        barrier = barrier * np.exp(-sign * BARRIER_SHIFT * sigma * np.sqrt(T / n_steps))
+    vanilla = bs_price_greeks(S, K, T, r, sigma, opt_type)["Prix"]
+    power = (barrier / S) ** (2 * r / sigma ** 2 - 1)
+    mirrored = bs_price_greeks(barrier ** 2 / S, K, T, r, sigma, opt_type)["Prix"]
+    return vanilla - power * mirrored
+
+
+def benchmark_methods(S, K, T, r, sigma, barrier, grids=(25, 50, 100, 200, 400), paths=(1_000, 5_000, 20_000, 100_000), n_steps=52):
+    """
+    Précision vs temps de calcul : EDP européenne (référence : formule fermée) et américaine (référence : grille fine),
+    Monte Carlo asiatique et barrière (Call down-and-out, barrière sous le spot et le strike) avec et sans
+    réduction de variance (erreur type, erreur vs référence).
+    """
+    rows = []
+    exact_eu = float(bs_price_greeks(S, K, T, r, sigma, "Put")["Prix"])
+    american_ref = crank_nicolson(S, K, T, r, sigma, "Put", american=True, n_space=2000, n_time=2000)["Prix"]
+    for n in grids:
+        for american, ref, name in [(False, exact_eu, "EDP Put Européen"), (True, american_ref, "EDP Put Américain")]:
+            start = time.perf_counter()
+            price = crank_nicolson(S, K, T, r, sigma, "Put", american, n_space=n, n_time=n)["Prix"]
+            rows.append({"Méthode": name, "Taille": f"{n} x {n}", "Prix": price, "Erreur": abs(price - ref),
+                         "Erreur Type": np.nan, "Temps (ms)": (time.perf_counter() - start) * 1000})
+
+    references = {
+        "Asiatique": np.mean([monte_carlo_exotic(S, K, T, r, sigma, "Call", "Asiatique", n_paths=200_000, n_steps=n_steps, seed=seed)["Prix"]
+                              for seed in range(100, 105)]),
+        "Barrière": barrier_price(S, K, T, r, sigma, barrier, "Call", n_steps),
+    }
+    for product, ref in references.items():
+        for reduction in (False, True):
+            for n in paths:
+                res = monte_carlo_exotic(S, K, T, r, sigma, "Call", product, barrier, n, n_steps, reduction, reduction, seed=1)
+                rows.append({"Méthode": f"MC {product}" + (" (antith. + contrôle)" if reduction else " (standard)"),
+                             "Taille": f"{n:,} chemins", "Prix": res["Prix"], "Erreur": abs(res["Prix"] - ref),
+                             "Erreur Type": res["Erreur Type"], "Temps (ms)": res["Temps (ms)"]})
+    return pd.DataFrame(rows)
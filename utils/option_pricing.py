@@ -0,0 +1,165 @@
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from scipy.special import ndtr
+
+# --- BLACK-SCHOLES VECTORISÉ (prix et grecques d'un portefeuille d'options) ---
+
+GREEKS = ["Delta", "Gamma", "Vega", "Theta", "Rho"]
+
+INV_SQRT_2PI = 1 / np.sqrt(2 * np.pi)
+
+# Nombre de surfaces (prix + grecques) conservées en mémoire, éviction LRU
+SURFACE_CACHE_SIZE = 32
+
+
+def option_sign(opt_type):
+    """
+    +1 pour un Call, -1 pour un Put (accepte un libellé, un booléen is_call ou un tableau de libellés).
+    """
+    opt_type = np.asarray(opt_type)
+    if opt_type.dtype == bool:
+        return np.where(opt_type, 1.0, -1.0)
+    return np.where(opt_type == "Call", 1.0, -1.0)
+
+
+def bs_price_greeks(S, K, T, r, sigma, opt_type="Call"):
+    """
+    Prix et grecques Black-Scholes d'un lot d'options en une passe (tableaux compatibles par broadcasting).
+    d1, d2, N(±d1), N(±d2), n(d1) et l'actualisation sont calculés une seule fois et partagés :
+    avec s = +1 (Call) / -1 (Put), Prix = s [S N(s d1) - K e^{-rT} N(s d2)] et Delta = s N(s d1).
+    Conventions de la page : Vega et Rho pour 1%, Theta par jour.
+    """
+    S, K, T, r, sigma = (np.asarray(x, dtype=np.float64) for x in (S, K, T, r, sigma))
+    sign = option_sign(opt_type)
+    sqrt_t = np.sqrt(T)
+    vol_t = sigma * sqrt_t
+    d1 = (np.log(S / K) + (r + 0.5 * sigma * sigma) * T) / vol_t
+    d2 = d1 - vol_t
+    pdf_d1 = INV_SQRT_2PI * np.exp(-0.5 * d1 * d1)
+    cdf_d1, cdf_d2 = ndtr(sign * d1), ndtr(sign * d2)
+    k_df = K * np.exp(-r * T)
+
+    s_pdf = S * pdf_d1
+    return {
+        "Prix": sign * (S * cdf_d1 - k_df * cdf_d2),
+        "Delta": sign * cdf_d1,
+        "Gamma": pdf_d1 / (S * vol_t),
+        "Vega": s_pdf * sqrt_t / 100,
+        "Theta": (-s_pdf * sigma / (2 * sqrt_t) - sign * r * k_df * cdf_d2) / 365,
+        "Rho": sign * k_df * T * cdf_d2 / 100,
+    }
+
+
+@lru_cache(maxsize=SURFACE_CACHE_SIZE)
+def price_surface(K, r, sigma, opt_type="Call", moneyness=(0.5, 1.5), t_max=1.0, n_spot=30, n_time=30, t_min=0.01):
+    """
+    Surfaces de prix et de grecques (maturités x spots) sur une grille relative au strike, en cache LRU indexé
+    par (K, r, σ, type, grille). Le spot courant n'entre pas dans la clé : le déplacer ne recalcule rien.
+    La dernière ligne correspond à la maturité t_max (courbe prix vs spot). Tableaux en lecture seule.
+    """
+    spots = K * np.linspace(*moneyness, n_spot)
+    times = np.linspace(t_max, t_min, n_time)[::-1]
+    surfaces = bs_price_greeks(spots[None, :], K, times[:, None], r, sigma, opt_type)
+    for values in (spots, times, *surfaces.values()):
+        values.setflags(write=False)
+    return spots, times, surfaces
+
+
+def surface_to_frame(spots, times, surfaces):
+    """
+    Surface au format long (une ligne par point spot x maturité) pour l'export.
+    """
+    spot_grid, time_grid = np.meshgrid(spots, times)
+    return pd.DataFrame({"Spot": spot_grid.ravel(), "Maturité": time_grid.ravel(), **{k: v.ravel() for k, v in surfaces.items()}})
+
+
+def revalue_book(book):
+    """
+    Revalorisation d'un portefeuille (DataFrame S, K, T, r, sigma, Type, Quantité) : valeur et grecques
+    par ligne pondérées par la quantité, et totaux du portefeuille.
+    """
+    is_call = (book["Type"] == "Call").to_numpy()  # comparaison sur les codes si la colonne est catégorielle
+    res = bs_price_greeks(*(book[c].to_numpy() for c in ["S", "K", "T", "r", "sigma"]), is_call)
+    quantity = book["Quantité"].to_numpy(dtype=np.float64)
+    positions = {k: v * quantity for k, v in res.items()}
+    return positions, pd.Series({k: v.sum() for k, v in positions.items()})
+
+
+def generate_option_book(n_options=1_000_000, spot=100.0, seed=42):
+    """
+    Portefeuille d'options fictif : strikes autour du spot, maturités de 1 mois à 5 ans, volatilités
+    de 10% à 50%, positions longues et courtes.
+    """
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "S": np.full(n_options, spot),
+        "K": spot * rng.uniform(0.6, 1.4, n_options),
+        "T": rng.uniform(1 / 12, 5, n_options),
+        "r": np.full(n_options, 0.03),
+        "sigma": rng.uniform(0.10, 0.50, n_options),
+        "Type": pd.Categorical.from_codes(rng.integers(0, 2, n_options), ["Call", "Put"]),
+        "Quantité": rng.integers(-50, 51, n_options).astype(np.float64),
+    })
+
+
+def _call_price_vega(S, k_df, sqrt_t, sigma):
+    vol_t = sigma * sqrt_t
+    d1 = np.log(S / k_df) / vol_t + 0.5 * vol_t
+    d2 = d1 - vol_t
+    vega = S * INV_SQRT_2PI * np.exp(-0.5 * d1 * d1) * sqrt_t
+    return S * ndtr(d1) - k_df * ndtr(d2), vega, d1, d2
+
+
+def implied_volatility(price, S, K, T, r, opt_type="Call", tol=1e-7, max_iter=20, vol_bounds=(1e-4, 5.0)):
+    """
+    Volatilité implicite d'une chaîne ou d'une surface de cotations en une fois. Les Puts sont ramenés à des Calls
+    par parité ; point de départ rationnel de Corrado-Miller, puis itérations de Halley vectorisées
+    (Volga = Vega d1 d2 / σ). Garde-fous : pas limité aux bornes de volatilité, Vega quasi nulle gelée.
+    Convergence : écart de prix inférieur à tol x Vega (précision d'environ tol sur σ).
+    Renvoie σ (NaN hors bornes d'arbitrage ou sans convergence) et le masque des cotations convergées.
+    """
+    price, S, K, T, r = np.broadcast_arrays(*(np.asarray(x, dtype=np.float64) for x in (price, S, K, T, r)))
+    k_df = K * np.exp(-r * T)
+    call = np.where(option_sign(opt_type) > 0, price, price + S - k_df)
+    sqrt_t = np.sqrt(T)
+
+    # Bornes d'arbitrage : max(S - K e^{-rT}, 0) < C < S
+    valid = (call > np.maximum(S - k_df, 0.0)) & (call < S)
+
+    # Approximation de Corrado-Miller (racine négative tronquée à 0)
+    moneyness = 0.5 * (S - k_df)
+    core = call - moneyness
+    sigma = np.sqrt(2 * np.pi) / (sqrt_t * (S + k_df)) * (core + np.sqrt(np.maximum(core ** 2 - (S - k_df) ** 2 / np.pi, 0.0)))
+    sigma = np.where(np.isfinite(sigma) & (sigma > 0), sigma, 0.3).clip(*vol_bounds)
+
+    converged = np.zeros(sigma.shape, dtype=bool)
+    for _ in range(max_iter):
+        model, vega, d1, d2 = _call_price_vega(S, k_df, sqrt_t, sigma)
+        diff = model - call
+        converged = valid & (np.abs(diff) <= tol * vega)
+        active = valid & ~converged & (vega > 1e-12 * S)
+        if not active.any():
+            break
+        step = np.divide(diff, vega, out=np.zeros_like(diff), where=active)
+        halley = 1 - 0.5 * step * d1 * d2 / sigma
+        step = np.where(halley > 0.5, step / halley, step)  # correction de Halley si elle reste bien conditionnée
+        sigma = np.where(active, (sigma - step).clip(*vol_bounds), sigma)
+    return np.where(converged, sigma, np.nan), converged
+
+
+def generate_smile_quotes(spot=100.0, r=0.03, n_strikes=100, n_maturities=100, atm_vol=0.20, skew=-0.10, smile=0.15,
+                          noise=0.0, seed=42):
+    """
+    Cotations fictives sur une grille strike x maturité avec smile : σ(k, T) = σ_ATM + skew k / √T + smile k²
+    (k = log-moneyness forward). OTM : Puts sous le forward, Calls au-dessus ; bruit de cotation optionnel (en % du prix).
+    """
+    rng = np.random.default_rng(seed)
+    strikes, maturities = np.meshgrid(spot * np.linspace(0.6, 1.4, n_strikes), np.linspace(0.1, 3.0, n_maturities))
+    k = np.log(strikes / (spot * np.exp(r * maturities)))
+    vol = np.maximum(atm_vol + skew * k / np.sqrt(maturities) + smile * k ** 2, 0.03)
+    opt_type = np.where(k >= 0, "Call", "Put")
+    price = bs_price_greeks(spot, strikes, maturities, r, vol, opt_type)["Prix"] * (1 + noise * rng.standard_normal(k.shape))
+    return pd.DataFrame({"K": strikes.ravel(), "T": maturities.ravel(), "Type": opt_type.ravel(),
+                         "Prix": price.ravel(), "Vol Vraie": vol.ravel()})
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+from utils.tail_estimators import StreamingTailEstimator
+
+
+def euler_allocation(loss_matrix, alpha=0.99, weights=None, exposures=None, n_neighbors=None, index=None):
+    """
+    Allocation d'Euler de la VaR et de l'ES aux positions, en une passe sur la matrice de pertes simulées
+    (scénarios x positions) déjà disponible, sans relancer la simulation position par position :
+        VaR_i = E[L_i | L = VaR]   (moyenne sur la bande de scénarios encadrant la VaR, remise à l'échelle)
+        ES_i  = E[L_i | L >= VaR]  (moyenne sur les scénarios de queue)
+    Les composantes s'additionnent exactement à la VaR et à l'ES du portefeuille, y compris pour des pertes
+    discrètes : les scénarios à égalité avec la VaR n'entrent dans l'ES que pour la masse retenue par l'estimateur.
+    Avec exposures, les contributions marginales (dérivée par euro d'exposition) sont aussi renvoyées.
+    """
+    loss_matrix = np.asarray(loss_matrix, dtype=float)
+    n_scen, n_pos = loss_matrix.shape
+    weights = np.ones(n_scen) if weights is None else np.asarray(weights, dtype=float)
+    total = loss_matrix.sum(axis=1)
+
+    estimator = StreamingTailEstimator(n_scen, (alpha,)).update(total, weights)
+    var, es = estimator.var(alpha), estimator.es(alpha)
+    _, boundary_mass, tail_mass = estimator.es_boundary(alpha)
+    band_low, band_high = estimator.var_band(alpha, n_neighbors)
+
+    # Seules les lignes de la bande et de la queue sont lues : coût en O(scénarios retenus x positions)
+    band = np.flatnonzero((total >= band_low) & (total <= band_high))
+    above, tied = np.flatnonzero(total > var), np.flatnonzero(total == var)
+    band_mean = weights[band] @ loss_matrix[band] / weights[band].sum()
+    component_var = band_mean * var / band_mean.sum()
+    tie_share = boundary_mass / weights[tied].sum()
+    component_es = (weights[above] @ loss_matrix[above] + tie_share * weights[tied] @ loss_matrix[tied]) / tail_mass
+
+    result = pd.DataFrame({
+        "VaR Composante": component_var,
+        "ES Composante": component_es,
+        "Part VaR (%)": component_var / var,
+        "Part ES (%)": component_es / es,
+    }, index=index)
+    if exposures is not None:
+        exposures = np.asarray(exposures, dtype=float)
+        result["VaR Marginale"] = component_var / exposures
+        result["ES Marginale"] = component_es / exposures
+    return result
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+from utils.spread_risk import spread_scope, spread_scr
+
+# Axes du cube : classe d'actif x rating x pays x émetteur
+CUBE_DIMS = ["Classe d'Actif", "Rating", "Pays", "Nom de l'Actif"]
+
+MV = "Valeur de Marché (M€)"
+
+
+def build_risk_cube(positions):
+    """
+    Pré-agrège le portefeuille ligne à ligne en un cube (classe d'actif x rating x pays x émetteur).
+    Les mesures sont additives (sommes) : toute vue agrégée s'obtient par roll-up du cube,
+    sans repasser sur les positions. Les moyennes (duration, performance) sont stockées
+    pondérées par la valeur de marché.
+    """
+    mv = positions[MV].to_numpy(dtype=np.float64)
+    measures = pd.DataFrame({
+        **{dim: positions[dim].astype("category") for dim in CUBE_DIMS},
+        MV: mv,
+        "MV x Duration": mv * positions["Duration"].to_numpy(dtype=np.float64),
+        "MV x Performance": mv * positions["Performance YTD (%)"].to_numpy(dtype=np.float64),
+        "SCR Spread": spread_scr(mv, positions["Rating"], positions["Duration"], in_scope=spread_scope(positions["Classe d'Actif"])),
+        "Nombre de Lignes": np.ones(len(positions), dtype=np.int64),
+    })
+    return measures.groupby(CUBE_DIMS, observed=True, sort=False).sum()
+
+
+def rollup(cube, by, where=None):
+    """
+    Vue agrégée du cube selon un ou plusieurs axes, avec filtre optionnel sur une valeur d'axe
+    (ex: where={"Classe d'Actif": ["Obligations Gouv.", "Obligations Corp."]}).
+    """
+    if where:
+        mask = np.ones(len(cube), dtype=bool)
+        for dim, values in where.items():
+            mask &= cube.index.get_level_values(dim).isin(values)
+        cube = cube[mask]
+    return cube.groupby(level=by, observed=True).sum()
+
+
+def cube_totals(cube):
+    """
+    KPIs du portefeuille : encours, performance et duration moyennes pondérées.
+    """
+    totals = cube.sum()
+    return {
+        "aum": totals[MV],
+        "performance": totals["MV x Performance"] / totals[MV],
+        "duration": totals["MV x Duration"] / totals[MV],
+        "scr_spread": totals["SCR Spread"],
+    }
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+# --- SOUS-MODULE SPREAD : OBLIGATIONS ET PRÊTS (Règlement Délégué 2015/35, Art. 176) ---
+
+# Échelons de qualité de crédit (CQS) ; les notations absentes sont traitées comme "non notées"
+CREDIT_QUALITY_STEPS = {'AAA': 0, 'AA': 1, 'A': 2, 'BBB': 3, 'BB': 4, 'B': 5, 'CCC': 6}
+UNRATED = len(CREDIT_QUALITY_STEPS)
+
+# Classes exemptées (souverains de l'EEE, Art. 180) : hors périmètre spread, et g_i = 0 en concentration (Art. 187)
+EXEMPT_CLASSES = ['Obligations Gouv.']
+
+# Tranches de duration : (0, 5], (5, 10], (10, 15], (15, 20], > 20
+DURATION_BUCKETS = np.array([0.0, 5.0, 10.0, 15.0, 20.0])
+
+# stress_i = a_i + b_i x (dur_i - début de tranche), plafonné à 100% (lignes : CQS 0 à 6 puis non noté)
+SPREAD_A = np.array([
+    [0.000, 0.045, 0.070, 0.095, 0.120],
+    [0.000, 0.055, 0.084, 0.109, 0.134],
+    [0.000, 0.070, 0.105, 0.130, 0.155],
+    [0.000, 0.125, 0.200, 0.250, 0.300],
+    [0.000, 0.225, 0.350, 0.440, 0.465],
+    [0.000, 0.375, 0.585, 0.610, 0.635],
+    [0.000, 0.375, 0.585, 0.610, 0.635],
+    [0.000, 0.150, 0.235, 0.295, 0.355],
+])
+SPREAD_B = np.array([
+    [0.009, 0.005, 0.005, 0.005, 0.005],
+    [0.011, 0.006, 0.005, 0.005, 0.005],
+    [0.014, 0.007, 0.005, 0.005, 0.005],
+    [0.025, 0.015, 0.010, 0.010, 0.005],
+    [0.045, 0.025, 0.018, 0.005, 0.005],
+    [0.075, 0.042, 0.005, 0.005, 0.005],
+    [0.075, 0.042, 0.005, 0.005, 0.005],
+    [0.030, 0.017, 0.012, 0.012, 0.005],
+])
+
+
+def credit_quality_step(rating):
+    """
+    Convertit une colonne de notations en échelons CQS (entiers). Sur une colonne catégorielle,
+    seule la liste des catégories est convertie, puis propagée par les codes.
+    """
+    cat = pd.Series(rating).astype("category").cat
+    steps = np.array([CREDIT_QUALITY_STEPS.get(r, UNRATED) for r in cat.categories] + [UNRATED])
+    return steps[np.asarray(cat.codes)]  # code -1 (valeur manquante) -> non noté
+
+
+def spread_shock(rating, duration):
+    """
+    Facteur de choc spread (Art. 176) par ligne, calculé sur les colonnes entières.
+    """
+    cqs = credit_quality_step(rating)
+    duration = np.maximum(np.asarray(duration, dtype=np.float64), 0.0)
+    bucket = np.searchsorted(DURATION_BUCKETS[1:], duration, side="left")
+    shock = SPREAD_A[cqs, bucket] + SPREAD_B[cqs, bucket] * (duration - DURATION_BUCKETS[bucket])
+    return np.minimum(shock, 1.0)
+
+
+def spread_scope(asset_class):
+    """
+    Périmètre du sous-module spread (Art. 176) : obligations, hors souverains exemptés (Art. 180).
+    """
+    asset_class = pd.Series(asset_class)
+    return (asset_class.str.contains("Obligations", na=False) & ~asset_class.isin(EXEMPT_CLASSES)).to_numpy()
+
+
+def spread_scr(market_value, rating, duration, in_scope=None):
+    """
+    SCR spread par ligne : valeur de marché x choc Art. 176 (0 hors périmètre, ex. actions, immobilier, cash).
+    """
+    scr = np.asarray(market_value, dtype=np.float64) * spread_shock(rating, duration)
+    return scr if in_scope is None else np.where(in_scope, scr, 0.0)
@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+
+# Marge sur la masse de queue conservée (couvre la fenêtre d'estimation de densité de stderr)
+TAIL_MARGIN = 1.5
+
+
+class StreamingTailEstimator:
+    """
+    Estimateur en flux de la VaR et de l'Expected Shortfall sur des pertes Monte Carlo.
+    Les pertes arrivent par lots (update) ; seul un tampon exact des plus grandes pertes est conservé :
+    la mémoire est de l'ordre de (1 - niveau minimal) x n_total au lieu de n_total.
+    Les poids optionnels (rapports de vraisemblance d'un Importance Sampling) sont supportés.
+    """
+
+    def __init__(self, n_total, levels=(0.99, 0.995, 0.999)):
+        self.n_total = n_total
+        self.levels = tuple(levels)
+        # Masse de queue à conserver : tout ce qui est en dessous ne pourra jamais redevenir utile
+        self._needed_mass = TAIL_MARGIN * (1 - min(self.levels)) * n_total
+        self._values = np.empty(0)
+        self._weights = np.empty(0)
+        self.n_seen = 0
+        self._sum_w = 0.0
+        self._sum_wl = 0.0
+
+    def update(self, losses, weights=None):
+        losses = np.asarray(losses, dtype=float).ravel()
+        weights = np.ones_like(losses) if weights is None else np.asarray(weights, dtype=float).ravel()
+        self.n_seen += len(losses)
+        self._sum_w += weights.sum()
+        self._sum_wl += np.dot(weights, losses)
+
+        self._values = np.concatenate([self._values, losses])
+        self._weights = np.concatenate([self._weights, weights])
+        # Élagage amorti : on ne trie le tampon que lorsqu'il dépasse deux fois la masse utile
+        if self._weights.sum() > 2 * self._needed_mass:
+            self._prune()
+        return self
+
+    def _prune(self):
+        order = np.argsort(self._values)[::-1]
+        cum_mass = np.cumsum(self._weights[order])
+        keep = order[:np.searchsorted(cum_mass, self._needed_mass) + 1]
+        self._values = self._values[keep]
+        self._weights = self._weights[keep]
+
+    def _sorted_tail(self):
+        order = np.argsort(self._values)[::-1]
+        return self._values[order], self._weights[order], np.cumsum(self._weights[order]) / self.n_seen
+
+    def _tail_index(self, tail_prob, level):
+        k = np.searchsorted(tail_prob, (1 - level) * (1 - 1e-12))
+        if k >= len(tail_prob):
+            if len(tail_prob) < self.n_seen:
+                raise ValueError(f"Niveau {level} hors du tampon de queue (niveaux couverts : >= {min(self.levels)})")
+            k = len(tail_prob) - 1
+        return k
+
+    def var(self, level):
+        values, _, tail_prob = self._sorted_tail()
+        return values[self._tail_index(tail_prob, level)]
+
+    def es(self, level):
+        values, weights, tail_prob = self._sorted_tail()
+        k = self._tail_index(tail_prob, level) + 1
+        return np.dot(weights[:k], values[:k]) / weights[:k].sum()
+
+    def es_boundary(self, level):
+        """
+        Masse de queue moyennée par l'ES et part de cette masse portée par des pertes égales à la VaR
+        (en cas d'ex-aequo, seule une partie des scénarios à la VaR entre dans l'ES). Renvoie (VaR, masse à la VaR,
+        masse de queue) : support des allocations d'ES qui doivent s'additionner exactement à l'estimateur.
+        """
+        values, weights, tail_prob = self._sorted_tail()
+        k = self._tail_index(tail_prob, level)
+        tail_mass = weights[:k + 1].sum()
+        return values[k], tail_mass - weights[:k + 1][values[:k + 1] > values[k]].sum(), tail_mass
+
+    def var_band(self, level, n_neighbors=None):
+        """
+        Bande de pertes [basse, haute] formée des n_neighbors statistiques d'ordre de part et d'autre de la VaR
+        (par défaut la racine du nombre de scénarios en queue) : support de l'estimateur E[L_i | L = VaR].
+        """
+        values, _, tail_prob = self._sorted_tail()
+        k = self._tail_index(tail_prob, level)
+        if n_neighbors is None:
+            n_neighbors = max(3, int(np.ceil(np.sqrt(k + 1))))
+        return values[min(k + n_neighbors, len(values) - 1)], values[max(k - n_neighbors, 0)]
+
+    def stderr(self, level):
+        """
+        Erreur standard asymptotique du quantile : sqrt(Var(w 1{L > q}) / N) / f(q),
+        la densité f étant estimée par différence finie sur la fenêtre de probabilité [p/2, 3p/2].
+        """
+        values, weights, tail_prob = self._sorted_tail()
+        p = 1 - level
+        k = self._tail_index(tail_prob, level)
+        k_low = np.searchsorted(tail_prob, 0.5 * p)
+        k_high = min(np.searchsorted(tail_prob, TAIL_MARGIN * p), len(values) - 1)
+        density = (tail_prob[k_high] - tail_prob[k_low]) / max(values[k_low] - values[k_high], 1e-300)
+        second_moment = np.dot(weights[:k + 1], weights[:k + 1]) / self.n_seen
+        return np.sqrt(max(second_moment - p ** 2, 0.0) / self.n_seen) / density
+
+    @property
+    def mean(self):
+        return self._sum_wl / self.n_seen
+
+    def summary(self):
+        return pd.DataFrame({
+            "VaR": [self.var(a) for a in self.levels],
+            "ES": [self.es(a) for a in self.levels],
+            "Erreur Standard": [self.stderr(a) for a in self.levels],
+        }, index=pd.Index(self.levels, name="Niveau"))